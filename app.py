@@ -1,9 +1,7 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import json
-import os
 
+from ponzi_detection import data_access
 # --- Page Configuration ---
 st.set_page_config(page_title="Ponzi Security Dashboard", layout="wide")
 
@@ -19,18 +17,27 @@ paid_rate = st.sidebar.slider("Paid Rate (Payout Ratio)", 0.0, 1.0, 0.2)
 velocity = st.sidebar.number_input("Transaction Velocity (Daily)", min_value=0, value=100)
 growth = st.sidebar.slider("Network Growth Rate", 0.0, 5.0, 1.2)
 
-# Simple Prediction Logic (Heuristic for demo)
-risk_score = (gini * 40) + ((1 - paid_rate) * 40) + (min(velocity/500, 1) * 20)
-risk_score = min(risk_score, 100)
+# Real-time scoring with the trained model (flat-forest inference);
+# falls back to the demo heuristic until 'ponzi train' has been run
+try:
+    risk_score, risk_tier, model_version = data_access.score_contract({
+        'Gini_Index': gini, 'Paid_Rate': paid_rate, 'Tx_Velocity': velocity, 'Network_Growth': growth,
+    })
+except FileNotFoundError:
+    risk_score = (gini * 40) + ((1 - paid_rate) * 40) + (min(velocity/500, 1) * 20)
+    risk_score = min(risk_score, 100)
+    risk_tier = 'CRITICAL' if risk_score > 75 else 'HIGH' if risk_score > 40 else 'LOW'
+    model_version = None
 
 if st.sidebar.button("Analyze Contract"):
     st.sidebar.write(f"### Result: {risk_score:.2f}% Risk")
-    if risk_score > 75:
+    if risk_tier == 'CRITICAL':
         st.sidebar.error("🚨 CRITICAL: Ponzi Signature Detected")
-    elif risk_score > 40:
+    elif risk_tier == 'HIGH':
         st.sidebar.warning("⚠️ HIGH: Suspicious Activity")
     else:
         st.sidebar.success("✅ LOW: Healthy Patterns")
+    st.sidebar.caption(f"Model {model_version}" if model_version else "Heuristic estimate (no trained model found)")
 
 # --- Main Dashboard: Analytics ---
 col1, col2 = st.columns(2)
@@ -52,9 +59,9 @@ with col2:
 # --- Data Table: Recent Alerts ---
 st.subheader("Recent Firewall Alerts")
 try:
-    with open('outputs/firewall_blocklist.json', 'r') as f:
-        blocklist = json.load(f)
-        st.write(f"There are currently **{len(blocklist)}** addresses on the real-time blocklist.")
-        st.table(pd.DataFrame({"Address Index": blocklist}).head(10))
+    blocklist = data_access.load_blocklist_summary()
+    st.write(f"There are currently **{blocklist['count']}** addresses on the real-time blocklist.")
+    st.table(pd.DataFrame({"Address": blocklist['preview']}))
 except FileNotFoundError:
-    st.info("No active blocklist found. Run 'engine.py' first to generate logs.")
\ No newline at end of file
+    st.info("No active blocklist found. Run 'ponzi train' (or 'python -m ponzi_detection.engine') "
+            "first to generate logs.")
\ No newline at end of file
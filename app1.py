@@ -7,6 +7,7 @@ import json
 import os
 from datetime import datetime
 
+from ponzi_detection import data_access
 # --- 1. SETTINGS & STYLING ---
 st.set_page_config(page_title="Ponzi Threat Intel", layout="wide", page_icon="🛡️")
 
@@ -20,14 +21,8 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 # --- 2. DATA LOADING & EXPORT LOGIC ---
-def get_report_data():
-    if os.path.exists('outputs/firewall_blocklist.json'):
-        with open('outputs/firewall_blocklist.json', 'r') as f:
-            blocklist = json.load(f)
-        return pd.DataFrame({"Blocked_Address_Index": blocklist, "Risk_Level": "CRITICAL", "Timestamp": datetime.now().strftime("%Y-%m-%d")})
-    return pd.DataFrame()
-
-df_report = get_report_data()
+# Cached across reruns; invalidated when the blocklist files change
+df_report = data_access.load_blocklist_report()
 
 # --- 3. SIDEBAR: EXPORT CONTROLS ---
 st.sidebar.header("📊 Reporting Center")
@@ -93,7 +88,26 @@ with col_right:
 # --- 5. INTERACTIVE INCIDENT TABLE ---
 st.subheader("⚠️ Active Firewall Interceptions")
 if not df_report.empty:
-    # Adding some interactivity to the table
-    st.dataframe(df_report.style.background_gradient(cmap='Reds', subset=['Blocked_Address_Index']), use_container_width=True)
+    # Blocked entries are contract addresses, so the table is shown unstyled
+    st.dataframe(df_report, use_container_width=True)
+else:
+    st.info("Firewall is active. No critical threats detected in current cycle.")
+
+# --- 6. PIPELINE PERFORMANCE ---
+st.subheader("⏱️ Pipeline Stage Timings")
+metrics = data_access.load_pipeline_metrics()
+if metrics is not None:
+    t1, t2 = st.columns(2)
+    t1.metric("Last Run Duration", f"{metrics['total_duration_s']:.2f} s")
+    if metrics['rss_hwm_mb'] is not None:
+        t2.metric("Process Peak Memory (RSS)", f"{metrics['rss_hwm_mb']:.0f} MB")
+    fig_stages = px.bar(metrics['stages'], x='duration_s', y='stage', orientation='h',
+                        template="plotly_dark", labels={'duration_s': 'Seconds', 'stage': ''},
+                        title="Where the last engine run spent its time")
+    fig_stages.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+    st.plotly_chart(fig_stages, use_container_width=True)
+    if not metrics['calls'].empty:
+        st.dataframe(metrics['calls'], use_container_width=True)
 else:
-    st.info("Firewall is active. No critical threats detected in current cycle.")
\ No newline at end of file
+    st.info("No pipeline metrics yet. Run 'ponzi train' (or 'python -m ponzi_detection.engine') "
+            "to record stage timings.")
@@ -0,0 +1,12 @@
+"""
+Smart Ponzi Detection Engine.
+
+    ponzi train | score | audit | report | export-blocklist
+    python -m ponzi_detection score features.csv --out outputs/scores.csv
+
+The engines live in the package modules (ponzi_detection.engine,
+ponzi_detection.model_store, ...) that the dashboards import; cli.py wires
+them into one CLI and imports only the handler of the chosen subcommand.
+The XBlock archive ships as package data under data/.
+"""
+__version__ = '0.1.0'
@@ -0,0 +1,226 @@
+"""
+Batch audit runner: yield -> concentration -> score -> warnings for a whole
+watchlist.
+
+The multi-contract transaction frame is sorted by contract once; its numeric
+and timestamp columns (and the wallet column as integer codes) go to shared memory
+so pool workers slice them without pickling any row data. Each worker
+rebuilds one contract's frame at a time and runs the same chain as the
+serial path, so parallel and serial reports are identical.
+
+    python -m ponzi_detection.audit_runner transactions.csv --workers 8 --out outputs/audit_report.csv
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+CONTRACT_COL = 'contract_id'
+NUMERIC_COLUMNS = ('new_deposits', 'yield_disbursed', 'treasury_balance')
+DEFAULT_TASKS_PER_WORKER = 4
+
+
+def run_contract_chain(df):
+    """
+    Parts 2-5 for one contract's daily frame (oldest row first), exactly as
+    the app2 dashboard runs them. Returns the enriched frame plus scores.
+    """
+    from ponzi_detection.concentration_engine import analyze_wallet_concentration
+    from ponzi_detection.scoring_engine import calculate_red_flag_score
+    from ponzi_detection.warning_system import check_early_warnings
+    from ponzi_detection.yield_engine import calculate_yield_health
+
+    df = calculate_yield_health(df)
+
+    # Get the latest stats for scoring
+    latest_row = df.iloc[-1]
+    prev_row = df.iloc[-2] if len(df) > 1 else latest_row
+    treasury_change = df['treasury_balance'].pct_change()
+
+    # Concentration (Part 3)
+    concentration_stats = analyze_wallet_concentration(df)
+
+    # Final Scoring (Part 4)
+    risk_score, risk_category = calculate_red_flag_score(
+        latest_row['sustainability_ratio'],
+        concentration_stats['gini_coefficient'],
+        treasury_change.iloc[-1] * -1  # Decay rate
+    )
+    previous_score, _ = calculate_red_flag_score(
+        prev_row['sustainability_ratio'],
+        concentration_stats['gini_coefficient'],
+        treasury_change.iloc[-2] * -1 if len(df) > 1 else np.nan
+    )
+
+    # Alerts (Part 5)
+    alerts = check_early_warnings(risk_score, previous_score, treasury_change.iloc[-1])
+
+    return {
+        'df': df,
+        'concentration': concentration_stats,
+        'risk_score': risk_score,
+        'risk_category': risk_category,
+        'previous_score': previous_score,
+        'alerts': alerts,
+    }
+
+
+def audit_contract(contract_id, df):
+    """One report row for a contract."""
+    result = run_contract_chain(df)
+    latest = result['df'].iloc[-1]
+    concentration = result['concentration']
+    return {
+        CONTRACT_COL: contract_id,
+        'risk_score': float(result['risk_score']),
+        'risk_category': result['risk_category'],
+        'previous_score': float(result['previous_score']),
+        'sustainability_ratio': float(latest['sustainability_ratio']),
+        'runway_days': float(latest['runway_days']),
+        'yield_status': latest['yield_status'],
+        'gini_coefficient': float(concentration['gini_coefficient']),
+        'insider_count': int(concentration['insider_count']),
+        'is_concentrated': bool(concentration['is_concentrated']),
+        'alerts': ' | '.join(result['alerts']),
+        'days': len(df),
+    }
+
+
+def _rank(rows):
+    report = pd.DataFrame(rows)
+    if report.empty:
+        return report
+    report = report.sort_values(['risk_score', CONTRACT_COL], ascending=[False, True], kind='stable')
+    report.insert(0, 'rank', np.arange(1, len(report) + 1))
+    return report.reset_index(drop=True)
+
+
+def _partition(df):
+    """Sorts by contract (keeping row order within each) and returns slice bounds."""
+    df = df.sort_values(CONTRACT_COL, kind='stable').reset_index(drop=True)
+    # Both paths compute on float64 so serial and parallel results match bit for bit
+    df = df.astype({column: np.float64 for column in NUMERIC_COLUMNS})
+    ids = df[CONTRACT_COL].to_numpy()
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else np.array([], dtype=np.int64)
+    stops = np.r_[starts[1:], len(ids)]
+    return df, ids[starts], starts, stops
+
+
+def audit_serial(df):
+    """Reference single-process audit."""
+    df, contract_ids, starts, stops = _partition(df)
+    columns = [c for c in df.columns if c != CONTRACT_COL]
+    rows = [audit_contract(cid, df.iloc[a:b][columns].reset_index(drop=True))
+            for cid, a, b in zip(contract_ids, starts, stops)]
+    return _rank(rows)
+
+
+# ---------- Shared-memory workers ----------
+_worker = {}
+
+
+def _attach(name):
+    # Workers share the parent's resource tracker, which already owns the
+    # segment, so attaching must not hand it a second cleanup duty.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _init_worker(layout, wallet_categories, pickled_columns):
+    _worker['shm'] = []
+    _worker['arrays'] = {}
+    for column, (name, dtype, length) in layout.items():
+        shm = _attach(name)
+        _worker['shm'].append(shm)
+        _worker['arrays'][column] = np.ndarray((length,), dtype=dtype, buffer=shm.buf)
+    _worker['wallets'] = wallet_categories
+    _worker['pickled'] = pickled_columns
+
+
+def _frame_slice(arrays, wallets, pickled, start, stop):
+    data = {column: values[start:stop] for column, values in arrays.items() if column != 'wallet_code'}
+    for column, values in pickled.items():
+        data[column] = values[start:stop]
+    data['wallet_address'] = wallets[arrays['wallet_code'][start:stop]]
+    return pd.DataFrame(data)
+
+
+def _audit_task(task):
+    arrays, wallets, pickled = _worker['arrays'], _worker['wallets'], _worker['pickled']
+    return [audit_contract(cid, _frame_slice(arrays, wallets, pickled, a, b)) for cid, a, b in task]
+
+
+def _share(array, segments):
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    segments.append(shm)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+    return shm.name, array.dtype.str, len(array)
+
+
+def audit_parallel(df, workers=None, tasks_per_worker=DEFAULT_TASKS_PER_WORKER):
+    """
+    Process-pool audit. Numeric columns and wallet codes travel through
+    shared memory; only (contract, start, stop) triples are pickled.
+    Produces the same ranked report as audit_serial().
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        return audit_serial(df)
+
+    df, contract_ids, starts, stops = _partition(df)
+    column_order = [c for c in df.columns if c != CONTRACT_COL]
+    # Sorted categories keep the per-wallet grouping order identical to strings; missing
+    # wallets get a category of their own (a -1 sentinel would index the last wallet)
+    # and come back as NaN, which the per-contract groupby drops as on the serial path
+    wallet_codes, wallet_categories = pd.factorize(df['wallet_address'], sort=True, use_na_sentinel=False)
+    wallet_categories = np.asarray(wallet_categories, dtype=object)
+    # Fixed-width columns (numbers, timestamps) are shared; anything else is pickled once per worker
+    shared = [c for c in column_order if c != 'wallet_address' and df[c].to_numpy().dtype.kind in 'biufmM']
+    pickled = {c: df[c].to_numpy() for c in column_order if c not in shared and c != 'wallet_address'}
+
+    segments = []
+    try:
+        layout = {column: _share(df[column].to_numpy(), segments) for column in shared}
+        layout['wallet_code'] = _share(wallet_codes.astype(np.int64), segments)
+
+        triples = list(zip(contract_ids.tolist(), starts.tolist(), stops.tolist()))
+        n_tasks = max(1, min(len(triples), workers * tasks_per_worker))
+        tasks = [triples[i::n_tasks] for i in range(n_tasks)]
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(layout, wallet_categories, pickled)) as pool:
+            rows = [row for chunk in pool.map(_audit_task, tasks) for row in chunk]
+    finally:
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+    return _rank(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit every contract in a multi-contract frame.")
+    parser.add_argument('transactions', help="CSV/Parquet with contract_id and the bitconnect_test columns (see scenario_generator.py)")
+    parser.add_argument('--workers', type=int, default=None, help="Process count (1 = serial)")
+    parser.add_argument('--out', default=os.path.join('outputs', 'audit_report.csv'))
+    args = parser.parse_args(argv)
+
+    if os.path.splitext(args.transactions)[1].lower() in ('.parquet', '.pq'):
+        df = pd.read_parquet(args.transactions)
+    else:
+        df = pd.read_csv(args.transactions, parse_dates=['timestamp'])
+    report = audit_parallel(df, workers=args.workers)
+    os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+    report.to_csv(args.out, index=False)
+    print(report.head(20).to_string(index=False))
+    print(f"--- Audited {len(report)} contracts; report saved to '{args.out}' ---")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+"""
+Benchmark harness for the detection engines.
+
+Runs every engine on seeded synthetic inputs at increasing scales and
+records wall time, throughput and two memory figures to a JSON file:
+rss_peak_mb, how far resident memory rose during one run (sampled, so it
+includes sklearn's and NumPy's C allocations; on glibc freed heap pages are
+returned to the OS first, elsewhere reused memory does not show), and
+python_heap_peak_mb, the tracemalloc peak, which only covers allocations
+made through Python's allocators. Comparing against a stored baseline
+flags regressions.
+
+    python -m ponzi_detection.benchmark_suite                                # 1e3 .. 1e7
+    python -m ponzi_detection.benchmark_suite --scales 1e3,1e4,1e5 --only yield_health,red_flag_scores
+    python -m ponzi_detection.benchmark_suite --save-baseline                # record outputs/benchmark_baseline.json
+    python -m ponzi_detection.benchmark_suite --baseline outputs/benchmark_baseline.json --fail-on-regression
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ponzi_detection.instrumentation import RssSampler
+
+DEFAULT_SCALES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+DEFAULT_RESULTS = os.path.join('outputs', 'benchmark_results.json')
+DEFAULT_BASELINE = os.path.join('outputs', 'benchmark_baseline.json')
+DEFAULT_TOLERANCE = 0.25  # Flag runs more than 25% slower than the baseline
+
+
+# ---------- Seeded synthetic inputs ----------
+def _daily_frame(n, rng, n_contracts=1):
+    """calculate_yield_health-shaped frame with n rows."""
+    deposits = rng.uniform(500, 60000, n)
+    frame = pd.DataFrame({
+        'timestamp': pd.date_range('2018-01-01', periods=n, freq='min'),
+        'new_deposits': deposits,
+        'yield_disbursed': deposits * rng.uniform(0.2, 1.6, n),
+        'treasury_balance': rng.uniform(0, 400000, n),
+        'wallet_address': pd.Categorical.from_codes(rng.integers(0, max(n // 10, 1), n),
+                                                    [f"0x{i:08x}" for i in range(max(n // 10, 1))]),
+    })
+    if n_contracts > 1:
+        frame['contract_id'] = np.sort(rng.integers(0, n_contracts, n))
+    return frame
+
+
+def _score_inputs(n, rng):
+    return rng.uniform(0, 3, n), rng.uniform(0, 1, n), rng.uniform(-0.1, 0.4, n)
+
+
+# ---------- Benchmarks: (setup(n, rng) -> data, run(data), max_scale) ----------
+def _setup_yield(n, rng):
+    return _daily_frame(n, rng)
+
+
+def _run_yield(df):
+    from ponzi_detection.yield_engine import calculate_yield_health
+    calculate_yield_health(df.copy())
+
+
+def _setup_panel(n, rng):
+    return _daily_frame(n, rng, n_contracts=max(n // 365, 2))
+
+
+def _run_panel(df):
+    from ponzi_detection.yield_engine import calculate_yield_health_panel
+    calculate_yield_health_panel(df)
+
+
+def _run_concentration(df):
+    from ponzi_detection.concentration_engine import analyze_wallet_concentration
+    analyze_wallet_concentration(df)
+
+
+def _setup_gini(n, rng):
+    return rng.pareto(1.5, n)
+
+
+def _run_gini(balances):
+    from ponzi_detection.concentration_engine import calculate_gini
+    calculate_gini(balances)
+
+
+def _setup_tracker(n, rng):
+    return rng.integers(0, max(n // 10, 1), n).tolist(), rng.exponential(10, n).tolist()
+
+
+def _run_tracker(data):
+    from ponzi_detection.concentration_engine import ConcentrationTracker
+    tracker = ConcentrationTracker()
+    tracker.update_many(*data)
+    tracker.snapshot()
+
+
+def _run_red_flag_scalar(data):
+    from ponzi_detection.scoring_engine import calculate_red_flag_score
+    for s, g, d in zip(*(a.tolist() for a in data)):
+        calculate_red_flag_score(s, g, d)
+
+
+def _run_red_flag_batch(data):
+    from ponzi_detection.scoring_engine import calculate_red_flag_scores
+    calculate_red_flag_scores(*data)
+
+
+def _setup_warnings(n, rng):
+    return rng.uniform(0, 100, n), rng.uniform(0, 100, n), rng.uniform(-0.3, 0.1, n)
+
+
+def _run_warnings_scalar(data):
+    from ponzi_detection.warning_system import check_early_warnings
+    for current, previous, delta in zip(*(a.tolist() for a in data)):
+        check_early_warnings(current, previous, delta)
+
+
+def _setup_monitor(n, rng):
+    n_contracts = max(n // 30, 1)
+    return n_contracts, rng.integers(0, n_contracts, n), rng.uniform(0, 100, n), rng.uniform(-0.3, 0.1, n)
+
+
+def _run_monitor(data):
+    from ponzi_detection.warning_system import WarningMonitor
+    n_contracts, ids, scores, deltas = data
+    monitor = WarningMonitor(n_contracts, history=30)
+    # Cycle-sized batches, as a live feed would deliver them
+    for start in range(0, len(ids), n_contracts):
+        stop = start + n_contracts
+        monitor.update(ids[start:stop].tolist(), scores[start:stop], deltas[start:stop])
+
+
+def _setup_features(n, rng):
+    return n
+
+
+def _run_features(n):
+    from ponzi_detection.engine import generate_features
+    generate_features(n, seed=42)
+
+
+def _run_scenarios(n):
+    from ponzi_detection.scenario_generator import generate_scenarios
+    generate_scenarios(max(n // 60, 1), days=60, seed=42)
+
+
+def _setup_rolling(n, rng):
+    from ponzi_detection.scenario_generator import generate_scenarios
+    return generate_scenarios(max(n // 120, 1), days=120, seed=42)
+
+
+def _run_rolling(df):
+    from ponzi_detection.rolling_engine import RollingFeatureEngine
+    RollingFeatureEngine().backfill(df)
+
+
+def _setup_graph(n, rng):
+    # Transaction log: deposits, payouts and wallet-to-wallet transfers over n // 1000 contracts
+    wallets = np.char.add('0xw', np.arange(max(n // 10, 2)).astype(str))
+    contracts = np.char.add('0xc', np.arange(max(n // 1000, 1)).astype(str))
+    contract = contracts[rng.integers(0, len(contracts), n)]
+    a, b = wallets[rng.integers(0, len(wallets), n)], wallets[rng.integers(0, len(wallets), n)]
+    kind = rng.integers(0, 3, n)
+    return pd.DataFrame({
+        'contract_address': contract,
+        'from_address': np.where(kind == 2, contract, a),
+        'to_address': np.where(kind == 1, contract, b),
+        'value': rng.random(n) * 100,
+        'timestamp': rng.integers(1_500_000_000, 1_530_000_000, n),
+    })
+
+
+def _run_graph(df):
+    from ponzi_detection.graph_engine import WalletFlowGraph
+    graph = WalletFlowGraph().update(df)
+    graph.features()
+    graph.insider_candidates()
+
+
+def _setup_series(n, rng):
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2015-01-01', periods=n, freq='min'),
+        'new_deposits': np.abs(np.cumsum(rng.normal(size=n))),
+        'yield_disbursed': np.abs(np.cumsum(rng.normal(size=n))),
+    })
+
+
+def _run_downsample(df):
+    from ponzi_detection.render_layer import downsample_frame
+    downsample_frame(df, 'timestamp', ['new_deposits', 'yield_disbursed'],
+                     crossover=('new_deposits', 'yield_disbursed'))
+
+
+def _run_top_k_page(df):
+    from ponzi_detection.render_layer import top_k_page
+    top_k_page(df, 'new_deposits', page=3)
+
+
+def _setup_train(n, rng):
+    from ponzi_detection.engine import generate_features
+    return generate_features(n, seed=42)
+
+
+def _run_train(df):
+    from imblearn.over_sampling import SMOTE
+    from sklearn.ensemble import RandomForestClassifier
+    from ponzi_detection.engine import FEATURES
+    X_res, y_res = SMOTE(sampling_strategy=1.0, random_state=42).fit_resample(df[FEATURES], df['Ponzi'])
+    RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=1).fit(X_res, y_res)
+
+
+_trained = {}
+
+
+def _setup_score(n, rng):
+    from sklearn.ensemble import RandomForestClassifier
+    from ponzi_detection.engine import FEATURES, generate_features
+    if 'model' not in _trained:
+        train = generate_features(seed=42)
+        _trained['model'] = RandomForestClassifier(n_estimators=100, random_state=42).fit(
+            train[FEATURES], train['Ponzi'])
+    return _trained['model'], generate_features(n, seed=7)[FEATURES]
+
+
+def _run_score(data):
+    model, X = data
+    model.predict_proba(X)
+
+
+def _setup_score_flat(n, rng):
+    from ponzi_detection.flat_forest import FlatForest
+    model, X = _setup_score(n, rng)
+    return FlatForest.from_sklearn(model), X.to_numpy()
+
+
+def _setup_score_cached(n, rng):
+    # Warm cache for every contract, then ~1% of rows change before the timed run
+    import tempfile
+    from ponzi_detection.incremental_scoring import score_incremental
+    from ponzi_detection.model_store import RISK_THRESHOLDS
+    forest, X = _setup_score_flat(n, rng)
+    index = [f"0x{value:040x}" for value in range(len(X))]
+    cache_path = os.path.join(tempfile.mkdtemp(prefix='score_cache_'), 'scores.npz')
+    score_incremental(index, X, forest.predict_proba, 'bench', RISK_THRESHOLDS, cache_path)
+    X = X.copy()
+    changed = rng.choice(len(X), max(len(X) // 100, 1), replace=False)
+    X[changed, 0] += 1.0
+    return forest, index, X, cache_path
+
+
+def _run_score_cached(data):
+    from ponzi_detection.incremental_scoring import score_incremental
+    from ponzi_detection.model_store import RISK_THRESHOLDS
+    forest, index, X, cache_path = data
+    score_incremental(index, X, forest.predict_proba, 'bench', RISK_THRESHOLDS, cache_path, save=False)
+
+
+BENCHMARKS = {
+    'yield_health':          (_setup_yield, _run_yield, 10_000_000),
+    'yield_health_panel':    (_setup_panel, _run_panel, 10_000_000),
+    'wallet_concentration':  (_setup_yield, _run_concentration, 10_000_000),
+    'calculate_gini':        (_setup_gini, _run_gini, 10_000_000),
+    'concentration_tracker': (_setup_tracker, _run_tracker, 100_000),
+    'red_flag_score':        (_score_inputs, _run_red_flag_scalar, 1_000_000),
+    'red_flag_scores':       (_score_inputs, _run_red_flag_batch, 10_000_000),
+    'early_warnings':        (_setup_warnings, _run_warnings_scalar, 1_000_000),
+    'warning_monitor':       (_setup_monitor, _run_monitor, 10_000_000),
+    'generate_features':     (_setup_features, _run_features, 10_000_000),
+    'scenario_generator':    (_setup_features, _run_scenarios, 10_000_000),
+    'rolling_backfill':      (_setup_rolling, _run_rolling, 100_000),
+    'graph_features':        (_setup_graph, _run_graph, 10_000_000),
+    'chart_downsample':      (_setup_series, _run_downsample, 10_000_000),
+    'table_top_k_page':      (_setup_series, _run_top_k_page, 10_000_000),
+    'engine_train':          (_setup_train, _run_train, 100_000),
+    'engine_score':          (_setup_score, _run_score, 1_000_000),
+    'engine_score_flat':     (_setup_score_flat, _run_score, 1_000_000),
+    'engine_score_cached':   (_setup_score_cached, _run_score_cached, 1_000_000),
+}
+
+
+def _release_free_memory():
+    """Returns freed heap pages to the OS (glibc only), so the next run's RSS growth is its own."""
+    try:
+        import ctypes
+        ctypes.CDLL('libc.so.6').malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def measure(name, n, repeat=3, seed=0):
+    """Best-of-`repeat` wall time, one run with RSS sampling and one under tracemalloc."""
+    setup, run, _ = BENCHMARKS[name]
+    data = setup(n, np.random.default_rng(seed))
+    run(data)  # Warm-up: lazy imports and first-touch allocations stay out of the timings
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run(data)
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    _release_free_memory()
+    sampler = RssSampler().start()
+    run(data)
+    rss_peak = sampler.stop()
+
+    gc.collect()
+    tracemalloc.start()
+    run(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(times)
+    return {
+        'benchmark': name,
+        'n': n,
+        'wall_time_s': best,
+        'mean_time_s': sum(times) / len(times),
+        'rss_peak_mb': None if rss_peak is None else rss_peak - sampler.start_mb,
+        'python_heap_peak_mb': peak / 2**20,
+        'throughput_per_s': n / best if best > 0 else float('inf'),
+    }
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Rows whose wall time exceeds the baseline by more than `tolerance`."""
+    reference = {(r['benchmark'], r['n']): r for r in baseline.get('results', [])}
+    regressions = []
+    for r in results:
+        base = reference.get((r['benchmark'], r['n']))
+        if base is None or base['wall_time_s'] <= 0:
+            continue
+        ratio = r['wall_time_s'] / base['wall_time_s']
+        r['baseline_ratio'] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(r)
+    return regressions
+
+
+def run_suite(scales=DEFAULT_SCALES, only=None, repeat=3):
+    names = only or list(BENCHMARKS)
+    results = []
+    for name in names:
+        for n in scales:
+            if n > BENCHMARKS[name][2]:
+                print(f"  {name:<22} n={n:>10,}  skipped (above max scale {BENCHMARKS[name][2]:,})")
+                continue
+            r = measure(name, n, repeat=repeat)
+            results.append(r)
+            rss = 'n/a' if r['rss_peak_mb'] is None else f"{r['rss_peak_mb']:.1f}"
+            print(f"  {name:<22} n={n:>10,}  {r['wall_time_s']*1000:>10.2f} ms  RSS +{rss:>8} MB  "
+                  f"Python heap {r['python_heap_peak_mb']:>8.1f} MB  {r['throughput_per_s']:>14,.0f}/s")
+    return results
+
+
+def environment():
+    import sklearn
+    return {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Ponzi detection engines.")
+    parser.add_argument('--scales', default=','.join(str(s) for s in DEFAULT_SCALES),
+                        help="Comma-separated sizes, e.g. 1e3,1e4,1e5")
+    parser.add_argument('--only', default=None, help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=DEFAULT_RESULTS)
+    parser.add_argument('--baseline', default=None, help="Baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help=f"Also write results to {DEFAULT_BASELINE}")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args(argv)
+
+    scales = [int(float(s)) for s in args.scales.split(',')]
+    only = args.only.split(',') if args.only else None
+    unknown = set(only or []) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    print("--- Benchmarking detection engines ---")
+    results = run_suite(scales, only, args.repeat)
+    report = {'environment': environment(), 'results': results}
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        report['baseline'] = args.baseline
+        report['regressions'] = [(r['benchmark'], r['n']) for r in regressions]
+        for r in regressions:
+            print(f"  REGRESSION {r['benchmark']} n={r['n']:,}: {r['baseline_ratio']:.2f}x baseline")
+        if not regressions:
+            print(f"  No regressions beyond {args.tolerance:.0%} of baseline")
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"--- Results saved to '{args.output}' ---")
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"--- Baseline saved to '{DEFAULT_BASELINE}' ---")
+
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
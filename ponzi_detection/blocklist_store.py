@@ -0,0 +1,440 @@
+"""
+Compact, indexed firewall blocklist.
+
+Layout of a store directory (default outputs/blocklist/):
+    meta.json            current generation, key kind, counts, bloom settings
+    keys-<gen>.npy       sorted 20-byte address keys (memory-mapped on read)
+    bloom-<gen>.npy      Bloom filter bits in front of the sorted keys
+    delta-<seq>.npz      append-only 'add' / 'remove' key batches
+
+Membership is a Bloom filter probe plus an O(log n) binary search over the
+memory-mapped keys, overlaid with the pending deltas. compact() folds the
+deltas into a new generation; compact_in_background() does so on a thread
+while readers keep using the previous generation. read_blocklist() never
+writes: without a store it serves the legacy JSON list from memory
+(JsonBlocklist) unless asked to migrate it.
+"""
+import glob
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+FORMAT_VERSION = 1
+DEFAULT_STORE_DIR = os.path.join('outputs', 'blocklist')
+ADDRESS_BYTES = 20
+KEY_DTYPE = np.dtype(f'S{ADDRESS_BYTES}')
+
+BLOOM_BITS_PER_KEY = 10
+BLOOM_HASHES = 7  # ~1% false positive rate at 10 bits/key
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _hex_address(text):
+    """Bytes of a '0x' + up to 40 hex digit address, or None for anything else."""
+    if not text.startswith('0x') or len(text) > 2 + 2 * ADDRESS_BYTES:
+        return None
+    try:
+        return bytes.fromhex(text[2:].rjust(2 * ADDRESS_BYTES, '0'))
+    except ValueError:
+        return None
+
+
+def _id_key(namespace, text):
+    """Domain-separated BLAKE2b key for ids that are not addresses."""
+    return hashlib.blake2b(f"{namespace}:{text}".encode(), digest_size=ADDRESS_BYTES).digest()
+
+
+def address_key(address, kind='address'):
+    """
+    20-byte key for a contract id. A '0x...' address maps to its own bytes
+    and, in an 'index' store, an integer to its big-endian bytes; both decode
+    back with key_to_address. Any other id (integers outside index stores,
+    non-hex strings such as 'contract_A') maps to a namespaced hash, so it
+    can neither fail nor collide with an address (int 5 is not '0x05').
+    """
+    if isinstance(address, (bytes, np.bytes_)):
+        return bytes(address).rjust(ADDRESS_BYTES, b'\0')
+    if isinstance(address, (int, np.integer)):
+        if kind == 'index':
+            if not 0 <= address < 1 << (8 * ADDRESS_BYTES):
+                raise ValueError(f"Contract index must be an integer in [0, 2**{8 * ADDRESS_BYTES}), got {address}")
+            return int(address).to_bytes(ADDRESS_BYTES, 'big')
+        return _id_key('int', int(address))
+    text = str(address).strip()
+    raw = _hex_address(text.lower())
+    return raw if raw is not None else _id_key('str', text)
+
+
+def address_keys(addresses, kind='address'):
+    addresses = addresses.tolist() if hasattr(addresses, 'tolist') else list(addresses)
+    n = len(addresses)
+    if n and set(map(type, addresses)) <= {str, np.str_} and set(map(len, addresses)) == {2 + 2 * ADDRESS_BYTES}:
+        # Fast path for full-length hex addresses: one bytes.fromhex over the joined digits
+        joined = ''.join(addresses)
+        if joined[0::2 + 2 * ADDRESS_BYTES] == '0' * n and joined[1::2 + 2 * ADDRESS_BYTES].lower() == 'x' * n:
+            try:
+                raw = bytes.fromhex(''.join([a[2:] for a in addresses]))
+            except ValueError:
+                pass  # Not all hex; address_key() hashes the odd ones out
+            else:
+                return np.frombuffer(raw, dtype=KEY_DTYPE).copy()
+    return np.array([address_key(a, kind) for a in addresses], dtype=KEY_DTYPE)
+
+
+def key_to_address(key, kind='address'):
+    raw = bytes(key).ljust(ADDRESS_BYTES, b'\0')
+    if kind == 'index':
+        return int.from_bytes(raw, 'big')
+    return '0x' + raw.hex()
+
+
+def _item_kind(address):
+    """'index' for integers, 'address' for hex addresses (and raw keys), 'id' for anything else."""
+    if isinstance(address, (int, np.integer)):
+        return 'index'
+    if isinstance(address, (bytes, np.bytes_)) or _hex_address(str(address).strip().lower()) is not None:
+        return 'address'
+    return 'id'
+
+
+def _infer_kind(addresses):
+    """'index' for a non-empty list of integers, otherwise 'address' (the default for empty stores)."""
+    kinds = {_item_kind(a) for a in addresses}
+    return 'index' if kinds == {'index'} else 'address'
+
+
+def _check_kind(addresses, kind):
+    """Stored entries must decode back: integers in 'index' stores, hex addresses otherwise."""
+    mismatched = {_item_kind(a) for a in addresses} - {kind}
+    if mismatched:
+        found = mismatched.pop()
+        what = 'non-address ids' if found == 'id' else f"{found} entries"
+        raise ValueError(f"Blocklist holds {what} but the store kind is '{kind}'")
+
+
+def splitmix64(x):
+    """Vectorized SplitMix64 finalizer over a uint64 array."""
+    x = np.asarray(x, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        x = (x + np.uint64(0x9E3779B97F4A7C15)) & _MASK64
+        x = ((x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)) & _MASK64
+        x = ((x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)) & _MASK64
+    return x ^ (x >> np.uint64(31))
+
+
+def _key_hashes(keys):
+    """Two independent 64-bit hashes per key for double hashing."""
+    raw = np.ascontiguousarray(keys, dtype=KEY_DTYPE).view(np.uint8).reshape(-1, ADDRESS_BYTES)
+    head = np.ascontiguousarray(raw[:, :4]).view('>u4').ravel().astype(np.uint64)
+    mid = np.ascontiguousarray(raw[:, 4:12]).view('>u8').ravel().astype(np.uint64)
+    low = np.ascontiguousarray(raw[:, 12:]).view('>u8').ravel().astype(np.uint64)
+    h1 = splitmix64(low ^ splitmix64(mid ^ splitmix64(head)))
+    h2 = splitmix64(h1 ^ np.uint64(0x5851F42D4C957F2D)) | np.uint64(1)
+    return h1, h2
+
+
+class BloomFilter:
+    """Bit-array Bloom filter over 20-byte keys."""
+
+    def __init__(self, bits, n_hashes=BLOOM_HASHES):
+        self.bits = bits
+        self.n_hashes = n_hashes
+        self.n_bits = np.uint64(len(bits) * 8)
+
+    @classmethod
+    def build(cls, keys, bits_per_key=BLOOM_BITS_PER_KEY, n_hashes=BLOOM_HASHES):
+        n_bytes = max(8, (len(keys) * bits_per_key + 7) // 8)
+        bloom = cls(np.zeros(n_bytes, dtype=np.uint8), n_hashes)
+        if len(keys):
+            for pos in bloom._positions(keys):
+                byte_index = (pos >> np.uint64(3)).astype(np.int64)
+                bit = np.uint8(1) << (pos & np.uint64(7)).astype(np.uint8)
+                np.bitwise_or.at(bloom.bits, byte_index, bit)
+        return bloom
+
+    def _positions(self, keys):
+        h1, h2 = _key_hashes(keys)
+        with np.errstate(over='ignore'):
+            for i in range(self.n_hashes):
+                yield (h1 + np.uint64(i) * h2) % self.n_bits
+
+    def might_contain(self, keys):
+        hit = np.ones(len(keys), dtype=bool)
+        for pos in self._positions(keys):
+            byte = self.bits[(pos >> np.uint64(3)).astype(np.int64)]
+            hit &= (byte >> (pos & np.uint64(7)).astype(np.uint8)) & 1 == 1
+        return hit
+
+
+class BlocklistStore:
+    """Sorted-key blocklist with a Bloom front and append-only deltas."""
+
+    def __init__(self, path=DEFAULT_STORE_DIR):
+        self.path = path
+        self._lock = threading.Lock()
+        self._load()
+
+    # ---------- building ----------
+    @classmethod
+    def build(cls, addresses, path=DEFAULT_STORE_DIR, kind=None, source=None):
+        """
+        Writes a fresh store holding exactly `addresses` (replaces deltas).
+        `kind` ('address' or 'index') defaults to what `addresses` hold, and
+        to 'address' when there are none; pass it when the list may be empty.
+        `source` is an opaque tag of what produced the list (engine.py: the
+        model version), kept in meta.json across deltas and compactions.
+        """
+        addresses = list(addresses)
+        if kind not in (None, 'address', 'index'):
+            raise ValueError(f"Unknown blocklist kind {kind!r}")
+        os.makedirs(path, exist_ok=True)
+        kind = kind or _infer_kind(addresses)
+        _check_kind(addresses, kind)
+        generation = cls._read_meta(path).get('generation', 0) + 1
+        keys = np.unique(address_keys(addresses, kind))
+        last_seq = max([cls._delta_seq(p) for p in cls._delta_paths(path)], default=0)
+        cls._write_generation(path, keys, kind, generation, merged_delta_seq=last_seq, source=source)
+        cls._cleanup(path, generation, last_seq)
+        return cls(path)
+
+    @staticmethod
+    def _read_meta(path):
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            return {}
+        with open(meta_path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _delta_paths(path):
+        return sorted(glob.glob(os.path.join(path, 'delta-*.npz')))
+
+    @staticmethod
+    def _delta_seq(delta_path):
+        return int(os.path.basename(delta_path)[len('delta-'):-len('.npz')])
+
+    @staticmethod
+    def _write_generation(path, keys, kind, generation, merged_delta_seq, source=None):
+        bloom = BloomFilter.build(keys)
+        np.save(os.path.join(path, f'keys-{generation:06d}.npy'), keys)
+        np.save(os.path.join(path, f'bloom-{generation:06d}.npy'), bloom.bits)
+        meta = {
+            'format_version': FORMAT_VERSION,
+            'generation': generation,
+            'kind': kind,
+            'count': int(len(keys)),
+            'bloom_hashes': bloom.n_hashes,
+            'merged_delta_seq': merged_delta_seq,
+            'source': source,
+        }
+        tmp = os.path.join(path, 'meta.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, os.path.join(path, 'meta.json'))  # Atomic switch to the new generation
+
+    @classmethod
+    def _cleanup(cls, path, generation, merged_delta_seq):
+        for old in glob.glob(os.path.join(path, 'keys-*.npy')) + glob.glob(os.path.join(path, 'bloom-*.npy')):
+            if not old.endswith(f'-{generation:06d}.npy'):
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass  # Still mapped by a reader on some platforms; next cleanup gets it
+        for delta in cls._delta_paths(path):
+            if cls._delta_seq(delta) <= merged_delta_seq:
+                os.remove(delta)
+
+    # ---------- reading ----------
+    def _load(self):
+        meta = self._read_meta(self.path)
+        if not meta:
+            raise FileNotFoundError(f"No blocklist store at '{self.path}'")
+        if meta['format_version'] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported blocklist format {meta['format_version']}")
+        gen = meta['generation']
+        keys = np.load(os.path.join(self.path, f'keys-{gen:06d}.npy'), mmap_mode='r')
+        bloom = BloomFilter(np.load(os.path.join(self.path, f'bloom-{gen:06d}.npy'), mmap_mode='r'),
+                            meta['bloom_hashes'])
+        added, removed, last_seq = set(), set(), meta['merged_delta_seq']
+        for delta_path in self._delta_paths(self.path):
+            seq = self._delta_seq(delta_path)
+            if seq <= meta['merged_delta_seq']:
+                continue
+            with np.load(delta_path) as delta:
+                self._apply_delta(added, removed, delta['add'], delta['remove'])
+            last_seq = max(last_seq, seq)
+        with self._lock:
+            self.meta, self.keys, self.bloom = meta, keys, bloom
+            self._added, self._removed, self._last_seq = added, removed, last_seq
+
+    @staticmethod
+    def _apply_delta(added, removed, add_keys, remove_keys):
+        add_keys = {bytes(k).ljust(ADDRESS_BYTES, b'\0') for k in add_keys}
+        remove_keys = {bytes(k).ljust(ADDRESS_BYTES, b'\0') for k in remove_keys}
+        added |= add_keys
+        removed -= add_keys
+        added -= remove_keys
+        removed |= remove_keys
+
+    def reload(self):
+        self._load()
+
+    @property
+    def kind(self):
+        return self.meta['kind']
+
+    @property
+    def source(self):
+        return self.meta.get('source')
+
+    def _in_base(self, keys):
+        found = self.bloom.might_contain(keys)
+        candidates = np.flatnonzero(found)
+        if len(candidates) and len(self.keys):
+            pos = np.searchsorted(self.keys, keys[candidates])
+            pos = np.minimum(pos, len(self.keys) - 1)
+            found[candidates] = self.keys[pos] == keys[candidates]
+        else:
+            found[:] = False
+        return found
+
+    def contains_many(self, addresses):
+        """Vectorized membership for a batch of addresses (ids of another kind are simply absent)."""
+        keys = address_keys(addresses, self.kind)
+        with self._lock:
+            found = self._in_base(keys)
+            if self._added or self._removed:
+                for i, key in enumerate(keys.tolist()):
+                    key = key.ljust(ADDRESS_BYTES, b'\0')
+                    if key in self._added:
+                        found[i] = True
+                    elif key in self._removed:
+                        found[i] = False
+        return found
+
+    def __contains__(self, address):
+        return bool(self.contains_many([address])[0])
+
+    def __len__(self):
+        with self._lock:
+            added = np.array(sorted(self._added), dtype=KEY_DTYPE)
+            removed = np.array(sorted(self._removed), dtype=KEY_DTYPE)
+            new = int((~self._in_base(added)).sum())
+            gone = int(self._in_base(removed).sum())
+            return len(self.keys) + new - gone
+
+    def _merged_keys(self):
+        """Sorted keys of the base merged with pending deltas (caller holds the lock)."""
+        keys = np.asarray(self.keys)
+        if self._removed:
+            keys = keys[~np.isin(keys, np.array(sorted(self._removed), dtype=KEY_DTYPE))]
+        if self._added:
+            keys = np.union1d(keys, np.array(sorted(self._added), dtype=KEY_DTYPE))
+        return keys
+
+    def iter_addresses(self, limit=None):
+        """Blocked addresses in key order (base merged with pending deltas)."""
+        with self._lock:
+            keys, kind = self._merged_keys(), self.kind
+        if limit is not None:
+            keys = keys[:limit]
+        return [key_to_address(k, kind) for k in keys.tolist()]
+
+    def delta_to(self, addresses):
+        """(add, remove) lists that make the store hold exactly `addresses`."""
+        addresses = list(addresses)
+        _check_kind(addresses, self.kind)
+        wanted = np.unique(address_keys(addresses, self.kind))
+        with self._lock:
+            current, kind = self._merged_keys(), self.kind
+        add = wanted[~np.isin(wanted, current)]
+        remove = current[~np.isin(current, wanted)]
+        return [key_to_address(k, kind) for k in add.tolist()], [key_to_address(k, kind) for k in remove.tolist()]
+
+    # ---------- writing ----------
+    def append_delta(self, add=(), remove=()):
+        """
+        Appends one delta file; visible to this reader immediately. Entries
+        must be of the store's kind (integers for 'index', addresses otherwise).
+        """
+        add, remove = list(add), list(remove)
+        _check_kind(add + remove, self.kind)
+        add_keys, remove_keys = address_keys(add, self.kind), address_keys(remove, self.kind)
+        with self._lock:
+            seq = self._last_seq + 1
+            tmp = os.path.join(self.path, f'delta-{seq:06d}.npz.tmp')
+            with open(tmp, 'wb') as f:
+                np.savez(f, add=add_keys, remove=remove_keys)
+            os.replace(tmp, os.path.join(self.path, f'delta-{seq:06d}.npz'))
+            self._apply_delta(self._added, self._removed, add_keys, remove_keys)
+            self._last_seq = seq
+        return seq
+
+    def compact(self):
+        """Merges every pending delta into a new base generation."""
+        with self._lock:
+            keys = np.asarray(self.keys)
+            added = np.array(sorted(self._added), dtype=KEY_DTYPE)
+            removed = np.array(sorted(self._removed), dtype=KEY_DTYPE)
+            merged_seq, generation, kind = self._last_seq, self.meta['generation'] + 1, self.kind
+        if len(removed):
+            keys = keys[~np.isin(keys, removed)]
+        keys = np.union1d(keys, added).astype(KEY_DTYPE)
+        self._write_generation(self.path, keys, kind, generation, merged_delta_seq=merged_seq, source=self.source)
+        self._load()
+        self._cleanup(self.path, generation, merged_seq)
+        return generation
+
+    def compact_in_background(self):
+        """Runs compact() on a daemon thread; returns the thread."""
+        thread = threading.Thread(target=self.compact, name='blocklist-compact', daemon=True)
+        thread.start()
+        return thread
+
+    def export_json(self, json_path):
+        """Writes the legacy firewall_blocklist.json list."""
+        with open(json_path, 'w') as f:
+            json.dump(self.iter_addresses(), f)
+
+
+class JsonBlocklist:
+    """Read-only, in-memory view of a legacy JSON blocklist with the store's read methods."""
+
+    def __init__(self, addresses):
+        addresses = list(addresses)
+        self.kind = _infer_kind(addresses)
+        keys = address_keys(addresses, self.kind)
+        self.keys, first = np.unique(keys, return_index=True)
+        self._addresses = [addresses[i] for i in first.tolist()]  # Key order, as the store lists them
+
+    def contains_many(self, addresses):
+        return np.isin(address_keys(addresses, self.kind), self.keys)
+
+    def __contains__(self, address):
+        return bool(self.contains_many([address])[0])
+
+    def __len__(self):
+        return len(self.keys)
+
+    def iter_addresses(self, limit=None):
+        return self._addresses[:limit]
+
+
+def read_blocklist(path=DEFAULT_STORE_DIR, json_path=os.path.join('outputs', 'firewall_blocklist.json'),
+                   migrate=False):
+    """
+    Opens the binary store, falling back to the legacy JSON list: read in
+    memory as a JsonBlocklist, or built into a store at `path` with
+    migrate=True (export-blocklist does; dashboards only read).
+    """
+    if os.path.exists(os.path.join(path, 'meta.json')):
+        return BlocklistStore(path)
+    if os.path.exists(json_path):
+        with open(json_path) as f:
+            addresses = json.load(f)
+        return BlocklistStore.build(addresses, path) if migrate else JsonBlocklist(addresses)
+    raise FileNotFoundError("No blocklist found. Run 'ponzi train' first to generate logs.")
@@ -0,0 +1,93 @@
+"""
+Command-line interface for the detection engine.
+
+    ponzi train [--size N] [--output-dir outputs] [--incremental [--retrain]]
+    ponzi train --memory-budget-mb 128 [--features labelled.csv] [--artifact outputs/model]
+    ponzi score features.csv [--artifact outputs/model] [--out scores.csv] [--cache outputs/cache/scores.npz]
+    ponzi audit transactions.csv [--workers 8] [--out outputs/audit_report.csv]
+    ponzi report [--output-dir outputs]
+    ponzi export-blocklist [--format json|txt] [--out blocklist.json]
+
+Only the chosen subcommand's handler module (ponzi_detection.commands) is
+imported, so `score` and `export-blocklist` never load pandas, sklearn or
+matplotlib. The import-time report (python -m ponzi_detection.importtime)
+imports the same handler modules through load_command.
+"""
+import argparse
+import importlib
+import os
+import sys
+
+DEFAULT_OUTPUT_DIR = 'outputs'
+
+# Handler module of each subcommand; importing it loads what the handler uses
+COMMANDS = {
+    'train': 'ponzi_detection.commands.train',
+    'score': 'ponzi_detection.commands.score',
+    'audit': 'ponzi_detection.commands.audit',
+    'report': 'ponzi_detection.commands.report',
+    'export-blocklist': 'ponzi_detection.commands.export_blocklist',
+}
+
+
+def load_command(name):
+    """Imports a subcommand's handler module (and with it all its imports) without running it."""
+    return importlib.import_module(COMMANDS[name])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='ponzi', description="Smart Ponzi Detection Engine")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    train = commands.add_parser('train', help="Train, score, export the blocklist and write the report")
+    train.add_argument('--size', type=int, default=None,
+                       help="Simulated dataset size (default: the real XBlock labels)")
+    train.add_argument('--seed', type=int, default=42)
+    train.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    train.add_argument('--trace-memory', action='store_true',
+                       help="Also record tracemalloc Python-heap peaks per stage (slows the run)")
+    train.add_argument('--incremental', action='store_true',
+                       help="Rescore only contracts whose features or model changed; blocklist as a delta")
+    train.add_argument('--retrain', action='store_true',
+                       help="With --incremental: train a new model even if a valid artifact exists")
+    train.add_argument('--memory-budget-mb', type=float, default=None,
+                       help="Train out of core within this budget (streaming_trainer)")
+    train.add_argument('--features', default=None, help="Labelled feature CSV/Parquet for out-of-core training")
+    train.add_argument('--artifact', default=None, help="Out-of-core artifact directory (default: <output-dir>/model)")
+    train.add_argument('--compare', action='store_true', help="Out-of-core only: also train in memory and compare")
+
+    score = commands.add_parser('score', help="Score feature rows with the trained model artifact")
+    score.add_argument('features', help="CSV (or Parquet) file with one row per contract")
+    score.add_argument('--artifact', default=os.path.join(DEFAULT_OUTPUT_DIR, 'model'))
+    score.add_argument('--index-col', default=None, help="Column (name or position) holding the contract address")
+    score.add_argument('--out', default=None, help="Where to write scores (CSV); prints a summary if omitted")
+    score.add_argument('--cache', default=None, help="Score cache (.npz): rescore only new or changed rows")
+
+    audit = commands.add_parser('audit', help="Audit every contract in a multi-contract transaction frame")
+    audit.add_argument('transactions', help="CSV/Parquet with contract_id and the bitconnect_test columns")
+    audit.add_argument('--workers', type=int, default=None, help="Process count (1 = serial)")
+    audit.add_argument('--out', default=os.path.join(DEFAULT_OUTPUT_DIR, 'audit_report.csv'))
+
+    report = commands.add_parser('report', help="Print the last final report and stage timings")
+    report.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+
+    export = commands.add_parser('export-blocklist', help="Write the firewall blocklist as JSON or plain text")
+    export.add_argument('--store', default=os.path.join(DEFAULT_OUTPUT_DIR, 'blocklist'))
+    export.add_argument('--legacy-json', default=os.path.join(DEFAULT_OUTPUT_DIR, 'firewall_blocklist.json'),
+                        help="Legacy JSON list migrated into the store if no store exists yet")
+    export.add_argument('--format', choices=('json', 'txt'), default='json')
+    export.add_argument('--out', default=None, help="Output file (default: stdout)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return load_command(args.command).run(args)
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"ponzi {args.command}: {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""
+Subcommand handlers for the `ponzi` CLI, one module per subcommand.
+
+Each module imports everything its `run(args)` needs at the top, so
+importing it (cli.load_command) loads exactly what the subcommand loads.
+"""
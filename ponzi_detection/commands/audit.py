@@ -0,0 +1,9 @@
+"""`ponzi audit`: batch audit of a multi-contract transaction frame."""
+from ponzi_detection.audit_runner import main as audit_main
+
+
+def run(args):
+    argv = [args.transactions, '--out', args.out]
+    argv += ['--workers', str(args.workers)] if args.workers else []
+    audit_main(argv)
+    return 0
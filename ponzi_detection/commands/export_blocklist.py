@@ -0,0 +1,22 @@
+"""`ponzi export-blocklist`: dump the firewall blocklist as JSON or plain text."""
+import json
+import sys
+
+from ponzi_detection.blocklist_store import read_blocklist
+
+
+def run(args):
+    addresses = read_blocklist(args.store, args.legacy_json, migrate=True).iter_addresses()
+    out = open(args.out, 'w') if args.out else sys.stdout
+    try:
+        if args.format == 'json':
+            json.dump(addresses, out)
+            out.write('\n')
+        else:
+            out.writelines(f"{address}\n" for address in addresses)
+    finally:
+        if args.out:
+            out.close()
+    if args.out:
+        print(f"{len(addresses)} blocked addresses written to '{args.out}'")
+    return 0
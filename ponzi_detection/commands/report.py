@@ -0,0 +1,22 @@
+"""`ponzi report`: print the last final report and stage timings."""
+import json
+import os
+
+
+def run(args):
+    report_path = os.path.join(args.output_dir, 'final_report.txt')
+    metrics_path = os.path.join(args.output_dir, 'pipeline_metrics.json')
+    if not os.path.exists(report_path):
+        raise FileNotFoundError(f"No report in '{args.output_dir}'. Run 'ponzi train' first.")
+    with open(report_path) as f:
+        print(f.read().strip('\n'))
+
+    if os.path.exists(metrics_path):
+        with open(metrics_path) as f:
+            metrics = json.load(f)
+        print(f"\nStage timings (run started {metrics['started']}):")
+        for record in metrics['stages']:
+            rows = '' if record.get('rows') is None else f"{record['rows']:>10,} rows"
+            print(f"  {record['stage']:<45}{record['duration_s'] * 1000:>10.1f} ms  {rows}")
+        print(f"  {'Total':<45}{metrics['total_duration_s'] * 1000:>10.1f} ms")
+    return 0
@@ -0,0 +1,82 @@
+"""
+`ponzi score`: score a feature CSV with the flat forest, numpy only.
+
+Parquet input and artifacts saved before the flat forest existed fall
+back to ponzi_detection.score (pandas/sklearn), imported only then.
+"""
+import csv
+import os
+import time
+
+import numpy as np
+
+from ponzi_detection.flat_forest import FlatForest
+from ponzi_detection.incremental_scoring import score_incremental
+from ponzi_detection.model_store import FOREST_FILE, assign_risk_tier, load_metadata
+
+
+def read_feature_csv(path, features, index_col):
+    """(index header, index values, float feature matrix) from a CSV, without pandas."""
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        missing = [name for name in features if name not in header]
+        if missing:
+            raise ValueError(f"{path} is missing feature columns: {missing}")
+        columns = [header.index(name) for name in features]
+        if index_col is None:
+            index_pos = None
+        elif isinstance(index_col, int):
+            index_pos = index_col
+        else:
+            index_pos = header.index(index_col)
+        index, rows = [], []
+        for i, record in enumerate(reader):
+            index.append(i if index_pos is None else record[index_pos])
+            rows.append([record[c] or 'nan' for c in columns])
+    index_name = '' if index_pos is None else header[index_pos]
+    X = np.array(rows, dtype=float).reshape(len(rows), len(features))
+    return index_name, index, X
+
+
+def run(args):
+    index_col = int(args.index_col) if args.index_col and args.index_col.isdigit() else args.index_col
+    forest_path = os.path.join(args.artifact, FOREST_FILE)
+    if os.path.splitext(args.features)[1].lower() in ('.parquet', '.pq') or not os.path.exists(forest_path):
+        # Parquet input or a pre-flat-forest artifact: use the pandas/sklearn path
+        from ponzi_detection import score
+        argv = [args.features, '--artifact', args.artifact]
+        argv += ['--index-col', args.index_col] if args.index_col else []
+        argv += ['--out', args.out] if args.out else []
+        argv += ['--cache', args.cache] if args.cache else []
+        score.main(argv)
+        return 0
+
+    start = time.perf_counter()
+    metadata = load_metadata(args.artifact)
+    forest = FlatForest.load(forest_path)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    index_name, index, X = read_feature_csv(args.features, metadata['features'], index_col)
+    if args.cache:
+        result = score_incremental(index, X, forest.predict_proba, metadata['model_version'],
+                                   metadata['thresholds'], args.cache)
+        scores, tiers, stats = result['scores'], result['tiers'], result['stats']
+    else:
+        scores = np.round(forest.predict_proba(X)[:, 1] * 100, 2)
+        tiers = assign_risk_tier(scores, metadata['thresholds'])
+
+    print(f"Model {metadata['model_version']} loaded in {load_ms:.1f} ms; scored {len(scores)} contracts")
+    if args.cache:
+        print(f"Cache: {stats['hits']} hits, {stats['misses']} rescored ({stats['hit_rate']:.1%} hit rate); "
+              f"CRITICAL +{len(result['added'])} / -{len(result['removed'])}")
+    tier_names, counts = np.unique(tiers.astype(str), return_counts=True)
+    for tier, count in sorted(zip(tier_names, counts), key=lambda item: -item[1]):
+        print(f"{tier:<10}{count:>8}")
+    if args.out:
+        with open(args.out, 'w', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow([index_name, 'Risk_Score', 'Risk_Tier'])
+            writer.writerows(zip(index, scores.tolist(), tiers.tolist()))
+        print(f"Scores written to '{args.out}'")
+    return 0
@@ -0,0 +1,26 @@
+"""`ponzi train`: the in-memory pipeline or the out-of-core trainer."""
+import os
+
+from ponzi_detection.engine import run_pipeline
+from ponzi_detection.streaming_trainer import main as streaming_main
+
+
+def run(args):
+    if args.incremental and args.memory_budget_mb is not None:
+        raise ValueError("--incremental applies to the in-memory pipeline, not --memory-budget-mb")
+    if args.retrain and not args.incremental:
+        raise ValueError("--retrain only applies with --incremental (a full run always trains)")
+    if args.memory_budget_mb is not None:
+        # Out-of-core mode: chunked features, streaming rebalancing, per-chunk trees
+        argv = ['--memory-budget-mb', str(args.memory_budget_mb), '--seed', str(args.seed)]
+        argv += ['--features', args.features] if args.features else ['--rows', str(args.size or 1_000_000)]
+        argv += ['--artifact', args.artifact or os.path.join(args.output_dir, 'model')]
+        argv += ['--compare'] if args.compare else []
+        streaming_main(argv)
+        return 0
+    if args.features or args.artifact or args.compare:
+        raise ValueError("--features, --artifact and --compare need --memory-budget-mb")
+
+    run_pipeline(data_size=args.size, seed=args.seed, output_dir=args.output_dir,
+                 trace_memory=args.trace_memory, incremental=args.incremental, retrain=args.retrain)
+    return 0
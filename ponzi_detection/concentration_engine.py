@@ -0,0 +1,238 @@
+import math
+import random
+import numpy as np
+import pandas as pd
+
+from ponzi_detection.instrumentation import instrumented
+
+def calculate_gini(balances):
+    """Calculates the Gini Coefficient for a list of wallet balances."""
+    if len(balances) == 0: return 0
+    sorted_balances = np.sort(balances)
+    n = len(balances)
+    index = np.arange(1, n + 1)
+    # Gini formula: (2 * sum(i * balance) / (n * sum(balance))) - (n + 1) / n
+    return (np.sum((2 * index - n - 1) * sorted_balances) / (n * np.sum(sorted_balances)))
+
+@instrumented
+def analyze_wallet_concentration(df, insider_candidates=None, contract_address=None):
+    """
+    Part 3: Wallet Flow & Concentration Analysis
+    `insider_candidates` is the graph_engine.WalletFlowGraph.insider_candidates()
+    frame; its rows for `contract_address` (required when the frame covers
+    several contracts) are counted as insiders when the wallet received
+    yield here, on top of the 20% share rule.
+    """
+    # Group by wallet to see who holds the most 'Yield Received'
+    wallet_stats = df.groupby('wallet_address')['yield_disbursed'].sum().reset_index()
+    
+    # Calculate Gini Coefficient for the current distribution
+    gini_score = calculate_gini(wallet_stats['yield_disbursed'].values)
+    
+    # Identify 'Insider' Wallets (Wallets holding > 20% of total yield)
+    total_yield = wallet_stats['yield_disbursed'].sum()
+    wallet_stats['yield_share'] = wallet_stats['yield_disbursed'] / total_yield
+    insiders = wallet_stats[wallet_stats['yield_share'] > 0.20]
+    
+    result = {
+        'gini_coefficient': round(gini_score, 2),
+        'insider_count': len(insiders),
+        'is_concentrated': gini_score > 0.80
+    }
+    if insider_candidates is not None:
+        # Graph-flagged wallets (recruiters, non-depositors) of this contract that were paid here;
+        # the graph keys addresses in lower case
+        candidates = insider_candidates
+        if contract_address is not None:
+            candidates = candidates[candidates['contract_address'] == str(contract_address).lower()]
+        elif candidates['contract_address'].nunique() > 1:
+            raise ValueError("insider_candidates covers several contracts; pass contract_address")
+        paid = wallet_stats.loc[wallet_stats['yield_disbursed'] > 0, 'wallet_address']
+        flagged = set(paid[paid.astype(str).str.lower().isin(set(candidates['wallet_address']))])
+        result['graph_insiders'] = sorted(flagged)
+        result['insider_count'] = len(flagged.union(insiders['wallet_address']))
+    return result
+
+class _Node:
+    """Treap node keyed on (balance, wallet seq) with subtree aggregates."""
+    __slots__ = ('value', 'seq', 'prio', 'left', 'right', 'size', 'total', 'weighted')
+
+    def __init__(self, value, seq, prio):
+        self.value = value
+        self.seq = seq
+        self.prio = prio
+        self.left = None
+        self.right = None
+        self.size = 1
+        self.total = value
+        self.weighted = value  # sum(rank * balance) within the subtree
+
+
+def _pull(node):
+    # Re-derive aggregates from children; ranks in the right subtree are
+    # offset by everything to the left, hence the (size_left + 1) terms.
+    left, right = node.left, node.right
+    size_l = left.size if left else 0
+    offset = size_l + 1
+    node.size = offset + (right.size if right else 0)
+    node.total = node.value + (left.total if left else 0.0) + (right.total if right else 0.0)
+    node.weighted = offset * node.value
+    if left:
+        node.weighted += left.weighted
+    if right:
+        node.weighted += right.weighted + offset * right.total
+    return node
+
+
+def _split(node, key):
+    """Splits into (keys < key, keys >= key)."""
+    if node is None:
+        return None, None
+    if (node.value, node.seq) < key:
+        node.right, right = _split(node.right, key)
+        return _pull(node), right
+    left, node.left = _split(node.left, key)
+    return left, _pull(node)
+
+
+def _merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.prio > right.prio:
+        left.right = _merge(left.right, right)
+        return _pull(left)
+    right.left = _merge(left, right.left)
+    return _pull(right)
+
+
+def _erase(node, key):
+    if node is None:
+        return None
+    node_key = (node.value, node.seq)
+    if node_key == key:
+        return _merge(node.left, node.right)
+    if key < node_key:
+        node.left = _erase(node.left, key)
+    else:
+        node.right = _erase(node.right, key)
+    return _pull(node)
+
+
+class ConcentrationTracker:
+    """
+    Part 3 (Streaming): Online Wallet Concentration
+    Keeps per-wallet balances in an order-statistic treap augmented with
+    sum(balance) and sum(rank * balance), so each balance delta costs
+    O(log n) and the Gini coefficient is read straight from the root:
+        G = (2 * sum(i * balance) - (n + 1) * sum(balance)) / (n * sum(balance))
+    which is the same sorted-balance formula used by calculate_gini.
+    """
+
+    def __init__(self, insider_share=0.20, concentration_threshold=0.80, seed=42):
+        self.insider_share = insider_share
+        self.concentration_threshold = concentration_threshold
+        self._rng = random.Random(seed)
+        self._root = None
+        self._wallets = {}  # wallet -> (balance, seq)
+        self._seq_wallet = {}
+        self._next_seq = 0
+
+    def __len__(self):
+        return len(self._wallets)
+
+    def __contains__(self, wallet):
+        return wallet in self._wallets
+
+    def balance(self, wallet):
+        return self._wallets[wallet][0] if wallet in self._wallets else 0.0
+
+    def update(self, wallet, delta):
+        """Applies a balance delta to one wallet (new wallets start at 0)."""
+        if wallet in self._wallets:
+            balance, seq = self._wallets[wallet]
+            self._root = _erase(self._root, (balance, seq))
+        else:
+            balance, seq = 0.0, self._next_seq
+            self._seq_wallet[seq] = wallet
+            self._next_seq += 1
+        balance = float(balance + delta)
+        self._wallets[wallet] = (balance, seq)
+        left, right = _split(self._root, (balance, seq))
+        node = _Node(balance, seq, self._rng.random())
+        self._root = _merge(_merge(left, node), right)
+
+    def update_many(self, wallets, deltas):
+        for wallet, delta in zip(wallets, deltas):
+            self.update(wallet, delta)
+
+    def remove(self, wallet):
+        """Drops a wallet from the distribution entirely."""
+        if wallet in self._wallets:
+            balance, seq = self._wallets.pop(wallet)
+            del self._seq_wallet[seq]
+            self._root = _erase(self._root, (balance, seq))
+
+    @property
+    def total(self):
+        return self._root.total if self._root else 0.0
+
+    @property
+    def gini(self):
+        """
+        Current Gini coefficient (matches calculate_gini on a snapshot): 0 with
+        no wallets, NaN when the balances sum to zero.
+        """
+        if self._root is None:
+            return 0.0
+        n, total = self._root.size, self._root.total
+        if total == 0:
+            return float('nan')
+        return (2 * self._root.weighted - (n + 1) * total) / (n * total)
+
+    def insiders(self):
+        """Wallets holding more than `insider_share` of the total, largest first."""
+        total = self.total
+        found = {}
+        if total <= 0:
+            return found
+        # Only the largest balances can clear the share threshold, so walk
+        # the treap from the right and stop at the first wallet that fails.
+        stack, node = [], self._root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.right
+            node = stack.pop()
+            share = node.value / total
+            if share <= self.insider_share:
+                break
+            found[self._seq_wallet[node.seq]] = share
+            node = node.left
+        return found
+
+    def snapshot(self):
+        """
+        Same shape as analyze_wallet_concentration, plus the insider set. A
+        distribution with nothing in it (no wallets, or balances summing to
+        zero) reports a Gini of 0 and is not concentrated.
+        """
+        gini_score = self.gini
+        if math.isnan(gini_score):
+            gini_score = 0.0
+        insiders = self.insiders()
+        return {
+            'gini_coefficient': round(gini_score, 2),
+            'insider_count': len(insiders),
+            'is_concentrated': gini_score > self.concentration_threshold,
+            'insiders': insiders,
+        }
+
+    @classmethod
+    def from_frame(cls, df, wallet_col='wallet_address', value_col='yield_disbursed', **kwargs):
+        """Seeds a tracker from a transaction history frame."""
+        tracker = cls(**kwargs)
+        totals = df.groupby(wallet_col)[value_col].sum()
+        tracker.update_many(totals.index, totals.to_numpy())
+        return tracker
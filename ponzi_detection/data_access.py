@@ -0,0 +1,277 @@
+"""
+Shared, cached data-access layer for the Streamlit dashboards.
+
+Streamlit re-executes the whole script on every widget interaction, but
+imported modules survive between reruns. Engine outputs are therefore kept
+here in one process-wide LRU cache whose keys include the signature
+(mtime + size, optionally a content hash) of every input file, so a rerun
+with unchanged inputs is a dictionary lookup and a regenerated file is
+picked up automatically.
+
+Loaders that take a caller's DataFrame (load_flow_panel, load_flow_chart,
+load_wallet_page) accept the frame's cache `key`. Frames from a cached
+loader carry one (analysis['key']); for anything else compute
+frame_fingerprint(df) once per rerun and pass it to every loader, instead
+of hashing the frame in each.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join('outputs')
+BLOCKLIST_DIR = os.path.join(OUTPUT_DIR, 'blocklist')
+BLOCKLIST_JSON = os.path.join(OUTPUT_DIR, 'firewall_blocklist.json')
+METRICS_JSON = os.path.join(OUTPUT_DIR, 'pipeline_metrics.json')
+MODEL_DIR = os.path.join(OUTPUT_DIR, 'model')
+
+# Engine sources whose edits must invalidate the simulated contract analysis
+ANALYSIS_SOURCES = ('bitconnect_test.py', 'scenario_generator.py', 'audit_runner.py', 'yield_engine.py',
+                    'concentration_engine.py', 'scoring_engine.py', 'warning_system.py')
+
+DEFAULT_MAX_ENTRIES = 32
+
+
+class LRUCache:
+    """Thread-safe LRU mapping with hit/miss counters."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_or_build(self, key, builder):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = builder()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        return {'entries': len(self._data), 'max_entries': self.max_entries,
+                'hits': self.hits, 'misses': self.misses}
+
+
+_cache = LRUCache()
+_hash_memo = {}
+
+
+def cache_stats():
+    return _cache.stats()
+
+
+def clear_cache():
+    _cache.clear()
+    _hash_memo.clear()
+
+
+def file_signature(path, content_hash=False):
+    """(path, mtime_ns, size[, blake2b]) for a file, or (path, None) if missing."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return (path, None)
+    signature = (path, st.st_mtime_ns, st.st_size)
+    if not content_hash:
+        return signature
+    digest = _hash_memo.get(signature)
+    if digest is None:
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        digest = _hash_memo[signature] = h.hexdigest()
+    return signature + (digest,)
+
+
+def _blocklist_signature():
+    store_files = []
+    if os.path.isdir(BLOCKLIST_DIR):
+        store_files = sorted(os.path.join(BLOCKLIST_DIR, name) for name in os.listdir(BLOCKLIST_DIR)
+                             if name == 'meta.json' or name.startswith('delta-'))
+    return tuple(file_signature(p) for p in store_files) + (file_signature(BLOCKLIST_JSON),)
+
+
+def _source_signature(names):
+    return tuple(file_signature(os.path.join(ROOT, name), content_hash=True) for name in names)
+
+
+# ---------- Firewall blocklist (app.py, app1.py) ----------
+def load_blocklist_summary(preview_rows=10):
+    """
+    Blocklist tiles for the dashboards: {'count', 'preview'}.
+    Raises FileNotFoundError when no blocklist has been generated.
+    """
+    def build():
+        from ponzi_detection.blocklist_store import read_blocklist
+        store = read_blocklist(BLOCKLIST_DIR, BLOCKLIST_JSON)
+        return {'count': len(store), 'preview': store.iter_addresses(limit=preview_rows)}
+    return _cache.get_or_build(('blocklist_summary', preview_rows, _blocklist_signature()), build)
+
+
+def load_blocklist_report():
+    """Full blocklist as the app1 report frame (empty frame if none exists)."""
+    def build():
+        from datetime import datetime
+
+        import pandas as pd
+        from ponzi_detection.blocklist_store import read_blocklist
+        try:
+            blocklist = read_blocklist(BLOCKLIST_DIR, BLOCKLIST_JSON).iter_addresses()
+        except FileNotFoundError:
+            return pd.DataFrame()
+        return pd.DataFrame({"Blocked_Address": blocklist, "Risk_Level": "CRITICAL",
+                             "Timestamp": datetime.now().strftime("%Y-%m-%d")})
+    return _cache.get_or_build(('blocklist_report', _blocklist_signature()), build)
+
+
+# ---------- Pipeline instrumentation (app1.py) ----------
+def load_pipeline_metrics():
+    """
+    Stage and per-function timings from the last 'ponzi train' run as
+    {'stages': DataFrame, 'calls': DataFrame, 'total_duration_s', 'rss_hwm_mb'},
+    or None if no metrics file exists yet.
+    """
+    def build():
+        import json
+
+        import pandas as pd
+        if not os.path.exists(METRICS_JSON):
+            return None
+        with open(METRICS_JSON) as f:
+            metrics = json.load(f)
+        calls = pd.DataFrame.from_dict(metrics.get('calls', {}), orient='index')
+        if not calls.empty:
+            calls = calls.sort_values('total_s', ascending=False)
+        return {
+            'stages': pd.DataFrame(metrics['stages']),
+            'calls': calls,
+            'total_duration_s': metrics['total_duration_s'],
+            'rss_hwm_mb': metrics.get('rss_hwm_mb'),
+        }
+    return _cache.get_or_build(('pipeline_metrics', file_signature(METRICS_JSON)), build)
+
+
+# ---------- Trained model (app.py) ----------
+def load_scoring_artifact():
+    """The engine.py model artifact (flat forest included); FileNotFoundError if not trained yet."""
+    from ponzi_detection.model_store import FOREST_FILE, METADATA_FILE, MODEL_FILE
+    signature = tuple(file_signature(os.path.join(MODEL_DIR, name))
+                      for name in (METADATA_FILE, MODEL_FILE, FOREST_FILE))
+
+    def build():
+        from ponzi_detection.model_store import load_artifact
+        return load_artifact(MODEL_DIR)
+    return _cache.get_or_build(('scoring_artifact', signature), build)
+
+
+def score_contract(features):
+    """
+    Scores one contract's feature values ({feature: value}) with the trained
+    model: returns (Risk_Score 0-100, Risk_Tier, model_version).
+    """
+    import numpy as np
+    from ponzi_detection.model_store import assign_risk_tier
+
+    artifact = load_scoring_artifact()
+    row = np.array([[features[name] for name in artifact.features]], dtype=float)
+    score = round(float(artifact.predict_proba(row)[0, 1] * 100), 2)
+    return score, assign_risk_tier([score], artifact.thresholds)[0], artifact.model_version
+
+
+# ---------- Single-contract analysis (app2.py) ----------
+def analyze_contract(df):
+    """
+    Runs the yield -> concentration -> score -> warnings chain on one
+    contract's daily frame and precomputes the metric tiles.
+    """
+    from ponzi_detection.audit_runner import run_contract_chain
+
+    result = run_contract_chain(df)
+    latest_row = result['df'].iloc[-1]
+    risk_score = result['risk_score']
+    concentration_stats = result['concentration']
+
+    return dict(result, **{
+        'tiles': {
+            'risk_score': f"{risk_score}/100",
+            'sustainability': f"{latest_row['sustainability_ratio']:.2f}x",
+            'gini': f"{concentration_stats['gini_coefficient']}",
+            'runway_days': f"{latest_row['runway_days']:.0f} Days",
+        },
+    })
+
+
+def load_bitconnect_analysis():
+    """Cached analyze_contract() over the BitConnect simulation."""
+    key = ('bitconnect_analysis', _source_signature(ANALYSIS_SOURCES))
+
+    def build():
+        from ponzi_detection.bitconnect_test import generate_bitconnect_data
+        # The frame is only ever rebuilt together with this entry, so its key doubles as the frame's
+        return dict(analyze_contract(generate_bitconnect_data()), key=key)
+    return _cache.get_or_build(key, build)
+
+
+# ---------- risk_dashboard.run_dashboard ----------
+def frame_fingerprint(df):
+    """Content fingerprint of a DataFrame (O(rows)), used as the cache key of caller-supplied frames."""
+    import pandas as pd
+    hashed = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    return (tuple(df.columns), len(df), hashlib.blake2b(hashed.tobytes(), digest_size=16).hexdigest())
+
+
+def load_flow_panel(df, key=None):
+    """Metric tiles and the wallet count for risk_dashboard.run_dashboard."""
+    def build():
+        return {
+            'sustainability': f"{df['sustainability_ratio'].iloc[-1]:.2f}",
+            'runway_days': f"{df['runway_days'].iloc[-1]:.0f} Days",
+            'wallet_rows': len(df),
+        }
+    return _cache.get_or_build(('flow_panel', key or frame_fingerprint(df)), build)
+
+
+# ---------- Bounded chart/table payloads (app2.py, risk_dashboard.py) ----------
+def load_flow_chart(df, max_points=None, key=None):
+    """Inflow/outflow series downsampled for charting, crossovers kept (render_layer)."""
+    from ponzi_detection.render_layer import DEFAULT_MAX_POINTS, downsample_frame
+    max_points = max_points or DEFAULT_MAX_POINTS
+
+    def build():
+        return downsample_frame(df[['timestamp', 'new_deposits', 'yield_disbursed']], 'timestamp',
+                                ['new_deposits', 'yield_disbursed'], max_points=max_points,
+                                crossover=('new_deposits', 'yield_disbursed'))
+    return _cache.get_or_build(('flow_chart', max_points, key or frame_fingerprint(df)), build)
+
+
+def load_wallet_page(df, page=1, page_size=None, key=None):
+    """
+    One page of the wallet concentration table, largest yield share first:
+    (page frame, page count). Sorted server-side with top-k selection.
+    """
+    from ponzi_detection.render_layer import DEFAULT_PAGE_SIZE, top_k_page
+    page_size = page_size or DEFAULT_PAGE_SIZE
+
+    def build():
+        return top_k_page(df[['wallet_address', 'yield_share', 'is_insider']], 'yield_share',
+                          page=page, page_size=page_size)
+    return _cache.get_or_build(('wallet_page', page, page_size, key or frame_fingerprint(df)), build)
@@ -0,0 +1,189 @@
+"""
+Flattened, array-based inference for a trained RandomForestClassifier.
+
+Every tree's nodes are concatenated into flat NumPy arrays (feature,
+threshold, left/right child, per-class leaf probabilities) and trees are
+walked a block at a time, every (row, tree) path of the block together,
+one tree level per step; paths drop out of the working set as soon as
+they reach a leaf. Blocks hold consecutive trees, so each block touches
+one contiguous stretch of the node arrays and its temporaries stay in
+cache. Probabilities match sklearn's
+predict_proba exactly: inputs are cast to float32 like sklearn's, and
+per-tree probabilities are summed tree by tree and divided by the tree
+count, in sklearn's order. NaN features follow each split's learned
+missing-value direction (tree_.missing_go_to_left) and infinite ones are
+rejected, as sklearn does.
+
+    forest = FlatForest.from_sklearn(model)
+    forest.save('outputs/model/forest.npz')
+    FlatForest.load('outputs/model/forest.npz').predict_proba(X)
+"""
+import numpy as np
+
+_ARRAYS = ('feature', 'threshold', 'left', 'right', 'nan_left', 'value', 'roots', 'classes')
+DEFAULT_CHUNK_ROWS = 8192    # Bounds the (rows x trees x classes) leaf buffer
+BLOCK_PATHS = 16384          # (row, tree) paths walked together; whole trees per block
+STEPS_PER_COMPACTION = 8     # Tree levels walked between dropping finished paths
+
+
+class FlatForest:
+    """All trees of a forest as flat node arrays."""
+
+    def __init__(self, feature, threshold, left, right, nan_left, value, roots, classes, max_depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.nan_left = nan_left
+        self.value = value
+        self.roots = roots
+        self.classes = classes
+        self.max_depth = int(max_depth)
+        self._prepare()
+
+    def _prepare(self):
+        """Derived traversal tables (not saved)."""
+        self._is_leaf = self.left == np.arange(len(self.left))
+        self._feature = self.feature.astype(np.intp)
+        # children[2*node + went_right], as one gather (intp: numpy indexes with it natively)
+        self._children = np.stack([self.left, self.right], axis=1).ravel().astype(np.intp)
+        # float32 x <= float64 t  <=>  x <= (largest float32 <= t), so traversal stays in float32
+        threshold32 = self.threshold.astype(np.float32)
+        above = threshold32.astype(np.float64) > self.threshold
+        threshold32[above] = np.nextafter(threshold32[above], np.float32(-np.inf))
+        self._threshold32 = threshold32
+        self._nan_right = ~self.nan_left.astype(bool)
+
+        # Leaf depths, one tree level at a time from the roots
+        depth, frontier, level = np.zeros(len(self.left), dtype=np.int32), self.roots.astype(np.intp), 0
+        while len(frontier):
+            frontier = frontier[~self._is_leaf[frontier]]
+            level += 1
+            frontier = np.concatenate([self.left[frontier], self.right[frontier]]).astype(np.intp)
+            depth[frontier] = level
+        self._mean_path_length = max(1.0, float(depth[self._is_leaf].mean())) if len(depth) else 1.0
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @property
+    def mean_path_length(self):
+        """Mean leaf depth: splits walked per tree, on average, to score one row."""
+        return self._mean_path_length
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Flattens a fitted RandomForestClassifier (or any forest of DecisionTreeClassifiers)."""
+        features, thresholds, lefts, rights, nan_lefts, values, roots = [], [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            local = np.arange(n)
+
+            # Leaves point back at themselves, which is how apply() recognizes them
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, local, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, local, tree.children_right) + offset)
+            # Where NaN goes at each split (older sklearn without missing-value support: always left)
+            missing_left = getattr(tree, 'missing_go_to_left', None)
+            nan_lefts.append(np.ones(n, dtype=bool) if missing_left is None else np.asarray(missing_left, dtype=bool))
+
+            # Per-node class probabilities, normalized the way DecisionTreeClassifier.predict_proba does
+            proba = tree.value[:, 0, :].astype(np.float64)
+            normalizer = proba.sum(axis=1)[:, None]
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(proba / normalizer)
+
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        index_dtype = np.int32 if 2 * offset < 2**31 else np.int64
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(index_dtype),
+            right=np.concatenate(rights).astype(index_dtype),
+            nan_left=np.concatenate(nan_lefts),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=index_dtype),
+            classes=np.asarray(model.classes_),
+            max_depth=max_depth,
+        )
+
+    @staticmethod
+    def _as_input(X):
+        # sklearn compares float32 inputs against float64 thresholds, allows NaN and rejects infinity
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        if np.isinf(X).any():
+            raise ValueError("Input X contains infinity")
+        return X
+
+    def apply(self, X):
+        """Leaf node (flat index) reached in every tree: shape (n_rows, n_trees)."""
+        return self._apply_tree_major(self._as_input(X)).T
+
+    def _apply_tree_major(self, X):
+        """Leaf node per (tree, row) for float32 input: shape (n_trees, n_rows)."""
+        n_rows, n_features = X.shape
+        has_nan = bool(np.isnan(X).any())
+        by_row = np.ascontiguousarray(X).ravel()
+        row_offset = np.arange(n_rows, dtype=np.intp) * n_features
+        leaves = np.empty((self.n_trees, n_rows), dtype=np.intp)
+        trees_per_block = max(1, BLOCK_PATHS // max(n_rows, 1))
+        for first in range(0, self.n_trees, trees_per_block):
+            block = leaves[first:first + trees_per_block].reshape(-1)
+            block[:] = np.repeat(self.roots[first:first + trees_per_block].astype(np.intp), n_rows)
+
+            # Walk the unfinished paths a few levels at a time (leaves loop
+            # onto themselves), then drop the ones that reached a leaf
+            active = np.flatnonzero(~self._is_leaf[block])
+            node = block[active]
+            offset = np.tile(row_offset, len(block) // max(n_rows, 1))[active]
+            depth = 0
+            while len(active):
+                steps = min(STEPS_PER_COMPACTION, self.max_depth - depth)
+                depth += steps
+                for _ in range(steps):
+                    x = by_row[self._feature[node] + offset]
+                    went_right = x > self._threshold32[node]
+                    if has_nan:
+                        went_right |= np.isnan(x) & self._nan_right[node]
+                    node = self._children[2 * node + went_right]
+                done = self._is_leaf[node]
+                if done.all():
+                    block[active] = node
+                    break
+                block[active[done]] = node[done]
+                active, node, offset = active[~done], node[~done], offset[~done]
+        return leaves
+
+    def predict_proba(self, X, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Class probabilities, identical to the source forest's predict_proba."""
+        X = self._as_input(X)
+        out = np.empty((len(X), len(self.classes)))
+        for start in range(0, len(X), chunk_rows):
+            leaf_values = self.value[self._apply_tree_major(X[start:start + chunk_rows])]  # (trees, rows, classes)
+            # cumsum adds trees one after another, as sklearn accumulates them
+            out[start:start + chunk_rows] = np.cumsum(leaf_values, axis=0)[-1] / self.n_trees
+        return out
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            np.savez(f, max_depth=self.max_depth, **{name: getattr(self, name) for name in _ARRAYS})
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(max_depth=data['max_depth'], **{name: data[name] for name in _ARRAYS})
@@ -0,0 +1,361 @@
+"""
+Logic Auditor (Referral Signs): who pays whom, as a sparse wallet-flow graph.
+
+Transfers from a raw transaction log (ingestion_engine.TX_COLUMNS) fold into
+three edge sets, each aggregated per (sender, receiver) with total value,
+transfer count and first timestamp:
+
+    deposit    wallet -> contract   (to_address is the contract)
+    payout     contract -> wallet   (from_address is the contract)
+    transfer   wallet -> wallet     (neither side is the row's contract)
+
+Deposits and payouts become CSR contract x wallet matrices and transfers a
+CSR wallet x wallet adjacency, so every signal is a handful of sparse
+products, gathers and segment reductions, with no per-wallet Python loops:
+
+    graph = WalletFlowGraph()
+    for chunk in read_transactions('transactions.csv'):
+        graph.update(chunk)
+    graph.features()               # GRAPH_FEATURES per contract
+    graph.insider_candidates()     # per-contract wallets for analyze_wallet_concentration(
+                                   #     df, candidates, contract_address=...)
+
+Feature columns:
+    Fan_In                    distinct depositing wallets
+    Fan_Out                   distinct paid wallets
+    Referral_Depth            longest recruitment chain among depositors: v was
+                              recruited by u if u funded v before v's first
+                              deposit and u had already joined the contract
+    Newer_Funded_Share        share of payouts that exceed the payee's own
+                              deposits and are covered by later joiners' deposits
+    Component_Count           wallet-graph components the depositors fall into
+    Largest_Component_Share   depositors in the biggest component / Fan_In
+    Component_Growth          late / early joins into the biggest component
+                              (split at the midpoint of the contract's joins)
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from ponzi_detection.ingestion_engine import _to_seconds, read_transactions
+from ponzi_detection.instrumentation import instrumented
+
+GRAPH_FEATURES = ['Fan_In', 'Fan_Out', 'Referral_Depth', 'Newer_Funded_Share', 'Component_Count',
+                  'Largest_Component_Share', 'Component_Growth']
+
+TRANSFER, DEPOSIT, PAYOUT = 0, 1, 2
+_EDGE_FIELDS = ('kind', 'src', 'dst', 'value', 'count', 'first_ts')
+MAX_PENDING_PARTS = 16  # Chunk edge sets merged into one once this many pile up
+
+# Insider candidates: payees taking at least this share of a contract's
+# payouts who never deposited, recruited depositors, or were mostly paid
+# out of newer joiners' money
+INSIDER_PAYOUT_SHARE = 0.05
+INSIDER_NEWER_FUNDED = 0.5
+
+
+def _aggregate_edges(edges):
+    """Collapses repeated (kind, src, dst) edges: sums value/count, keeps the first timestamp."""
+    order = np.lexsort((edges['dst'], edges['src'], edges['kind']))
+    kind, src, dst = edges['kind'][order], edges['src'][order], edges['dst'][order]
+    if len(order) == 0:
+        return {name: edges[name][order] for name in _EDGE_FIELDS}
+    starts = np.flatnonzero(np.r_[True, (kind[1:] != kind[:-1]) | (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])])
+    return {
+        'kind': kind[starts],
+        'src': src[starts],
+        'dst': dst[starts],
+        'value': np.add.reduceat(edges['value'][order], starts),
+        'count': np.add.reduceat(edges['count'][order], starts),
+        'first_ts': np.minimum.reduceat(edges['first_ts'][order], starts),
+    }
+
+
+def _concat_edges(parts):
+    return {name: np.concatenate([part[name] for part in parts]) for name in _EDGE_FIELDS}
+
+
+def _csr_pairs(rows, cols, shape):
+    """
+    CSR pattern of unique (row, col) pairs plus the permutation into CSR
+    order, so per-pair data arrays can be aligned with it.
+    """
+    order = np.lexsort((cols, rows))
+    indptr = np.r_[0, np.cumsum(np.bincount(rows, minlength=shape[0]))]
+    matrix = sparse.csr_matrix((np.ones(len(order)), cols[order], indptr), shape=shape)
+    return matrix, order
+
+
+def _pair_keys(matrix):
+    """Sorted row * n_cols + col keys of a canonical CSR matrix, one per stored entry."""
+    rows = np.repeat(np.arange(matrix.shape[0], dtype=np.int64), np.diff(matrix.indptr))
+    return rows * matrix.shape[1] + matrix.indices
+
+
+def _lookup(keys, rows, cols, n_cols):
+    """Positions of (row, col) pairs in `keys` (-1 where the pair is absent)."""
+    wanted = rows.astype(np.int64) * n_cols + cols
+    pos = np.searchsorted(keys, wanted)
+    pos[pos == len(keys)] = 0
+    return np.where(keys[pos] == wanted, pos, -1) if len(keys) else np.full(len(wanted), -1)
+
+
+def _gather(values, pos, default=0):
+    """values[pos], with `default` where pos is -1."""
+    found = pos >= 0
+    out = np.full(len(pos), default, dtype=values.dtype)
+    out[found] = values[pos[found]]
+    return out
+
+
+def _segment_reduce(ufunc, values, indptr, empty):
+    """ufunc.reduceat over CSR rows, with `empty` for rows without entries."""
+    out = np.full(len(indptr) - 1, empty, dtype=float)
+    nonempty = np.flatnonzero(np.diff(indptr))
+    if len(nonempty):
+        out[nonempty] = ufunc.reduceat(values, indptr[nonempty])
+    return out
+
+
+def _tree_depths(parent):
+    """Depth of every node in a forest given as a parent array (roots point at themselves)."""
+    ancestor = parent.copy()
+    depth = (parent != np.arange(len(parent))).astype(np.int64)
+    # Pointer jumping: each pass doubles the distance covered, so O(log depth) passes
+    while True:
+        jumped = ancestor[ancestor]
+        if np.array_equal(jumped, ancestor):
+            return depth
+        depth = depth + depth[ancestor]
+        ancestor = jumped
+
+
+class WalletFlowGraph:
+    """
+    Accumulates transaction chunks into aggregated edges. Memory grows with
+    distinct (sender, receiver) pairs and addresses, not with transactions.
+    """
+
+    def __init__(self):
+        self._index = {}
+        self._addresses = []
+        self._contracts = set()
+        self._parts = []
+        self._analysis = None
+
+    def __len__(self):
+        return len(self._addresses)
+
+    def _codes(self, addresses):
+        """Maps addresses to integer node ids, registering new ones."""
+        codes, uniques = pd.factorize(addresses)
+        ids = np.empty(len(uniques), dtype=np.int64)
+        for i, address in enumerate(uniques):
+            node = self._index.get(address)
+            if node is None:
+                node = len(self._addresses)
+                self._index[address] = node
+                self._addresses.append(address)
+            ids[i] = node
+        return ids[codes]
+
+    def update(self, chunk):
+        """Folds one transaction chunk into the edge sets."""
+        if chunk.empty:
+            return self
+        n = len(chunk)
+        contract = chunk['contract_address'].str.lower().to_numpy()
+        nodes = self._codes(np.concatenate([contract, chunk['from_address'].str.lower().to_numpy(),
+                                            chunk['to_address'].str.lower().to_numpy()]))
+        contract_node, src, dst = nodes[:n], nodes[n:2 * n], nodes[2 * n:]
+        self._contracts.update(np.unique(contract_node).tolist())
+
+        kind = np.full(n, TRANSFER, dtype=np.int8)
+        kind[dst == contract_node] = DEPOSIT
+        kind[src == contract_node] = PAYOUT
+        self._parts.append(_aggregate_edges({
+            'kind': kind, 'src': src, 'dst': dst,
+            'value': chunk['value'].to_numpy(dtype=float),
+            'count': np.ones(n, dtype=np.int64),
+            'first_ts': _to_seconds(chunk['timestamp']),
+        }))
+        if len(self._parts) >= MAX_PENDING_PARTS:
+            self._parts = [_aggregate_edges(_concat_edges(self._parts))]
+        self._analysis = None
+        return self
+
+    def edges(self):
+        """All aggregated edges as a DataFrame (kind 0 transfer, 1 deposit, 2 payout)."""
+        if len(self._parts) > 1:
+            self._parts = [_aggregate_edges(_concat_edges(self._parts))]
+        if not self._parts:
+            empty = np.array([], dtype=np.int64)
+            return pd.DataFrame({name: empty for name in _EDGE_FIELDS})
+        return pd.DataFrame(self._parts[0])
+
+    @instrumented
+    def _analyze(self):
+        """Builds the sparse matrices and every per-pair quantity, cached until the next update."""
+        if self._analysis is not None:
+            return self._analysis
+        edges = {name: column.to_numpy() for name, column in self.edges().items()}
+        n_nodes = len(self._addresses)
+        contract_nodes = np.array(sorted(self._contracts), dtype=np.int64)
+        contract_row = np.full(n_nodes, -1, dtype=np.int64)
+        contract_row[contract_nodes] = np.arange(len(contract_nodes))
+        shape = (len(contract_nodes), n_nodes)
+
+        # 1. Contract x wallet deposit and payout matrices (one entry per pair)
+        is_dep = edges['kind'] == DEPOSIT
+        deposits, order = _csr_pairs(contract_row[edges['dst'][is_dep]], edges['src'][is_dep], shape)
+        dep_value = edges['value'][is_dep][order]
+        join_ts = edges['first_ts'][is_dep][order]
+        dep_keys = _pair_keys(deposits)
+        dep_row = dep_keys // n_nodes
+
+        is_pay = edges['kind'] == PAYOUT
+        payouts, order = _csr_pairs(contract_row[edges['src'][is_pay]], edges['dst'][is_pay], shape)
+        pay_value = edges['value'][is_pay][order]
+        pay_row = _pair_keys(payouts) // n_nodes
+
+        # 2. Wallet x wallet transfer adjacency
+        is_tx = (edges['kind'] == TRANSFER) & (edges['src'] != edges['dst'])
+        tx_src, tx_dst, tx_ts = edges['src'][is_tx], edges['dst'][is_tx], edges['first_ts'][is_tx]
+        transfers = sparse.csr_matrix((np.ones(len(tx_src)), (tx_src, tx_dst)), shape=(n_nodes, n_nodes))
+
+        # 3. Recruitment forest over (contract, depositor) pairs. For every
+        # transfer u -> v, the contracts both joined come from one sparse
+        # element-wise product of their rows in the wallet x contract pattern
+        by_wallet = deposits.T.tocsr()
+        shared = by_wallet[tx_src].multiply(by_wallet[tx_dst]).tocoo()
+        edge, row = shared.row, shared.col
+        recruiter = _lookup(dep_keys, row, tx_src[edge], n_nodes)
+        recruit = _lookup(dep_keys, row, tx_dst[edge], n_nodes)
+        valid = (join_ts[recruiter] < join_ts[recruit]) & (tx_ts[edge] <= join_ts[recruit])
+        recruiter, recruit, funded_at = recruiter[valid], recruit[valid], tx_ts[edge][valid]
+        # Earliest funding transfer wins (ties: lowest recruiter pair)
+        order = np.lexsort((recruiter, funded_at, recruit))
+        first = np.r_[True, recruit[order][1:] != recruit[order][:-1]] if len(order) else np.array([], dtype=bool)
+        parent = np.arange(len(dep_keys))
+        parent[recruit[order][first]] = recruiter[order][first]
+        depth = _tree_depths(parent)
+        has_parent = parent != np.arange(len(parent))
+        recruits = np.bincount(parent[has_parent], minlength=len(parent))
+
+        # 4. Deposits by strictly later joiners of the same contract, per depositor
+        order = np.lexsort((join_ts, dep_row))
+        row_s, join_s = dep_row[order], join_ts[order]
+        cumulative = np.cumsum(dep_value[order])
+        newer_deposits = np.zeros(len(order))
+        if len(order):
+            # Suffix sums: everything after the last tied joiner, up to the end of the contract's row
+            group_end = np.r_[(row_s[1:] != row_s[:-1]) | (join_s[1:] != join_s[:-1]), True]
+            row_end = np.r_[row_s[1:] != row_s[:-1], True]
+            last_in_group = np.flatnonzero(group_end)[np.cumsum(np.r_[0, group_end[:-1]])]
+            last_in_row = np.flatnonzero(row_end)[np.cumsum(np.r_[0, row_end[:-1]])]
+            newer_deposits[order] = cumulative[last_in_row] - cumulative[last_in_group]
+
+        # 5. Payout beyond the payee's own deposit that later joiners' money covers
+        pay_pair = _lookup(dep_keys, pay_row, payouts.indices, n_nodes)
+        own_deposit = _gather(dep_value, pay_pair, 0.0)
+        newer_funded = np.minimum(np.maximum(pay_value - own_deposit, 0.0), _gather(newer_deposits, pay_pair, 0.0))
+
+        # 6. Wallet-graph components among each contract's depositors
+        n_components, labels = connected_components(transfers, directed=True, connection='weak')
+        comp_keys, comp_inverse, comp_sizes = np.unique(dep_row * n_components + labels[deposits.indices],
+                                                        return_inverse=True, return_counts=True)
+        comp_row = comp_keys // n_components
+
+        self._analysis = {
+            'contract_nodes': contract_nodes, 'n_nodes': n_nodes,
+            'deposits': deposits, 'payouts': payouts,
+            'dep_row': dep_row, 'join_ts': join_ts, 'depth': depth, 'recruits': recruits,
+            'pay_row': pay_row, 'pay_value': pay_value, 'pay_pair': pay_pair,
+            'own_deposit': own_deposit, 'newer_funded': newer_funded,
+            'comp_row': comp_row, 'comp_inverse': comp_inverse.ravel(), 'comp_sizes': comp_sizes,
+        }
+        return self._analysis
+
+    def features(self):
+        """Per-contract graph features (GRAPH_FEATURES), indexed by contract address."""
+        a = self._analyze()
+        n_contracts = len(a['contract_nodes'])
+        dep_indptr, pay_indptr = a['deposits'].indptr, a['payouts'].indptr
+        fan_in = np.diff(dep_indptr).astype(float)
+
+        depth = _segment_reduce(np.maximum, a['depth'].astype(float), dep_indptr, 0.0)
+        total_paid = _segment_reduce(np.add, a['pay_value'], pay_indptr, 0.0)
+        newer_paid = _segment_reduce(np.add, a['newer_funded'], pay_indptr, 0.0)
+        newer_share = np.divide(newer_paid, total_paid, out=np.zeros(n_contracts), where=total_paid > 0)
+
+        comp_row, comp_sizes = a['comp_row'], a['comp_sizes']
+        component_count = np.bincount(comp_row, minlength=n_contracts).astype(float)
+        largest = np.zeros(n_contracts)
+        np.maximum.at(largest, comp_row, comp_sizes)
+        largest_share = np.divide(largest, fan_in, out=np.zeros(n_contracts), where=fan_in > 0)
+
+        # Biggest component per contract (ties: lowest label), then its early vs late joins
+        order = np.lexsort((-comp_sizes, comp_row))
+        is_first = np.r_[True, comp_row[order][1:] != comp_row[order][:-1]] if len(order) else np.array([], bool)
+        biggest = np.zeros(len(comp_sizes), dtype=bool)
+        biggest[order[is_first]] = True
+        join_ts = a['join_ts']
+        midpoint = (_segment_reduce(np.minimum, join_ts, dep_indptr, np.nan)
+                    + _segment_reduce(np.maximum, join_ts, dep_indptr, np.nan)) / 2
+        in_biggest = biggest[a['comp_inverse']]
+        late = join_ts > midpoint[a['dep_row']]
+        early_joins = np.bincount(a['dep_row'][in_biggest & ~late], minlength=n_contracts)
+        late_joins = np.bincount(a['dep_row'][in_biggest & late], minlength=n_contracts)
+        growth = late_joins / np.maximum(early_joins, 1)
+
+        features = pd.DataFrame({
+            'Fan_In': fan_in,
+            'Fan_Out': np.diff(pay_indptr).astype(float),
+            'Referral_Depth': depth,
+            'Newer_Funded_Share': newer_share,
+            'Component_Count': component_count,
+            'Largest_Component_Share': largest_share,
+            'Component_Growth': growth,
+        }, index=pd.Index([self._addresses[node] for node in a['contract_nodes'].tolist()], name='contract_address'))
+        return features[GRAPH_FEATURES]
+
+    def insider_candidates(self, payout_share=INSIDER_PAYOUT_SHARE, newer_funded=INSIDER_NEWER_FUNDED):
+        """
+        Payees taking at least `payout_share` of a contract's payouts who never
+        deposited, recruited other depositors, or had at least `newer_funded`
+        of their payouts covered by later joiners. Largest share first per contract.
+        """
+        a = self._analyze()
+        pay_row, pay_value, pay_pair = a['pay_row'], a['pay_value'], a['pay_pair']
+        total_paid = np.bincount(pay_row, weights=pay_value, minlength=len(a['contract_nodes']))[pay_row]
+        share = np.divide(pay_value, total_paid, out=np.zeros(len(pay_value)), where=total_paid > 0)
+        recruits = _gather(a['recruits'], pay_pair, 0)
+
+        no_deposit = pay_pair < 0
+        recruiter = recruits > 0
+        mostly_newer = a['newer_funded'] >= newer_funded * pay_value
+        flagged = (share >= payout_share) & (no_deposit | recruiter | mostly_newer)
+        reason = np.where(no_deposit, 'no_deposit', np.where(recruiter, 'recruiter', 'newer_funded'))
+
+        addresses = np.asarray(self._addresses, dtype=object)
+        candidates = pd.DataFrame({
+            'contract_address': addresses[a['contract_nodes'][pay_row[flagged]]],
+            'wallet_address': addresses[a['payouts'].indices[flagged]],
+            'payout': pay_value[flagged],
+            'deposit': a['own_deposit'][flagged],
+            'payout_share': share[flagged],
+            'recruits': recruits[flagged],
+            'newer_funded': a['newer_funded'][flagged],
+            'reason': reason[flagged],
+        })
+        return candidates.sort_values(['contract_address', 'payout_share'], ascending=[True, False],
+                                      kind='stable').reset_index(drop=True)
+
+
+def build_wallet_graph(path, chunksize=1_000_000):
+    """Streams a transaction log file into a WalletFlowGraph."""
+    graph = WalletFlowGraph()
+    for chunk in read_transactions(path, chunksize=chunksize):
+        graph.update(chunk)
+    return graph
@@ -0,0 +1,114 @@
+"""
+Import-time report for the CLI subcommands, suitable as a CI check.
+
+    python -m ponzi_detection.importtime                          # score, export-blocklist
+    python -m ponzi_detection.importtime score train --out outputs/importtime.json
+
+Every subcommand's handler module (cli.COMMANDS) is imported in a fresh
+interpreter under `python -X importtime`. The report shows the total import
+time, the slowest top-level imports and any heavy dependency that got
+pulled in. The exit status is 1 if a fast-path command goes over
+--budget-ms or imports a heavy dependency.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+FAST_COMMANDS = ('score', 'export-blocklist')
+HEAVY_MODULES = ('pandas', 'sklearn', 'scipy', 'imblearn', 'matplotlib', 'seaborn', 'joblib', 'plotly',
+                 'streamlit')
+DEFAULT_BUDGET_MS = 500
+TOP_IMPORTS = 8
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr):
+    """[(module, depth, self_us, cumulative_us)] from `python -X importtime` output."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Column header
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        records.append((name.strip(), depth, int(fields[0]), int(fields[1])))
+    return records
+
+
+def measure_command(command):
+    """Import profile of one subcommand, measured in a fresh interpreter."""
+    code = f"from ponzi_detection import cli; cli.load_command({command!r})"
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=REPO_ROOT,
+                          capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing '{command}' failed:\n{proc.stderr[-2000:]}")
+
+    records = parse_importtime(proc.stderr)
+    top_level = [r for r in records if r[1] == 0]
+    loaded = {name.split('.')[0] for name, _, _, _ in records}
+    return {
+        'command': command,
+        'import_ms': sum(r[3] for r in top_level) / 1000,
+        'wall_ms': wall_ms,
+        'modules': len(records),
+        'heavy_imports': sorted(loaded.intersection(HEAVY_MODULES)),
+        'slowest': [{'module': name, 'cumulative_ms': cumulative / 1000}
+                    for name, _, _, cumulative in sorted(top_level, key=lambda r: -r[3])[:TOP_IMPORTS]],
+    }
+
+
+def check(results, budget_ms=DEFAULT_BUDGET_MS):
+    """Failure messages for fast-path commands over budget or loading heavy modules."""
+    failures = []
+    for result in results:
+        if result['command'] not in FAST_COMMANDS:
+            continue
+        if result['import_ms'] > budget_ms:
+            failures.append(f"{result['command']}: imports take {result['import_ms']:.0f} ms (budget {budget_ms} ms)")
+        if result['heavy_imports']:
+            failures.append(f"{result['command']}: imports heavy dependencies {result['heavy_imports']}")
+    return failures
+
+
+def main(argv=None):
+    from ponzi_detection.cli import COMMANDS
+
+    parser = argparse.ArgumentParser(description="Import-time report for the ponzi CLI subcommands.")
+    parser.add_argument('commands', nargs='*', default=list(FAST_COMMANDS),
+                        help=f"Subcommands to profile (default: {', '.join(FAST_COMMANDS)})")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help="Maximum import time for the fast-path commands")
+    parser.add_argument('--out', default=None, help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+    unknown = [command for command in args.commands if command not in COMMANDS]
+    if unknown:
+        parser.error(f"unknown subcommands {unknown}; choose from {list(COMMANDS)}")
+
+    results = [measure_command(command) for command in args.commands]
+    print("--- Import-time report ---")
+    for result in results:
+        print(f"  {result['command']:<18}{result['import_ms']:>9.1f} ms imports"
+              f"{result['wall_ms']:>9.1f} ms process  {result['modules']:>5} modules")
+        for entry in result['slowest']:
+            print(f"      {entry['module']:<32}{entry['cumulative_ms']:>9.1f} ms")
+
+    failures = check(results, args.budget_ms)
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump({'budget_ms': args.budget_ms, 'results': results, 'failures': failures}, f, indent=2)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
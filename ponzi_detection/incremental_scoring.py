@@ -0,0 +1,207 @@
+"""
+Incremental rescoring with a feature-fingerprint score cache.
+
+Most contracts' features do not change between scoring cycles, so every
+row gets a 64-bit fingerprint of its feature values (SplitMix64 over the
+float32 bit patterns, the precision the forests actually compare at)
+seeded with the model version and tier thresholds.
+The on-disk cache maps contract key -> (fingerprint, probability,
+Risk_Tier); only rows whose fingerprint is new or changed go through
+predict_proba. A new model version changes every fingerprint, so a
+retrained model never reuses old scores.
+
+Each run also reports what changed: contracts that entered or left the
+CRITICAL tier, tier changes of contracts scored before (new contracts are
+only counted), and the cache hit rate.
+
+    result = score_incremental(index, X, artifact.predict_proba, artifact.model_version,
+                               artifact.thresholds, cache_path='outputs/cache/scores.npz')
+    result['stats']      # {'rows': ..., 'hits': ..., 'hit_rate': ...}
+    result['added'], result['removed']
+"""
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from ponzi_detection.blocklist_store import KEY_DTYPE, address_keys, splitmix64
+
+DEFAULT_CACHE_PATH = os.path.join('outputs', 'cache', 'scores.npz')
+BLOCK_TIER = 'CRITICAL'
+# Tiers are cached as int8 codes into this table (-1 = no previous tier)
+TIER_NAMES = np.array(['LOW', 'HIGH', 'CRITICAL'], dtype=object)
+_TIER_CODES = {name: code for code, name in enumerate(TIER_NAMES)}
+_CACHE_ARRAYS = ('keys', 'fingerprints', 'probabilities', 'tiers')
+# Bumped when the cache layout, key or fingerprint scheme changes; older caches start cold
+CACHE_FORMAT = 3
+
+
+def fingerprint_seed(model_version, thresholds):
+    """64-bit seed tying fingerprints to one model version and tier thresholds."""
+    text = f"{model_version}|{json.dumps(thresholds, sort_keys=True)}"
+    return np.frombuffer(hashlib.blake2b(text.encode(), digest_size=8).digest(), dtype='<u8')[0]
+
+
+def feature_fingerprints(X, seed=0):
+    """
+    One uint64 per row, chaining SplitMix64 over each feature's float32 bits.
+    Both forests cast inputs to float32, so equal fingerprints mean equal
+    model inputs, and float64 parsing noise (pandas vs numpy CSV readers)
+    below float32 resolution does not cause misses.
+    """
+    X = np.array(X, dtype=np.float32, ndmin=2)
+    # Canonical bits: -0.0 equals 0.0 and every NaN payload is the same NaN
+    X = np.where(np.isnan(X), np.float32(np.nan), X + np.float32(0.0))
+    bits = np.ascontiguousarray(X).view(np.uint32).astype(np.uint64)
+    fingerprint = splitmix64(np.full(len(X), seed, dtype=np.uint64))
+    for j in range(bits.shape[1]):
+        fingerprint = splitmix64(fingerprint ^ bits[:, j])
+    return fingerprint
+
+
+def _empty_cache():
+    return {'keys': np.array([], dtype=KEY_DTYPE), 'fingerprints': np.array([], dtype=np.uint64),
+            'probabilities': np.array([], dtype=np.float64), 'tiers': np.array([], dtype=np.int8)}
+
+
+def load_score_cache(path=DEFAULT_CACHE_PATH):
+    """Cache arrays sorted by contract key (empty if there is no cache yet or it has another format)."""
+    if not os.path.exists(path):
+        return _empty_cache()
+    with np.load(path, allow_pickle=False) as data:
+        if 'format' not in data.files or int(data['format']) != CACHE_FORMAT:
+            return _empty_cache()
+        return {name: data[name] for name in _CACHE_ARRAYS}
+
+
+def save_score_cache(cache, path=DEFAULT_CACHE_PATH):
+    """Writes the cache atomically (tmp file + rename)."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        np.savez(f, format=np.int64(CACHE_FORMAT), **{name: cache[name] for name in _CACHE_ARRAYS})
+    os.replace(tmp, path)
+    return path
+
+
+def _lookup(cache_keys, keys):
+    """Cache positions of `keys` (-1 where absent)."""
+    if not len(cache_keys):
+        return np.full(len(keys), -1)
+    pos = np.minimum(np.searchsorted(cache_keys, keys), len(cache_keys) - 1)
+    return np.where(cache_keys[pos] == keys, pos, -1)
+
+
+def score_incremental(index, X, predict_proba, model_version, thresholds, cache_path=DEFAULT_CACHE_PATH,
+                      save=True):
+    """
+    Scores rows (contract ids in `index`, features in X) reusing cached
+    results for unchanged rows. Returns a dict with:
+        probabilities     positive-class probability per row, identical to a full rescore
+        scores, tiers     Risk_Score (0-100) and Risk_Tier per row, likewise
+        added, removed    contracts entering / leaving the CRITICAL tier
+        tier_changes      [(contract, old tier, new tier)] for previously cached contracts
+        stats             rows, hits, misses, hit_rate, new, changed, timings
+    """
+    from ponzi_detection.model_store import assign_risk_tier
+
+    start = time.perf_counter()
+    index = index.tolist() if hasattr(index, 'tolist') else list(index)
+    X = np.array(X, dtype=np.float64, ndmin=2)
+    if len(set(index)) != len(index):
+        raise ValueError("Contract ids must be unique for incremental scoring")
+    keys = address_keys(index)
+    fingerprints = feature_fingerprints(X, fingerprint_seed(model_version, thresholds))
+
+    # 1. Cache hits: same contract, same fingerprint
+    cache = load_score_cache(cache_path)
+    pos = _lookup(cache['keys'], keys)
+    known = pos >= 0
+    hit = known & (cache['fingerprints'][np.maximum(pos, 0)] == fingerprints) if len(cache['keys']) else known
+    probabilities = np.empty(len(keys))
+    tiers = np.empty(len(keys), dtype=np.int8)
+    probabilities[hit] = cache['probabilities'][pos[hit]]
+    tiers[hit] = cache['tiers'][pos[hit]]
+    lookup_s = time.perf_counter() - start
+
+    # 2. Only new or changed rows go through the model
+    miss = np.flatnonzero(~hit)
+    if len(miss):
+        probabilities[miss] = predict_proba(X[miss])[:, 1]
+        missed_scores = np.round(probabilities[miss] * 100, 2)
+        tiers[miss] = [_TIER_CODES[tier] for tier in assign_risk_tier(missed_scores, thresholds)]
+    predict_s = time.perf_counter() - start - lookup_s
+
+    # 3. Tier changes against the previously cached tier of each contract
+    previous = np.full(len(keys), -1, dtype=np.int8)
+    previous[known] = cache['tiers'][pos[known]]
+    changed = np.flatnonzero(known & (previous != tiers))
+    block = _TIER_CODES[BLOCK_TIER]
+    was_blocked, is_blocked = previous == block, tiers == block
+    added = [index[i] for i in np.flatnonzero(is_blocked & ~was_blocked)]
+    removed = [index[i] for i in np.flatnonzero(was_blocked & ~is_blocked)]
+
+    # 4. Merge: this batch's entries replace their old ones, other contracts are kept
+    if save:
+        keep = np.ones(len(cache['keys']), dtype=bool)
+        keep[pos[known]] = False
+        merged = {
+            'keys': np.concatenate([cache['keys'][keep], keys]),
+            'fingerprints': np.concatenate([cache['fingerprints'][keep], fingerprints]),
+            'probabilities': np.concatenate([cache['probabilities'][keep], probabilities]),
+            'tiers': np.concatenate([cache['tiers'][keep], tiers]),
+        }
+        order = np.argsort(merged['keys'], kind='stable')
+        save_score_cache({name: values[order] for name, values in merged.items()}, cache_path)
+
+    n_hits = int(hit.sum())
+    names = TIER_NAMES[tiers]
+    return {
+        'probabilities': probabilities,
+        'scores': np.round(probabilities * 100, 2),
+        'tiers': names,
+        'added': added,
+        'removed': removed,
+        'tier_changes': [(index[i], TIER_NAMES[previous[i]], names[i]) for i in changed.tolist()],
+        'stats': {
+            'rows': len(keys),
+            'hits': n_hits,
+            'misses': len(miss),
+            'hit_rate': round(n_hits / len(keys), 4) if len(keys) else 0.0,
+            'new': int((~known).sum()),
+            'changed': int((known & ~hit).sum()),
+            'cached_contracts': len(cache['keys']),
+            'lookup_ms': round(lookup_s * 1000, 2),
+            'predict_ms': round(predict_s * 1000, 2),
+            'total_ms': round((time.perf_counter() - start) * 1000, 2),
+        },
+    }
+
+
+def score_features_incremental(features_df, artifact, cache_path=DEFAULT_CACHE_PATH, save=True):
+    """
+    score_features() with the cache: returns (results frame with Risk_Score
+    and Risk_Tier on the input index, the score_incremental() result).
+    """
+    import pandas as pd
+
+    X = features_df[artifact.features].to_numpy(dtype=float)
+    result = score_incremental(features_df.index, X, artifact.predict_proba, artifact.model_version,
+                               artifact.thresholds, cache_path, save)
+    results = pd.DataFrame({'Risk_Score': result['scores'], 'Risk_Tier': result['tiers']},
+                           index=features_df.index)
+    return results, result
+
+
+def delta_report(result):
+    """JSON-ready summary of one incremental run (CRITICAL delta, tier changes, hit rate)."""
+    def plain(value):
+        return value.item() if isinstance(value, np.generic) else value
+    return {
+        'stats': result['stats'],
+        'critical_added': [plain(c) for c in result['added']],
+        'critical_removed': [plain(c) for c in result['removed']],
+        'tier_changes': [{'contract': plain(c), 'from': old, 'to': new} for c, old, new in result['tier_changes']],
+    }
@@ -0,0 +1,217 @@
+import os
+import numpy as np
+import pandas as pd
+
+from ponzi_detection.engine import FEATURES
+
+# Expected raw transaction log schema (one row per transfer)
+TX_COLUMNS = ['contract_address', 'from_address', 'to_address', 'value', 'timestamp']
+
+SECONDS_PER_DAY = 86400.0
+
+
+def read_transactions(path, chunksize=1_000_000, columns=TX_COLUMNS):
+    """
+    Part 1: Data Ingestion (Layer A)
+    Yields bounded DataFrame chunks from a CSV or Parquet transaction log,
+    so gigabyte files never have to fit in memory at once.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.parquet', '.pq'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Reading Parquet logs requires 'pyarrow' (pip install pyarrow)") from exc
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=columns)
+
+
+def _to_seconds(timestamps):
+    """Unix seconds as float64 from numeric or datetime-like columns."""
+    if pd.api.types.is_numeric_dtype(timestamps):
+        return timestamps.to_numpy(dtype=float)
+    parsed = pd.to_datetime(timestamps, utc=True)
+    return (parsed - pd.Timestamp(0, tz='UTC')).dt.total_seconds().to_numpy()
+
+
+class TransactionAggregator:
+    """
+    Folds transaction chunks into per-contract aggregates. Memory grows with
+    the number of contracts (a few scalars each) and of distinct (contract,
+    payee) pairs (one running payout total each), never with the number of
+    transactions.
+
+    A transfer is a deposit when `to_address` is the contract and a payout
+    when `from_address` is the contract. Rows without a contract address
+    are dropped; payouts without a payee count towards outflow only.
+    """
+
+    _SCALARS = ('inflow', 'outflow', 'tx_count', 'deposit_count', 'deposit_ts_sum')
+
+    def __init__(self, capacity=1024):
+        self._index = {}
+        self._contracts = []
+        self._capacity = 0
+        self._arrays = {}
+        self._grow(capacity)
+        self._pair_index = {}
+        self._pair_row = np.empty(capacity, dtype=np.int64)
+        self._pair_total = np.zeros(capacity)
+        self._n_pairs = 0
+
+    def __len__(self):
+        return len(self._contracts)
+
+    def _grow(self, capacity):
+        old = self._capacity
+        if capacity <= old:
+            return
+        fills = {name: 0.0 for name in self._SCALARS}
+        fills.update(first_ts=np.inf, last_ts=-np.inf)
+        for name, fill in fills.items():
+            arr = np.full(capacity, fill)
+            if old:
+                arr[:old] = self._arrays[name]
+            self._arrays[name] = arr
+        self._capacity = capacity
+
+    def _rows_for(self, contracts):
+        """Maps contract addresses to aggregate rows, registering new ones."""
+        codes, uniques = pd.factorize(contracts)
+        rows = np.empty(len(uniques), dtype=np.int64)
+        for i, contract in enumerate(uniques):
+            row = self._index.get(contract)
+            if row is None:
+                row = len(self._contracts)
+                self._index[contract] = row
+                self._contracts.append(contract)
+            rows[i] = row
+        if len(self._contracts) > self._capacity:
+            self._grow(max(len(self._contracts), 2 * self._capacity))
+        return rows[codes]
+
+    def _pairs_for(self, rows, payees):
+        """Maps (contract row, payee) pairs to payout-total slots, registering new ones."""
+        codes, uniques = pd.factorize(pd.MultiIndex.from_arrays([rows, payees]))
+        slots = np.empty(len(uniques), dtype=np.int64)
+        for i, pair in enumerate(uniques):
+            slot = self._pair_index.get(pair)
+            if slot is None:
+                slot = self._n_pairs
+                if slot == len(self._pair_total):
+                    self._pair_row = np.resize(self._pair_row, 2 * slot)
+                    self._pair_total = np.concatenate([self._pair_total, np.zeros(slot)])
+                self._pair_index[pair] = slot
+                self._pair_row[slot] = pair[0]
+                self._n_pairs += 1
+            slots[i] = slot
+        return slots[codes]
+
+    def update(self, chunk):
+        """Folds one transaction chunk into the running aggregates."""
+        chunk = chunk[chunk['contract_address'].notna()]
+        if chunk.empty:
+            return self
+        contract = chunk['contract_address'].str.lower()
+        rows = self._rows_for(contract.to_numpy())
+        value = chunk['value'].to_numpy(dtype=float)
+        ts = _to_seconds(chunk['timestamp'])
+        is_deposit = (chunk['to_address'].str.lower() == contract).to_numpy()
+        is_payout = (chunk['from_address'].str.lower() == contract).to_numpy()
+
+        a = self._arrays
+        np.add.at(a['tx_count'], rows, 1)
+        np.minimum.at(a['first_ts'], rows, ts)
+        np.maximum.at(a['last_ts'], rows, ts)
+
+        dep_rows = rows[is_deposit]
+        np.add.at(a['inflow'], dep_rows, value[is_deposit])
+        np.add.at(a['deposit_count'], dep_rows, 1)
+        np.add.at(a['deposit_ts_sum'], dep_rows, ts[is_deposit])
+
+        pay_rows = rows[is_payout]
+        pay_value = value[is_payout]
+        np.add.at(a['outflow'], pay_rows, pay_value)
+
+        payees = chunk['to_address'].str.lower().to_numpy()[is_payout]
+        has_payee = pd.notna(payees)
+        if has_payee.any():
+            slots = self._pairs_for(pay_rows[has_payee], payees[has_payee])
+            np.add.at(self._pair_total, slots, pay_value[has_payee])
+        return self
+
+    def to_aggregates(self):
+        """Raw per-contract aggregates, indexed by contract address."""
+        n = len(self._contracts)
+        data = {name: self._arrays[name][:n] for name in self._SCALARS + ('first_ts', 'last_ts')}
+        return pd.DataFrame(data, index=pd.Index(self._contracts, name='contract_address'))
+
+    def to_features(self):
+        """
+        Per-contract model inputs, columns in engine.FEATURES order:
+            Gini_Index:     inequality of the per-wallet payout totals
+                            (concentration_engine.calculate_gini)
+            Paid_Rate:      total payouts / total deposits
+            Tx_Velocity:    transactions per active day
+            Network_Growth: 2 x mean normalized deposit time (1.0 = steady
+                            intake, > 1.0 = deposits accelerating late)
+        """
+        n = len(self._contracts)
+        a = {name: arr[:n] for name, arr in self._arrays.items()}
+
+        # calculate_gini per contract over its payees' totals: sort the pairs by
+        # (contract, total) and weight each total by (2 * rank - n - 1)
+        pair_row = self._pair_row[:self._n_pairs]
+        pair_total = self._pair_total[:self._n_pairs]
+        order = np.lexsort((pair_total, pair_row))
+        sorted_row, sorted_total = pair_row[order], pair_total[order]
+        n_pay = np.bincount(sorted_row, minlength=n)
+        group_start = np.repeat(np.cumsum(n_pay) - n_pay, n_pay)
+        rank = np.arange(len(order)) - group_start + 1
+        weights = 2 * rank - n_pay[sorted_row] - 1
+        numer = np.bincount(sorted_row, weights * sorted_total, minlength=n)
+        denom = n_pay * np.bincount(sorted_row, sorted_total, minlength=n)
+        gini = np.divide(numer, denom, out=np.zeros(n), where=denom > 0)
+
+        paid_rate = np.divide(a['outflow'], a['inflow'], out=np.zeros(n), where=a['inflow'] > 0)
+
+        span = a['last_ts'] - a['first_ts']
+        active_days = np.maximum(span / SECONDS_PER_DAY, 1.0)
+        velocity = a['tx_count'] / active_days
+
+        has_deposits = (a['deposit_count'] > 0) & (span > 0)
+        mean_deposit_ts = np.divide(a['deposit_ts_sum'], a['deposit_count'],
+                                    out=np.zeros(n), where=a['deposit_count'] > 0)
+        growth = np.divide(2 * (mean_deposit_ts - a['first_ts']), span, out=np.zeros(n), where=has_deposits)
+
+        features = pd.DataFrame({
+            'Gini_Index': gini,
+            'Paid_Rate': paid_rate,
+            'Tx_Velocity': velocity,
+            'Network_Growth': growth,
+        }, index=pd.Index(self._contracts, name='contract_address'))
+        return features[FEATURES]
+
+
+def build_contract_features(path, chunksize=1_000_000, graph=False):
+    """
+    Streams a transaction log file into per-contract model features.
+    With graph=True the same pass also feeds a graph_engine.WalletFlowGraph
+    and its GRAPH_FEATURES are joined after the four model features.
+    """
+    aggregator = TransactionAggregator()
+    wallet_graph = None
+    if graph:
+        from ponzi_detection.graph_engine import WalletFlowGraph
+        wallet_graph = WalletFlowGraph()
+    for chunk in read_transactions(path, chunksize=chunksize):
+        aggregator.update(chunk)
+        if wallet_graph is not None:
+            wallet_graph.update(chunk)
+    features = aggregator.to_features()
+    if wallet_graph is not None:
+        features = features.join(wallet_graph.features())
+    return features
@@ -0,0 +1,191 @@
+"""
+Per-stage timing and memory instrumentation for the detection pipeline.
+
+    with stage('Day 5-8: SMOTE Balancing', rows=len(X_train)) as record:
+        X_res, y_res = sm.fit_resample(X_train, y_train)
+        record['rows_out'] = len(X_res)
+
+    @instrumented
+    def calculate_yield_health(df): ...
+
+Stages record wall time and resident memory sampled while they run: a
+background thread reads the process RSS every RSS_SAMPLE_INTERVAL_S, so
+the stage peak includes allocations tracemalloc cannot see (sklearn's
+trees, BLAS buffers). Also recorded: the process RSS high-water mark
+(ru_maxrss, which never goes down, so only its growth is attributable to
+the stage) and, only when tracing is on, the tracemalloc peak of the
+Python heap. Tracing slows allocation-heavy stages noticeably, so the
+pipeline leaves it off unless asked. Decorated engine
+functions accumulate call counts and timings; the decorator takes a lock
+per call, so it belongs on batch and stage entry points, not on per-row
+helpers. save() writes everything as JSON next to final_report.txt.
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+DEFAULT_METRICS_PATH = os.path.join('outputs', 'pipeline_metrics.json')
+RSS_SAMPLE_INTERVAL_S = 0.005
+
+
+def current_rss_mb():
+    """Current resident set size in MB (None where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+
+def rss_high_water_mb():
+    """Process-lifetime peak resident set size in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+class RssSampler:
+    """Tracks the peak current RSS from a background thread between start() and stop()."""
+
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL_S):
+        self.interval = interval
+        self.start_mb = None
+        self.peak_mb = None
+        self._done = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        rss = current_rss_mb()
+        if rss is not None and (self.peak_mb is None or rss > self.peak_mb):
+            self.peak_mb = rss
+        return rss
+
+    def _run(self):
+        while not self._done.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self.start_mb = self._sample()
+        if self.start_mb is not None:
+            self._thread = threading.Thread(target=self._run, name='rss-sampler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._done.set()
+            self._thread.join()
+            self._sample()
+        return self.peak_mb
+
+
+class PipelineMetrics:
+    """Collects stage records and per-function call statistics."""
+
+    def __init__(self):
+        self.stages = []
+        self.calls = {}
+        self.started = datetime.now().isoformat(timespec='seconds')
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        record = {'stage': name, 'rows': rows}
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            mem_before = tracemalloc.get_traced_memory()[0]
+        rss_before = rss_high_water_mb()
+        sampler = RssSampler().start()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['duration_s'] = time.perf_counter() - start
+            peak = sampler.stop()
+            record['rss_peak_mb'] = peak
+            record['rss_peak_growth_mb'] = None if peak is None else peak - sampler.start_mb
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                record['traced_peak_mb'] = (peak - mem_before) / 2**20
+                record['traced_delta_mb'] = (current - mem_before) / 2**20
+            rss_after = rss_high_water_mb()
+            record['rss_hwm_mb'] = rss_after
+            record['rss_hwm_growth_mb'] = None if rss_after is None else rss_after - rss_before
+            with self._lock:
+                self.stages.append(record)
+
+    def record_call(self, name, seconds):
+        with self._lock:
+            stats = self.calls.get(name)
+            if stats is None:
+                stats = self.calls[name] = {'calls': 0, 'total_s': 0.0, 'max_s': 0.0}
+            stats['calls'] += 1
+            stats['total_s'] += seconds
+            if seconds > stats['max_s']:
+                stats['max_s'] = seconds
+
+    def to_dict(self):
+        with self._lock:
+            total = sum(s['duration_s'] for s in self.stages)
+            calls = {name: dict(stats, mean_s=stats['total_s'] / stats['calls'])
+                     for name, stats in self.calls.items()}
+            return {
+                'started': self.started,
+                'total_duration_s': total,
+                'rss_hwm_mb': rss_high_water_mb(),
+                'stages': [dict(s) for s in self.stages],
+                'calls': calls,
+            }
+
+    def save(self, path=DEFAULT_METRICS_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+
+_metrics = PipelineMetrics()
+
+
+def get_metrics():
+    return _metrics
+
+
+def reset_metrics():
+    """Starts a fresh collection (e.g. at the top of each pipeline run)."""
+    global _metrics
+    _metrics = PipelineMetrics()
+    return _metrics
+
+
+def stage(name, rows=None):
+    """Context manager recording one pipeline stage in the current metrics."""
+    return _metrics.stage(name, rows)
+
+
+def instrumented(func=None, *, name=None):
+    """Decorator accumulating call count / total / max time per engine function."""
+    if func is None:
+        return functools.partial(instrumented, name=name)
+    label = name or f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _metrics.record_call(label, time.perf_counter() - start)
+    return wrapper
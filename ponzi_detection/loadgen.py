@@ -0,0 +1,89 @@
+"""
+Load generator for scoring_service.py: opens `--concurrency` keep-alive
+connections, fires `--requests` single-contract scores in total and reports
+client-side p50/p99 latency and throughput.
+
+    python -m ponzi_detection.loadgen --port 8080 --requests 20000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from ponzi_detection.engine import FEATURES, generate_features
+
+
+async def _request(reader, writer, host, method, path, body=b''):
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        key, _, value = line.decode('latin-1').partition(':')
+        if key.strip().lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _client(host, port, payloads, latencies, failures):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in payloads:
+            start = time.perf_counter()
+            status, _ = await _request(reader, writer, host, 'POST', '/score', body)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                failures.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(host='127.0.0.1', port=8080, requests=20000, concurrency=64, seed=7):
+    rows = generate_features(requests, seed=seed)[FEATURES]
+    payloads = [json.dumps(dict(zip(FEATURES, row))).encode() for row in rows.itertuples(index=False)]
+    latencies, failures = [], []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, payloads[i::concurrency], latencies, failures) for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, server_stats = await _request(reader, writer, host, 'GET', '/stats')
+    writer.close()
+
+    ms = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'failures': len(failures),
+        'concurrency': concurrency,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'latency_p50_ms': round(float(np.percentile(ms, 50)), 3),
+        'latency_p99_ms': round(float(np.percentile(ms, 99)), 3),
+        'server': server_stats,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure scoring_service latency and throughput.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    args = parser.parse_args(argv)
+    result = asyncio.run(run_load(args.host, args.port, args.requests, args.concurrency))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
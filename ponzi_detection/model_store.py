@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+# joblib and pandas are imported where needed, so metadata and flat-forest
+# scoring work without loading them
+from ponzi_detection.flat_forest import FlatForest
+
+# Bump when the on-disk layout of an artifact changes
+ARTIFACT_VERSION = 2
+DEFAULT_ARTIFACT_DIR = os.path.join('outputs', 'model')
+MODEL_FILE = 'model.joblib'
+METADATA_FILE = 'metadata.json'
+FOREST_FILE = 'forest.npz'
+# Flat-forest scoring wins while rows x mean path length stays below this.
+# Measured crossover against sklearn's predict_proba (100 trees unless noted,
+# 4 features, rows x mean leaf depth at the point sklearn catches up):
+#   unbounded depth (~20 levels)  ~500 rows   -> 10k
+#   20 trees, unbounded (~20)      ~500 rows   -> 10k
+#   300 trees, max_depth=6         ~2000 rows  -> 12k
+#   max_depth=8                    ~2000 rows  -> 16k
+#   50 trees, max_depth=12 (~12)   ~2500 rows  -> 29k
+# Below the crossover the flat path is faster by sklearn's fixed per-call
+# cost: 0.4 vs 8 ms for one row, 8 vs 18 ms for 100 rows on the deep forest.
+FLAT_FOREST_MAX_STEPS = 10_000
+
+# Risk_Score cut-offs (0-100): above CRITICAL blocks, above HIGH warns
+RISK_THRESHOLDS = {'CRITICAL': 75, 'HIGH': 40}
+
+
+class ModelArtifact:
+    """A trained model plus everything needed to score with it."""
+
+    def __init__(self, model, features, thresholds, metadata, forest=None):
+        self.model = model
+        self.features = list(features)
+        self.thresholds = dict(thresholds)
+        self.metadata = metadata
+        self.forest = forest
+
+    @property
+    def model_version(self):
+        return self.metadata['model_version']
+
+    @property
+    def flat_forest_max_rows(self):
+        """Largest batch scored with the flat forest: fewer rows for deeper trees."""
+        if self.forest is None:
+            return 0
+        return int(FLAT_FOREST_MAX_STEPS / self.forest.mean_path_length)
+
+    def predict_proba(self, X):
+        """
+        Small batches (see flat_forest_max_rows) go through the flat forest,
+        which skips sklearn's per-call overhead; larger ones through the
+        model's compiled predict_proba. Both give identical probabilities, NaN rows included,
+        and both reject infinite values. X is a frame with the model's
+        feature columns or an array in that order.
+        """
+        if self.forest is not None and len(X) <= self.flat_forest_max_rows:
+            return self.forest.predict_proba(np.asarray(X))
+        if not hasattr(X, 'columns') and hasattr(self.model, 'feature_names_in_'):
+            # The model was fit on a frame; name the columns so sklearn does not warn
+            import pandas as pd
+            X = pd.DataFrame(np.asarray(X), columns=self.model.feature_names_in_)
+        return self.model.predict_proba(X)
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def save_artifact(model, features, thresholds=RISK_THRESHOLDS, artifact_dir=DEFAULT_ARTIFACT_DIR):
+    """
+    Persists a trained model as a versioned artifact directory:
+        model.joblib   - the fitted model
+        forest.npz     - flat node arrays for low-latency scoring (forests only)
+        metadata.json  - feature order, tier thresholds and model version
+    The model version is the content hash of model.joblib.
+    """
+    import joblib
+    import sklearn
+
+    os.makedirs(artifact_dir, exist_ok=True)
+    model_path = os.path.join(artifact_dir, MODEL_FILE)
+    joblib.dump(model, model_path)
+    forest = None
+    if hasattr(model, 'estimators_'):
+        forest = FlatForest.from_sklearn(model)
+        forest.save(os.path.join(artifact_dir, FOREST_FILE))
+
+    metadata = {
+        'artifact_version': ARTIFACT_VERSION,
+        'model_version': _file_sha256(model_path)[:16],
+        'model_class': type(model).__name__,
+        'features': list(features),
+        'thresholds': dict(thresholds),
+        'flat_forest': forest is not None,
+        'sklearn_version': sklearn.__version__,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    with open(os.path.join(artifact_dir, METADATA_FILE), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    return ModelArtifact(model, features, thresholds, metadata, forest)
+
+
+def load_metadata(artifact_dir=DEFAULT_ARTIFACT_DIR):
+    with open(os.path.join(artifact_dir, METADATA_FILE)) as f:
+        metadata = json.load(f)
+    if metadata.get('artifact_version') != ARTIFACT_VERSION:
+        raise ValueError(
+            f"Unsupported artifact version {metadata.get('artifact_version')} "
+            f"(expected {ARTIFACT_VERSION}); retrain with 'ponzi train'"
+        )
+    return metadata
+
+
+def load_artifact(artifact_dir=DEFAULT_ARTIFACT_DIR):
+    """Loads an artifact (model, flat forest and metadata) into memory."""
+    import joblib
+
+    metadata = load_metadata(artifact_dir)
+    model = joblib.load(os.path.join(artifact_dir, MODEL_FILE))
+    forest_path = os.path.join(artifact_dir, FOREST_FILE)
+    forest = FlatForest.load(forest_path) if os.path.exists(forest_path) else None
+    return ModelArtifact(model, metadata['features'], metadata['thresholds'], metadata, forest)
+
+
+def assign_risk_tier(risk_scores, thresholds=RISK_THRESHOLDS):
+    """Vectorized CRITICAL / HIGH / LOW tiering of 0-100 risk scores."""
+    risk_scores = np.asarray(risk_scores, dtype=float)
+    return np.select(
+        [risk_scores > thresholds['CRITICAL'], risk_scores > thresholds['HIGH']],
+        ['CRITICAL', 'HIGH'],
+        default='LOW',
+    ).astype(object)
+
+
+def score_features(features_df, artifact):
+    """
+    Scores feature rows with a loaded artifact, no retraining.
+    Returns a frame with Risk_Score (0-100) and Risk_Tier on the input index.
+    """
+    import pandas as pd
+
+    X = features_df[artifact.features]
+    y_probs = artifact.predict_proba(X)[:, 1]
+    scores = pd.Series(y_probs * 100, index=features_df.index).round(2)
+    return pd.DataFrame({
+        'Risk_Score': scores,
+        'Risk_Tier': assign_risk_tier(scores.to_numpy(), artifact.thresholds),
+    }, index=features_df.index)
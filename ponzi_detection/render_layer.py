@@ -0,0 +1,141 @@
+"""
+Bounded dashboard payloads: series downsampling and top-k table pages.
+
+Charts get at most `max_points` rows no matter how long the history is.
+Each series is reduced with Largest-Triangle-Three-Buckets (LTTB), which
+keeps the visually significant peaks and troughs, and the rows on both
+sides of every inflow/outflow crossover are always kept so the "Ponzi
+intersection" survives downsampling.
+
+Tables are paged server-side: a page of a sorted table only needs the top
+page * page_size rows, which np.partition finds in O(n) before sorting just
+those rows, instead of sorting the whole table on every rerun.
+
+    chart = downsample_frame(df, 'timestamp', ['new_deposits', 'yield_disbursed'],
+                             crossover=('new_deposits', 'yield_disbursed'))
+    page, n_pages = top_k_page(wallets, 'yield_share', page=2, page_size=50)
+"""
+import numpy as np
+
+DEFAULT_MAX_POINTS = 1000
+DEFAULT_PAGE_SIZE = 50
+MAX_ALERT_BANNERS = 5   # Alerts beyond this go to a paged table
+# At most this fraction of the point budget goes to crossover rows
+CROSSOVER_SHARE = 0.25
+
+
+def _as_float(values):
+    """Numeric view for geometry: datetimes become int64 nanoseconds."""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype('datetime64[ns]').astype(np.int64)
+    return values.astype(float)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Row positions LTTB keeps when reducing the series (x, y) to n_out points.
+    The first and last points are always kept; NaNs count as zero height.
+    """
+    x, y = _as_float(x), np.nan_to_num(_as_float(y))
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.unique(np.array([0, n - 1])[:max(n_out, 0)])
+
+    # n_out - 2 buckets between the fixed endpoints; prefix sums give bucket means in O(1)
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    cx, cy = np.r_[0.0, np.cumsum(x)], np.r_[0.0, np.cumsum(y)]
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_start, next_stop = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        count = next_stop - next_start
+        avg_x = (cx[next_stop] - cx[next_start]) / count
+        avg_y = (cy[next_stop] - cy[next_start]) / count
+        # Twice the triangle area (a, candidate, next bucket mean); the constant factor does not matter
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def crossover_indices(a, b):
+    """Rows on both sides of every sign change of a - b."""
+    sign = np.sign(np.nan_to_num(_as_float(a) - _as_float(b)))
+    change = np.flatnonzero(sign[1:] != sign[:-1])
+    return np.unique(np.concatenate([change, change + 1]))
+
+
+def downsample_frame(df, x, y_cols, max_points=DEFAULT_MAX_POINTS, crossover=None):
+    """
+    At most max_points rows of df (in order) for charting `y_cols` against `x`:
+    the union of per-series LTTB picks plus, if `crossover` names two columns,
+    the rows around their crossings (evenly thinned past CROSSOVER_SHARE of the budget).
+    """
+    if max_points < 2:
+        raise ValueError(f"max_points must be at least 2 (the first and last rows), got {max_points}")
+    n = len(df)
+    if n <= max_points:
+        return df
+    keep = [np.array([0, n - 1])]
+    if crossover is not None:
+        crossings = crossover_indices(df[crossover[0]].to_numpy(), df[crossover[1]].to_numpy())
+        limit = int(max_points * CROSSOVER_SHARE)
+        if len(crossings) > limit:
+            crossings = crossings[np.linspace(0, len(crossings) - 1, limit).astype(np.int64)]
+        keep.append(crossings)
+
+    x_values = df[x].to_numpy()
+    # Endpoints are already kept, so each series gets its share of the rest plus those two
+    per_series = (max_points - len(np.unique(np.concatenate(keep)))) // len(y_cols) + 2
+    if per_series >= 3:
+        for column in y_cols:
+            keep.append(lttb_indices(x_values, df[column].to_numpy(), per_series))
+    return df.iloc[np.unique(np.concatenate(keep))]
+
+
+def top_k_positions(values, k, ascending=False):
+    """
+    Positions of the first k rows of a stable sort on `values` (NaNs last),
+    in sorted order, via partition instead of a full sort.
+    """
+    key = _as_float(values)
+    key = np.where(np.isnan(key), np.inf, key if ascending else -key)
+    n = len(key)
+    k = min(k, n)
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    if k < n:
+        kth = np.partition(key, k - 1)[k - 1]
+        below = np.flatnonzero(key < kth)
+        # Earliest ties fill the remaining slots, as a stable sort would order them
+        candidates = np.concatenate([below, np.flatnonzero(key == kth)[:k - len(below)]])
+    else:
+        candidates = np.arange(n)
+    return candidates[np.lexsort((candidates, key[candidates]))]
+
+
+def _clamp_page(n_rows, page, page_size):
+    n_pages = max(-(-n_rows // page_size), 1)
+    return min(max(int(page), 1), n_pages), n_pages
+
+
+def page_items(items, page=1, page_size=DEFAULT_PAGE_SIZE):
+    """One page of an already ordered sequence (1-based, clamped) plus the page count."""
+    page, n_pages = _clamp_page(len(items), page, page_size)
+    return items[(page - 1) * page_size:page * page_size], n_pages
+
+
+def top_k_page(df, by, page=1, page_size=DEFAULT_PAGE_SIZE, ascending=False):
+    """
+    One page of df sorted by `by` (1-based, clamped to the valid range),
+    plus the page count. Only page * page_size rows are ever sorted.
+    """
+    page, n_pages = _clamp_page(len(df), page, page_size)
+    positions = top_k_positions(df[by].to_numpy(), page * page_size, ascending)
+    return df.iloc[positions[(page - 1) * page_size:]], n_pages
@@ -0,0 +1,436 @@
+"""
+Rolling-window behavioral features over daily contract flows.
+
+Collapse shows up as change over 7/30/90-day windows, so for every window
+each contract keeps running sums of deposits, payouts and activity, a count
+of newly seen wallets, and a ConcentrationTracker holding the payouts each
+wallet received inside the window. A new day is added and the days that
+fall out of the window are evicted, so an update costs O(wallets touched *
+log wallets) no matter how long the window is.
+
+backfill() computes a whole history with array operations instead: window
+sums are differences of cumulative sums, and the Gini of every window comes
+from a dense (contract-day x wallet) block of per-wallet window totals,
+sorted row by row. Contracts whose block would exceed DENSE_CELLS (many
+days times many wallets) are replayed through the incremental path. The
+per-contract states are only built, from their last max(windows) days,
+when a contract is updated or inspected after the backfill.
+
+    engine = RollingFeatureEngine()
+    history = engine.backfill(df)                       # one feature row per contract-day
+    engine.update('0xabc', day, deposits, disbursed, treasury, payouts={'0x12': 500.0})
+    engine.latest()                                     # one row per contract, model-ready
+
+Feature columns (for each window W):
+    Tx_Velocity_Wd        payout events per day
+    Network_Growth_Wd     wallets first seen in the window / wallets seen before it
+    Sustainability_Wd     payouts / deposits over the window
+    Gini_Index_Wd         Gini of per-wallet payouts within the window
+    Treasury_Change_Wd    relative treasury change against W days earlier
+"""
+from bisect import bisect_right
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from ponzi_detection.concentration_engine import ConcentrationTracker
+from ponzi_detection.instrumentation import instrumented
+
+ROLLING_WINDOWS = (7, 30, 90)
+DENSE_CELLS = 1 << 21  # (contract-days x wallets) per vectorized block; larger contracts are replayed
+ROLLING_METRICS = ('Tx_Velocity', 'Network_Growth', 'Sustainability', 'Gini_Index', 'Treasury_Change')
+
+
+def rolling_feature_names(windows=ROLLING_WINDOWS):
+    return [f"{metric}_{window}d" for window in windows for metric in ROLLING_METRICS]
+
+
+def _day_number(timestamps):
+    """Whole days since the Unix epoch."""
+    return (pd.to_datetime(timestamps).to_numpy().astype('datetime64[D]')).astype(np.int64)
+
+
+class _Day:
+    """One contract-day: flows plus the payout each wallet received."""
+    __slots__ = ('day', 'deposits', 'disbursed', 'events', 'payouts', 'new_wallets')
+
+    def __init__(self, day, deposits, disbursed, events, payouts, new_wallets):
+        self.day = day
+        self.deposits = deposits
+        self.disbursed = disbursed
+        self.events = events
+        self.payouts = payouts
+        self.new_wallets = new_wallets
+
+
+class _Window:
+    """Running aggregates over the last `length` days."""
+
+    def __init__(self, length):
+        self.length = length
+        self.days = deque()
+        self.deposits = 0.0
+        self.disbursed = 0.0
+        self.events = 0
+        self.new_wallets = 0
+        self.wallet_days = {}  # wallet -> number of days in the window it was paid on
+        self.tracker = ConcentrationTracker()
+
+    def add(self, record):
+        self.days.append(record)
+        self.deposits += record.deposits
+        self.disbursed += record.disbursed
+        self.events += record.events
+        self.new_wallets += record.new_wallets
+        for wallet, amount in record.payouts.items():
+            self.wallet_days[wallet] = self.wallet_days.get(wallet, 0) + 1
+            self.tracker.update(wallet, amount)
+
+    def evict_before(self, day):
+        """Drops days older than the window ending at `day`."""
+        while self.days and self.days[0].day <= day - self.length:
+            record = self.days.popleft()
+            self.deposits -= record.deposits
+            self.disbursed -= record.disbursed
+            self.events -= record.events
+            self.new_wallets -= record.new_wallets
+            for wallet, amount in record.payouts.items():
+                remaining = self.wallet_days[wallet] - 1
+                if remaining:
+                    self.wallet_days[wallet] = remaining
+                    self.tracker.update(wallet, -amount)
+                else:
+                    # Removing the wallet outright keeps subtraction error out of the Gini
+                    del self.wallet_days[wallet]
+                    self.tracker.remove(wallet)
+        if len(self.days) == 1:
+            # Re-anchor the sums so float residue cannot build up across gaps
+            self.deposits, self.disbursed = self.days[0].deposits, self.days[0].disbursed
+
+
+class RollingContractState:
+    """Windowed features for one contract, updated one day at a time."""
+
+    def __init__(self, windows=ROLLING_WINDOWS):
+        self.windows = [_Window(length) for length in windows]
+        self.first_day = None
+        self.last_day = None
+        self.seen_wallets = set()
+        # Recent treasury balances, long enough to look back over the longest window
+        self.treasury_days = deque(maxlen=max(windows) + 1)
+        self.treasury = deque(maxlen=max(windows) + 1)
+
+    def update(self, day, deposits, disbursed, treasury_balance, payouts=None, events=None):
+        """
+        Adds one day (days must not go backwards; a repeated day is merged).
+        `payouts` maps wallet -> amount paid that day; `events` defaults to
+        the number of paid wallets.
+        """
+        day = int(day)
+        if self.last_day is not None and day < self.last_day:
+            raise ValueError(f"Day {day} is before the last recorded day {self.last_day}")
+        payouts = dict(payouts or {})
+        new_wallets = 0
+        for wallet in payouts:
+            if wallet not in self.seen_wallets:
+                self.seen_wallets.add(wallet)
+                new_wallets += 1
+        record = _Day(day, float(deposits), float(disbursed), len(payouts) if events is None else int(events),
+                      payouts, new_wallets)
+
+        if self.first_day is None:
+            self.first_day = day
+        self.last_day = day
+        if self.treasury_days and self.treasury_days[-1] == day:
+            self.treasury_days.pop()
+            self.treasury.pop()
+        self.treasury_days.append(day)
+        self.treasury.append(float(treasury_balance))
+        for window in self.windows:
+            window.add(record)
+            window.evict_before(day)
+        return self.features()
+
+    def _treasury_at(self, day):
+        """Last recorded balance on or before `day` (None if the history is shorter)."""
+        pos = bisect_right(self.treasury_days, day)
+        return self.treasury[pos - 1] if pos else None
+
+    def features(self):
+        """Current feature values keyed by rolling_feature_names()."""
+        out = {}
+        current_treasury = self.treasury[-1] if self.treasury else np.nan
+        for window in self.windows:
+            w = window.length
+            span = min(w, self.last_day - self.first_day + 1) if self.last_day is not None else w
+            seen_before = len(self.seen_wallets) - window.new_wallets
+            earlier = self._treasury_at(self.last_day - w) if self.last_day is not None else None
+            out[f"Tx_Velocity_{w}d"] = window.events / span
+            out[f"Network_Growth_{w}d"] = window.new_wallets / max(seen_before, 1)
+            out[f"Sustainability_{w}d"] = window.disbursed / window.deposits if window.deposits else np.nan
+            out[f"Gini_Index_{w}d"] = float(window.tracker.gini)
+            out[f"Treasury_Change_{w}d"] = (current_treasury / earlier - 1) if earlier else np.nan
+        return out
+
+
+def _window_gini(amount_cs, paid_cs, nonzero_cs, starts):
+    """
+    Gini of per-wallet payouts in windows ending at rows 1.. of the
+    cumulative (rows + 1, wallets) sums and starting at rows `starts`:
+    0 with no paid wallets, NaN when they sum to zero, as
+    ConcentrationTracker.gini.
+    """
+    member = paid_cs[1:] > paid_cs[starts]
+    totals = amount_cs[1:] - amount_cs[starts]
+    # Wallets paid only zeros in the window hold exactly 0, not cumulative-sum residue
+    totals[nonzero_cs[1:] == nonzero_cs[starts]] = 0.0
+    totals[~member] = np.inf  # Sorts after every paid wallet
+    totals.sort(axis=1)
+    totals[totals == np.inf] = 0.0
+    n = member.sum(axis=1)
+    total = totals.sum(axis=1)
+    # sum((2k - n - 1) * x_(k)) over the n paid wallets in ascending order
+    weighted = 2 * (totals @ np.arange(1.0, totals.shape[1] + 1)) - (n + 1) * total
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gini = weighted / (n * total)
+    gini[total == 0] = np.nan
+    gini[n == 0] = 0.0
+    return gini
+
+
+class _Backfill:
+    """A backfilled history, sorted by contract and day, kept to build contract states on demand."""
+
+    def __init__(self, group_day, deposits, disbursed, treasury, events, new_wallets,
+                 row_wallet, row_amount, row_bounds, wallet_values):
+        self.group_day = group_day
+        self.deposits = deposits
+        self.disbursed = disbursed
+        self.treasury = treasury
+        self.events = events
+        self.new_wallets = new_wallets
+        self.row_wallet = row_wallet      # Wallet code of every row, rows grouped by contract-day
+        self.row_amount = row_amount
+        self.row_bounds = row_bounds      # Rows of contract-day g: row_bounds[g]:row_bounds[g + 1]
+        self.wallet_values = wallet_values
+
+    def state(self, windows, first, stop):
+        """RollingContractState after contract-days first..stop-1, built from the tail only."""
+        state = RollingContractState(windows)
+        days = self.group_day
+        state.first_day, state.last_day = int(days[first]), int(days[stop - 1])
+        codes = self.row_wallet[self.row_bounds[first]:self.row_bounds[stop]]
+        state.seen_wallets = set(self.wallet_values[np.unique(codes)].tolist())
+        keep = max(windows) + 1
+        state.treasury_days.extend(days[max(first, stop - keep):stop].tolist())
+        state.treasury.extend(self.treasury[max(first, stop - keep):stop].tolist())
+
+        tail = first + int(np.searchsorted(days[first:stop], state.last_day - max(windows), side='right'))
+        for g in range(tail, stop):
+            payouts = {}
+            rows = slice(self.row_bounds[g], self.row_bounds[g + 1])
+            for wallet, amount in zip(self.wallet_values[self.row_wallet[rows]].tolist(),
+                                      self.row_amount[rows].tolist()):
+                payouts[wallet] = payouts.get(wallet, 0.0) + amount
+            record = _Day(int(days[g]), float(self.deposits[g]), float(self.disbursed[g]), int(self.events[g]),
+                          payouts, int(self.new_wallets[g]))
+            for window in state.windows:
+                if record.day > state.last_day - window.length:
+                    window.add(record)
+        return state
+
+
+class RollingFeatureEngine:
+    """
+    Part 2-3 (Rolling): Windowed Behavioral Features
+    Keeps a RollingContractState per contract. backfill() computes a daily
+    history with array operations and live update() calls continue from
+    it; both give the same features, within float rounding (the batch path
+    takes window sums as differences of cumulative sums).
+    """
+
+    def __init__(self, windows=ROLLING_WINDOWS):
+        self.windows = tuple(windows)
+        self.columns = rolling_feature_names(self.windows)
+        self._states = {}
+        self._pending = {}  # contract -> (_Backfill, first contract-day, stop, latest feature row)
+
+    def __len__(self):
+        return len(self._states) + len(self._pending)
+
+    def state(self, contract_id):
+        state = self._states.get(contract_id)
+        if state is None:
+            pending = self._pending.pop(contract_id, None)
+            if pending is not None:
+                backfill, first, stop, _ = pending
+                state = self._states[contract_id] = backfill.state(self.windows, first, stop)
+            else:
+                state = self._states[contract_id] = RollingContractState(self.windows)
+        return state
+
+    def update(self, contract_id, day, deposits, disbursed, treasury_balance, payouts=None, events=None):
+        """Streams one contract-day in; returns that contract's current features."""
+        return self.state(contract_id).update(day, deposits, disbursed, treasury_balance, payouts, events)
+
+    @instrumented
+    def backfill(self, df, contract_col='contract_id', wallet_col='wallet_address'):
+        """
+        Computes a daily frame (bitconnect_test / scenario_generator schema,
+        optionally with a contract id column) and returns one feature row per
+        contract-day. Several rows on the same day are summed into one day;
+        each row counts as one payout event to its wallet. Contracts that
+        already have state are continued day by day through update().
+        """
+        contracts = df[contract_col].to_numpy() if contract_col in df.columns else np.zeros(len(df), dtype=np.int64)
+        contract_codes, contract_values = pd.factorize(contracts, sort=True, use_na_sentinel=False)
+        wallet_codes, wallet_values = pd.factorize(df[wallet_col].to_numpy(), use_na_sentinel=False)
+        days = _day_number(df['timestamp'])
+        # Stable sort keeps the original row order within each contract-day
+        order = np.lexsort((days, contract_codes))
+        contract_codes, days, wallet_codes = contract_codes[order], days[order], wallet_codes[order]
+        deposits = df['new_deposits'].to_numpy(dtype=float)[order]
+        disbursed = df['yield_disbursed'].to_numpy(dtype=float)[order]
+        treasury = df['treasury_balance'].to_numpy(dtype=float)[order]
+
+        # One group per contract-day
+        starts = np.flatnonzero(np.r_[True, (contract_codes[1:] != contract_codes[:-1]) | (days[1:] != days[:-1])])
+        row_bounds = np.r_[starts, len(days)]
+        group = np.repeat(np.arange(len(starts)), np.diff(row_bounds))
+        group_contract, group_day = contract_codes[starts], days[starts]
+        group_deposits = np.add.reduceat(deposits, starts) if len(starts) else deposits
+        group_disbursed = np.add.reduceat(disbursed, starts) if len(starts) else disbursed
+        group_treasury = treasury[row_bounds[1:] - 1]
+        group_events = np.diff(row_bounds)
+
+        # Wallets per contract: local column in the contract's dense block, first contract-day seen
+        pair_key = contract_codes.astype(np.int64) * max(len(wallet_values), 1) + wallet_codes
+        pairs, pair_id = np.unique(pair_key, return_inverse=True)
+        pair_contract = pairs // max(len(wallet_values), 1)
+        first_pair = np.searchsorted(pair_contract, np.arange(len(contract_values)))
+        local_wallet = pair_id - first_pair[contract_codes]
+        pair_first_group = np.full(len(pairs), len(starts))
+        np.minimum.at(pair_first_group, pair_id, group)
+        group_new = np.bincount(pair_first_group, minlength=len(starts))[:len(starts)]
+
+        backfill = _Backfill(group_day, group_deposits, group_disbursed, group_treasury, group_events, group_new,
+                             wallet_codes, disbursed, row_bounds, np.asarray(wallet_values, dtype=object))
+        contract_bounds = np.r_[np.flatnonzero(np.r_[True, group_contract[1:] != group_contract[:-1]]), len(starts)]
+        known = [c for c in contract_values.tolist() if c in self._states or c in self._pending]
+        out = np.full((len(starts), len(self.columns)), np.nan)
+        if len(starts):
+            wallets_per_contract = np.bincount(pair_contract, minlength=len(contract_values))
+            self._fill(out, backfill, group_contract, contract_bounds, wallets_per_contract, local_wallet, group,
+                       contract_values, known)
+
+        index = pd.MultiIndex.from_arrays([contract_values.take(group_contract), group_day],
+                                          names=[contract_col, 'day'])
+        frame = pd.DataFrame(out, index=index, columns=self.columns)
+        frame.insert(0, 'timestamp', pd.to_datetime(group_day, unit='D'))
+        return frame
+
+    def _fill(self, out, backfill, group_contract, contract_bounds, wallets_per_contract, local_wallet, group,
+              contract_values, known):
+        """Writes every contract-day's features into `out`; registers the contracts' states."""
+        windows = np.asarray(self.windows)
+        days, n_groups = backfill.group_day, len(backfill.group_day)
+        # Contract and day in one sortable key, so window starts never cross contracts
+        key = group_contract.astype(np.int64) * (int(days.max() - days.min()) + 2 * int(windows.max()) + 1) \
+            + (days - days.min())
+        first_group = contract_bounds[:-1][group_contract]
+        known_codes = set(np.flatnonzero(pd.Index(contract_values).isin(known)).tolist())
+
+        def cumulative(values):
+            return np.r_[0, np.cumsum(values)]
+
+        deposits_cs, disbursed_cs = cumulative(backfill.deposits), cumulative(backfill.disbursed)
+        paid_deposit_cs = cumulative(backfill.deposits != 0)
+        events_cs, new_cs = cumulative(backfill.events), cumulative(backfill.new_wallets)
+        ends = np.arange(1, n_groups + 1)
+        seen = new_cs[ends] - new_cs[first_group]
+        age = days - days[first_group] + 1
+        for w, window in enumerate(self.windows):
+            lo = np.searchsorted(key, key - window, side='right')
+            deposits = deposits_cs[ends] - deposits_cs[lo]
+            new = new_cs[ends] - new_cs[lo]
+            # Last balance on or before the window start; a live state keeps the last max(windows) + 1
+            earlier_pos = lo - 1
+            valid = (earlier_pos >= first_group) & (ends - 1 - earlier_pos <= windows.max())
+            earlier = np.where(valid, backfill.treasury[np.maximum(earlier_pos, 0)], 0.0)
+            column = w * len(ROLLING_METRICS)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out[:, column] = (events_cs[ends] - events_cs[lo]) / np.minimum(window, age)
+                out[:, column + 1] = new / np.maximum(seen - new, 1)
+                out[:, column + 2] = np.where(paid_deposit_cs[ends] > paid_deposit_cs[lo],
+                                              (disbursed_cs[ends] - disbursed_cs[lo]) / deposits, np.nan)
+                out[:, column + 4] = np.where(earlier != 0, backfill.treasury / earlier - 1, np.nan)
+
+        # Gini: contracts in dense blocks of at most DENSE_CELLS cells, too-large ones replayed
+        gini_columns = [w * len(ROLLING_METRICS) + 3 for w in range(len(self.windows))]
+        block, block_width = [], 0
+        for code in range(len(contract_values)):
+            first, stop = contract_bounds[code], contract_bounds[code + 1]
+            width = int(wallets_per_contract[code])
+            if code in known_codes or (stop - first) * width > DENSE_CELLS:
+                out[first:stop] = self._replay(backfill, contract_values[code], first, stop)
+                continue
+            if block and (stop - block[0][0]) * max(block_width, width) > DENSE_CELLS:
+                self._fill_gini(out, backfill, key, block, block_width, local_wallet, group, gini_columns)
+                block, block_width = [], 0
+            block.append((first, stop))
+            block_width = max(block_width, width)
+            self._pending[contract_values[code]] = (backfill, first, stop, None)
+        if block:
+            self._fill_gini(out, backfill, key, block, block_width, local_wallet, group, gini_columns)
+        for contract, (backfill_, first, stop, _) in list(self._pending.items()):
+            if backfill_ is backfill:
+                self._pending[contract] = (backfill, first, stop, out[stop - 1].copy())
+
+    def _fill_gini(self, out, backfill, key, block, width, local_wallet, group, gini_columns):
+        """Gini columns for contract-days block[0][0]..block[-1][1] from a dense per-wallet block."""
+        first, stop = block[0][0], block[-1][1]
+        rows = slice(backfill.row_bounds[first], backfill.row_bounds[stop])
+        cell = (group[rows] - first) * width + local_wallet[rows]
+        size = (stop - first) * width
+
+        def cumulative(weights, dtype):
+            dense = np.bincount(cell, weights=weights, minlength=size).reshape(stop - first, width)
+            out = np.empty((stop - first + 1, width), dtype=dtype)
+            out[0] = 0
+            np.cumsum(dense, axis=0, out=out[1:])
+            return out
+
+        amounts = backfill.row_amount[rows]
+        amount_cs = cumulative(amounts, np.float64)
+        paid_cs = cumulative(None, np.int32)
+        nonzero_cs = cumulative(amounts != 0, np.int32)
+        for column, window in zip(gini_columns, self.windows):
+            starts = np.searchsorted(key, key[first:stop] - window, side='right') - first
+            out[first:stop, column] = _window_gini(amount_cs, paid_cs, nonzero_cs, starts)
+
+    def _replay(self, backfill, contract, first, stop):
+        """Feature rows for contract-days first..stop-1 through the contract's incremental state."""
+        rows = []
+        for g in range(first, stop):
+            payouts = {}
+            span = slice(backfill.row_bounds[g], backfill.row_bounds[g + 1])
+            for wallet, amount in zip(backfill.wallet_values[backfill.row_wallet[span]].tolist(),
+                                      backfill.row_amount[span].tolist()):
+                payouts[wallet] = payouts.get(wallet, 0.0) + amount
+            features = self.update(contract, backfill.group_day[g], backfill.deposits[g], backfill.disbursed[g],
+                                   backfill.treasury[g], payouts, events=int(backfill.events[g]))
+            rows.append([features[column] for column in self.columns])
+        return np.array(rows, dtype=float).reshape(stop - first, len(self.columns))
+
+    def latest(self, contract_col='contract_id'):
+        """Current features of every contract, indexed by contract (join onto model inputs)."""
+        rows = {contract: state.features() for contract, state in self._states.items()}
+        frame = pd.DataFrame.from_dict(rows, orient='index', columns=self.columns)
+        if self._pending:
+            # Backfilled contracts not touched since: their last backfill row
+            pending = pd.DataFrame([row for *_, row in self._pending.values()], index=list(self._pending),
+                                   columns=self.columns)
+            frame = pd.concat([frame, pending]) if len(frame) else pending
+        frame.index.name = contract_col
+        return frame
@@ -0,0 +1,172 @@
+"""
+Seeded multi-contract scenario generator for load-testing the engines.
+
+Produces one row per contract and day (N contracts x D days rows) in the
+bitconnect_test column schema plus a `contract_id` column, with every
+column built by whole-array operations. W (n_wallets) is the size of each
+contract's wallet pool that a day's active wallet is drawn from; it does
+not multiply the row count.
+
+    df = generate_scenarios(10_000, days=90, n_wallets=50, seed=7)
+    python -m ponzi_detection.scenario_generator --contracts 20000 --days 60 --out outputs/scenarios.parquet
+
+Contract i follows profiles[i % len(profiles)]. Each profile is a set of
+knots (day position on a 0..1 scale, value) for inflows and outflows,
+linearly interpolated over the requested number of days, so the
+BitConnect profile at 60 days reproduces the original simulation's flows
+and treasury within float rounding (interpolation and the cumulative-sum
+treasury round differently from np.linspace and the sequential loop).
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+SCENARIO_COLUMNS = ['contract_id', 'timestamp', 'new_deposits', 'yield_disbursed', 'treasury_balance',
+                    'wallet_address']
+DEFAULT_END_DATE = '2018-01-16'  # Historical BitConnect collapse
+INSIDER_FRACTION = 0.10          # 5 of 50 wallets
+
+
+def _knots(*points):
+    """(day index on the original 60-day timeline, value) pairs -> (positions 0..1, values)."""
+    days, values = zip(*points)
+    return np.asarray(days, dtype=float) / 59, np.asarray(values, dtype=float)
+
+
+# inflow/outflow knots, starting treasury, and where insiders start draining (None = never)
+PROFILES = {
+    # Hype, plateau, then panic: outflows overtake inflows and insiders drain the last third
+    'bitconnect': {
+        'inflows': _knots((0, 10000), (39, 55000), (40, 55000), (49, 40000), (50, 40000), (59, 500)),
+        'outflows': _knots((0, 2000), (39, 15000), (40, 15000), (49, 45000), (50, 45000), (59, 60000)),
+        'treasury': 200000,
+        'drain_start': 41 / 59,
+    },
+    # Deposits fade while payouts creep up; the treasury erodes over months
+    'slow_bleed': {
+        'inflows': _knots((0, 30000), (59, 9000)),
+        'outflows': _knots((0, 22000), (59, 30000)),
+        'treasury': 300000,
+        'drain_start': 0.5,
+    },
+    # Payouts stay well inside deposits
+    'healthy': {
+        'inflows': _knots((0, 20000), (59, 26000)),
+        'outflows': _knots((0, 8000), (59, 10000)),
+        'treasury': 150000,
+        'drain_start': None,
+    },
+}
+
+_HEX = np.array([f"{i:02x}" for i in range(256)])
+
+
+def clamped_balance(start, flows):
+    """
+    Vectorized treasury[i] = max(0, treasury[i-1] + flows[i]) along the last
+    axis, with treasury[0] = start. A walk reflected at zero equals the free
+    running sum minus its running minimum (when that goes below zero).
+    """
+    flows = np.array(flows, dtype=float)
+    flows[..., 0] = 0
+    free = np.asarray(start, dtype=float)[..., None] + np.cumsum(flows, axis=-1)
+    floor = np.minimum(np.minimum.accumulate(free, axis=-1), 0)
+    return np.maximum(free - floor, 0)
+
+
+def random_addresses(n, rng):
+    """n random 20-byte '0x...' addresses."""
+    raw = rng.integers(0, 256, size=(n, 20), dtype=np.uint8)
+    return np.char.add('0x', np.ascontiguousarray(_HEX[raw]).view('<U40')[:, 0])
+
+
+def _profile_curves(profile, days):
+    t = np.linspace(0, 1, days)
+    spec = PROFILES[profile]
+    return np.interp(t, *spec['inflows']), np.interp(t, *spec['outflows'])
+
+
+def generate_scenarios(n_contracts, days=60, n_wallets=50, profiles=tuple(PROFILES), seed=42,
+                       noise=0.05, scale_spread=0.5, end=DEFAULT_END_DATE):
+    """
+    Builds the multi-contract daily frame (contract-major, oldest day first).
+
+    Inputs:
+        n_contracts (int): Number of contracts
+        days (int): Days simulated per contract
+        n_wallets (int): Wallet pool per contract; the first 10% are insiders
+        profiles (sequence): Collapse profiles from PROFILES, assigned round-robin
+        seed (int): Seed for a reproducible frame
+        noise (float): Daily multiplicative noise on the flow curves (0 = exact curves)
+        scale_spread (float): Lognormal spread of per-contract size (0 = unscaled)
+        end (str): Date of the last simulated day
+    """
+    if n_wallets < 2:
+        raise ValueError("n_wallets must be at least 2 (insiders and regular wallets)")
+    unknown = set(profiles) - set(PROFILES)
+    if unknown:
+        raise ValueError(f"Unknown profiles: {sorted(unknown)}")
+    rng = np.random.default_rng(seed)
+    profile_idx = np.arange(n_contracts) % len(profiles)
+
+    # 1. Flow curves per contract: profile shape x contract size x daily noise
+    curves = [_profile_curves(p, days) for p in profiles]
+    inflow_base = np.stack([c[0] for c in curves])[profile_idx]
+    outflow_base = np.stack([c[1] for c in curves])[profile_idx]
+    scale = np.exp(rng.normal(0, scale_spread, n_contracts))[:, None] if scale_spread else 1.0
+    if noise:
+        inflows = inflow_base * scale * np.exp(rng.normal(-noise**2 / 2, noise, (n_contracts, days)))
+        outflows = outflow_base * scale * np.exp(rng.normal(-noise**2 / 2, noise, (n_contracts, days)))
+    else:
+        inflows, outflows = inflow_base * scale, outflow_base * scale
+
+    # 2. Treasury recurrence, clamped at zero
+    start = np.array([PROFILES[p]['treasury'] for p in profiles])[profile_idx] * np.ravel(scale)
+    treasury = clamped_balance(start, inflows - outflows)
+
+    # 3. One active wallet per day: regular wallets until the drain phase, insiders after
+    n_insiders = max(1, int(n_wallets * INSIDER_FRACTION))
+    drain_start = np.array([np.inf if PROFILES[p]['drain_start'] is None else PROFILES[p]['drain_start']
+                            for p in profiles])[profile_idx]
+    draining = np.linspace(0, 1, days)[None, :] >= drain_start[:, None] - 1e-12
+    u = rng.random((n_contracts, days))
+    local = np.where(draining, u * n_insiders, n_insiders + u * (n_wallets - n_insiders)).astype(np.int64)
+    wallet_codes = np.arange(n_contracts)[:, None] * n_wallets + local
+    wallets = random_addresses(n_contracts * n_wallets, rng).astype(object)
+
+    dates = pd.date_range(end=end, periods=days)
+    return pd.DataFrame({
+        'contract_id': np.repeat(np.arange(n_contracts), days),
+        'timestamp': np.tile(dates.to_numpy(), n_contracts),
+        'new_deposits': inflows.ravel(),
+        'yield_disbursed': outflows.ravel(),
+        'treasury_balance': treasury.ravel(),
+        'wallet_address': wallets[wallet_codes.ravel()],
+    }, columns=SCENARIO_COLUMNS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a seeded multi-contract scenario frame.")
+    parser.add_argument('--contracts', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=60)
+    parser.add_argument('--wallets', type=int, default=50, help="Wallet pool per contract (does not add rows)")
+    parser.add_argument('--profiles', default=','.join(PROFILES), help="Comma-separated PROFILES keys")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default=os.path.join('outputs', 'scenarios.parquet'))
+    args = parser.parse_args(argv)
+
+    df = generate_scenarios(args.contracts, args.days, args.wallets, profiles=args.profiles.split(','),
+                            seed=args.seed)
+    os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+    if os.path.splitext(args.out)[1].lower() in ('.parquet', '.pq'):
+        df.to_parquet(args.out, index=False)
+    else:
+        df.to_csv(args.out, index=False)
+    print(f"--- {len(df):,} rows ({args.contracts} contracts x {args.days} days) saved to '{args.out}' ---")
+    return df
+
+
+if __name__ == "__main__":
+    main()
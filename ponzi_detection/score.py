@@ -0,0 +1,56 @@
+"""
+Scoring entry point: loads the persisted model artifact and scores new
+feature rows without retraining.
+
+    python -m ponzi_detection.score features.csv --out outputs/scores.csv
+    python -m ponzi_detection.score features.csv --cache outputs/cache/scores.npz   # rescore only changed rows
+"""
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from ponzi_detection.incremental_scoring import score_features_incremental
+from ponzi_detection.model_store import DEFAULT_ARTIFACT_DIR, load_artifact, score_features
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score contracts with a trained Ponzi model artifact.")
+    parser.add_argument('features', help="CSV or Parquet file with one row per contract")
+    parser.add_argument('--artifact', default=DEFAULT_ARTIFACT_DIR, help="Model artifact directory")
+    parser.add_argument('--index-col', default=None, help="Column (name or position) holding the contract address")
+    parser.add_argument('--out', default=None, help="Where to write scores (CSV); prints a summary if omitted")
+    parser.add_argument('--cache', default=None, help="Score cache (.npz): rescore only new or changed rows")
+    args = parser.parse_args(argv)
+    index_col = int(args.index_col) if args.index_col and args.index_col.isdigit() else args.index_col
+
+    start = time.perf_counter()
+    artifact = load_artifact(args.artifact)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    if os.path.splitext(args.features)[1].lower() in ('.parquet', '.pq'):
+        features = pd.read_parquet(args.features)
+        if index_col is not None:
+            features = features.set_index(index_col)
+    else:
+        features = pd.read_csv(args.features, index_col=index_col)
+
+    if args.cache:
+        results, result = score_features_incremental(features, artifact, args.cache)
+    else:
+        results = score_features(features, artifact)
+    print(f"Model {artifact.model_version} loaded in {load_ms:.1f} ms; scored {len(results)} contracts")
+    if args.cache:
+        stats = result['stats']
+        print(f"Cache: {stats['hits']} hits, {stats['misses']} rescored ({stats['hit_rate']:.1%} hit rate); "
+              f"CRITICAL +{len(result['added'])} / -{len(result['removed'])}")
+    print(results['Risk_Tier'].value_counts().to_string())
+    if args.out:
+        results.to_csv(args.out)
+        print(f"Scores written to '{args.out}'")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Local async scoring service for firewall gateways.
+
+Single-contract requests are collected for up to `max_wait_ms` (or until
+`max_batch_size` arrive) and scored with one vectorized predict_proba call
+on the trained forest.
+
+    python -m ponzi_detection.scoring_service --port 8080 --max-batch-size 256 --max-wait-ms 2
+
+    POST /score   {"Gini_Index": 0.9, "Paid_Rate": 0.1, "Tx_Velocity": 300, "Network_Growth": 1.5}
+               -> {"Risk_Score": 97.0, "Risk_Tier": "CRITICAL"}
+    GET  /stats   latency / throughput / batching counters
+    GET  /health
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from ponzi_detection.model_store import DEFAULT_ARTIFACT_DIR, assign_risk_tier, load_artifact
+
+LATENCY_WINDOW = 10000  # Most recent request latencies kept for percentiles
+
+
+class ServiceStats:
+    """Request, batch and latency counters for the scoring service."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_rows = 0
+        self.max_batch_seen = 0
+        self._latencies = np.zeros(LATENCY_WINDOW)
+        self._latency_pos = 0
+
+    def record_batch(self, size):
+        self.batches += 1
+        self.batched_rows += size
+        self.max_batch_seen = max(self.max_batch_seen, size)
+
+    def record_latency(self, seconds):
+        self._latencies[self._latency_pos % LATENCY_WINDOW] = seconds
+        self._latency_pos += 1
+        self.requests += 1
+
+    def as_dict(self):
+        uptime = time.perf_counter() - self.started
+        recent = self._latencies[:min(self._latency_pos, LATENCY_WINDOW)] * 1000
+        p50, p99 = np.percentile(recent, [50, 99]) if len(recent) else (0.0, 0.0)
+        return {
+            'uptime_s': round(uptime, 3),
+            'requests': self.requests,
+            'errors': self.errors,
+            'throughput_rps': round(self.requests / uptime, 2) if uptime else 0.0,
+            'batches': self.batches,
+            'mean_batch_size': round(self.batched_rows / self.batches, 2) if self.batches else 0.0,
+            'max_batch_size': self.max_batch_seen,
+            'latency_p50_ms': round(float(p50), 3),
+            'latency_p99_ms': round(float(p99), 3),
+        }
+
+
+class MicroBatcher:
+    """Groups concurrent single-row requests into one predict_proba call."""
+
+    def __init__(self, artifact, max_batch_size=256, max_wait_ms=2.0, stats=None):
+        self.artifact = artifact
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.stats = stats or ServiceStats()
+        self._queue = asyncio.Queue()
+
+    def _predict(self, rows):
+        X = pd.DataFrame(rows, columns=self.artifact.features)
+        scores = np.round(self.artifact.predict_proba(X)[:, 1] * 100, 2)
+        return scores, assign_risk_tier(scores, self.artifact.thresholds)
+
+    async def score(self, row):
+        """Queues one feature row and waits for its (Risk_Score, Risk_Tier)."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            rows = [row for row, _ in batch]
+            try:
+                # Score in a worker thread so the event loop keeps accepting requests
+                scores, tiers = await loop.run_in_executor(None, self._predict, rows)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.stats.record_batch(len(batch))
+            for (_, future), score, tier in zip(batch, scores, tiers):
+                if not future.done():
+                    future.set_result((float(score), tier))
+
+
+class ScoringServer:
+    """Minimal HTTP/1.1 (keep-alive) front end for the MicroBatcher."""
+
+    def __init__(self, batcher):
+        self.batcher = batcher
+        self.stats = batcher.stats
+
+    def _parse_row(self, body):
+        payload = json.loads(body or b'{}')
+        if isinstance(payload, dict) and 'features' in payload:
+            payload = payload['features']
+        if isinstance(payload, dict):
+            row = [float(payload[name]) for name in self.batcher.artifact.features]
+        elif isinstance(payload, list) and len(payload) == len(self.batcher.artifact.features):
+            row = [float(v) for v in payload]
+        else:
+            raise ValueError("expected an object keyed by feature name or a list of feature values")
+        # json and float() both accept NaN/Infinity; one such row would fail its whole batch
+        if not all(math.isfinite(v) for v in row):
+            raise ValueError("feature values must be finite numbers")
+        return row
+
+    async def _route(self, method, path, body):
+        if method == 'POST' and path == '/score':
+            start = time.perf_counter()
+            try:
+                row = self._parse_row(body)
+            except (ValueError, KeyError, TypeError) as exc:
+                self.stats.errors += 1
+                return 400, {'error': f"bad request: {exc}"}
+            try:
+                score, tier = await self.batcher.score(row)
+            except Exception as exc:
+                self.stats.errors += 1
+                return 500, {'error': f"scoring failed: {exc}"}
+            self.stats.record_latency(time.perf_counter() - start)
+            return 200, {'Risk_Score': score, 'Risk_Tier': tier}
+        if method == 'GET' and path == '/stats':
+            return 200, self.stats.as_dict()
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok', 'model_version': self.batcher.artifact.model_version}
+        return 404, {'error': f"no route for {method} {path}"}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self._route(method, path, body)
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(artifact_dir=DEFAULT_ARTIFACT_DIR, host='127.0.0.1', port=8080,
+                max_batch_size=256, max_wait_ms=2.0):
+    artifact = load_artifact(artifact_dir)
+    batcher = MicroBatcher(artifact, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    server = ScoringServer(batcher)
+    worker = asyncio.create_task(batcher.run())
+    tcp = await asyncio.start_server(server.handle, host, port)
+    print(f"--- Scoring model {artifact.model_version} on http://{host}:{port} "
+          f"(max batch {max_batch_size}, max wait {max_wait_ms} ms) ---")
+    try:
+        async with tcp:
+            await tcp.serve_forever()
+    finally:
+        worker.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-batching HTTP scoring service.")
+    parser.add_argument('--artifact', default=DEFAULT_ARTIFACT_DIR)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.artifact, args.host, args.port, args.max_batch_size, args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""
+Out-of-core training with streaming class rebalancing.
+
+The in-memory path (engine.run_pipeline) holds the full feature table, a
+SMOTE-resampled copy of it and the forest at once. This mode keeps memory
+bounded by a budget instead:
+
+    1. Feature rows arrive in chunks sized from --memory-budget-mb.
+    2. A reservoir keeps a uniform sample of every minority (Ponzi) row seen
+       so far; each chunk is trained together with that reservoir, and
+       class_weight='balanced_subsample' evens out what imbalance remains.
+       Until both classes have appeared (e.g. a label-sorted file), majority
+       rows wait in a second reservoir capped at one chunk.
+    3. The forest grows with warm_start: every chunk adds `trees_per_chunk`
+       trees fitted on that chunk only, i.e. a bagged ensemble of per-chunk
+       estimators in one RandomForestClassifier. Trees are capped at
+       `max_depth` and the forest gets a fixed share of the budget
+       (MODEL_BUDGET_SHARE); training stops with an error before a round
+       would push it past that share.
+    4. Rows are held out by a hash of their stream position, and a capped
+       sample of them is kept for precision/recall; --compare excludes the
+       same rows from the in-memory run.
+    5. Training fails if the measured peak exceeds the budget. The peak is
+       the tracemalloc peak (data, reservoirs, sklearn's Python-side copies)
+       plus the forest's tree arrays, which sklearn allocates in C where
+       tracemalloc cannot see them (forest_bytes).
+
+    python -m ponzi_detection.streaming_trainer --rows 2000000 --memory-budget-mb 128 --compare
+    python -m ponzi_detection.streaming_trainer --features labelled.csv --memory-budget-mb 256 --artifact outputs/model
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from ponzi_detection.blocklist_store import splitmix64
+from ponzi_detection.engine import FEATURES, generate_features
+from ponzi_detection.instrumentation import instrumented
+
+LABEL_COL = 'Ponzi'
+# Peak RSS growth of one training round (chunk frame, float array, the
+# concatenation with the reservoir, sklearn's float32 copy, sample weights,
+# splitter buffers), forest excluded. Measured over 50k-400k row chunks of
+# noisy labels, 10 trees of depth 16 (sklearn 1.9, numpy 2): 225-230 B per
+# extra row on top of ~6.7 MB per round; both rounded up
+TRAINING_BYTES_PER_ROW = 256
+TRAINING_OVERHEAD_MB = 8
+DEFAULT_MEMORY_BUDGET_MB = 256
+# Part of the budget reserved for the forest itself; the rest sizes the chunks
+MODEL_BUDGET_SHARE = 0.25
+# Fully grown trees on noisy labels reach ~0.35 nodes per training row
+# (~5.7 MB per tree at 200k rows); depth 16 caps a tree at 2**17 nodes
+DEFAULT_MAX_DEPTH = 16
+DEFAULT_TREES_PER_CHUNK = 10
+DEFAULT_MINORITY_RESERVOIR = 50_000
+DEFAULT_HOLDOUT_FRACTION = 0.2
+DEFAULT_MAX_HOLDOUT_ROWS = 100_000
+
+
+def chunk_rows_for_budget(memory_budget_mb, minority_reservoir=DEFAULT_MINORITY_RESERVOIR,
+                          max_holdout_rows=DEFAULT_MAX_HOLDOUT_ROWS):
+    """
+    Chunk size that keeps one chunk, the minority reservoir and the hold-out
+    inside the budget left after the forest's share.
+    """
+    holdout_bytes = max_holdout_rows * (len(FEATURES) + 2) * 8
+    data_bytes = (memory_budget_mb * (1 - MODEL_BUDGET_SHARE) - TRAINING_OVERHEAD_MB) * 2**20 - holdout_bytes
+    rows = int(data_bytes / TRAINING_BYTES_PER_ROW) - minority_reservoir
+    if rows < 1000:
+        raise ValueError(f"A {memory_budget_mb} MB budget leaves no room for training chunks; "
+                         f"raise it or shrink the minority reservoir")
+    return rows
+
+
+def read_feature_chunks(path, chunksize, columns=FEATURES + [LABEL_COL]):
+    """Yields labelled feature chunks from a CSV or Parquet file."""
+    if os.path.splitext(path)[1].lower() in ('.parquet', '.pq'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=columns)
+
+
+def simulated_feature_chunks(total_rows, chunksize, seed=42):
+    """generate_features() in independent seeded chunks (same class ratio in each)."""
+    for i, start in enumerate(range(0, total_rows, chunksize)):
+        yield generate_features(min(chunksize, total_rows - start), seed=seed + i)[FEATURES + [LABEL_COL]]
+
+
+class _Reservoir:
+    """Uniform fixed-size sample of a row stream (Algorithm R, vectorized per batch)."""
+
+    def __init__(self, capacity, n_columns, rng):
+        self.capacity = capacity
+        self.rows = np.empty((capacity, n_columns))
+        self.size = 0
+        self.seen = 0
+        self._rng = rng
+
+    def add(self, batch):
+        batch = np.asarray(batch, dtype=float)
+        free = min(self.capacity - self.size, len(batch))
+        self.rows[self.size:self.size + free] = batch[:free]
+        self.size += free
+        rest = batch[free:]
+        if len(rest):
+            # The k-th row of the stream takes a random slot with probability capacity / k;
+            # later rows win ties, as in the sequential algorithm
+            positions = self.seen + free + np.arange(1, len(rest) + 1)
+            slots = (self._rng.random(len(rest)) * positions).astype(np.int64)
+            keep = slots < self.capacity
+            self.rows[slots[keep]] = rest[keep]
+        self.seen += len(batch)
+
+    def sample(self):
+        return self.rows[:self.size]
+
+
+def held_out_rows(row_ids, fraction=DEFAULT_HOLDOUT_FRACTION, seed=42):
+    """Hold-out mask for stream positions: a pure function of (row id, seed), so it can be recomputed."""
+    seed_hash = splitmix64(np.array([seed], dtype=np.uint64))[0]
+    bits = splitmix64(np.asarray(row_ids, dtype=np.uint64) ^ seed_hash)
+    return (bits >> np.uint64(11)).astype(np.float64) * 2.0**-53 < fraction
+
+
+def forest_bytes(model):
+    """Bytes held by a fitted forest's tree arrays (node structs + leaf values), all allocated in C."""
+    from sklearn.tree._tree import NODE_DTYPE
+
+    total = 0
+    for estimator in getattr(model, 'estimators_', ()):
+        tree = estimator.tree_
+        total += tree.node_count * (NODE_DTYPE.itemsize + tree.value[0].nbytes)
+    return total
+
+
+def _precision_recall(y_true, y_pred):
+    true_pos = int(np.sum((y_pred == 1) & (y_true == 1)))
+    predicted, actual = int(np.sum(y_pred == 1)), int(np.sum(y_true == 1))
+    return (true_pos / predicted if predicted else 0.0), (true_pos / actual if actual else 0.0)
+
+
+@instrumented
+def train_out_of_core(chunks, trees_per_chunk=DEFAULT_TREES_PER_CHUNK,
+                      minority_reservoir=DEFAULT_MINORITY_RESERVOIR, holdout_fraction=DEFAULT_HOLDOUT_FRACTION,
+                      max_holdout_rows=DEFAULT_MAX_HOLDOUT_ROWS, max_depth=DEFAULT_MAX_DEPTH,
+                      model_budget_mb=None, seed=42):
+    """
+    Fits a forest chunk by chunk. Returns (model, holdout) where holdout is
+    the (X, y) evaluation sample drawn from the stream, indexed by stream
+    position (see held_out_rows). With model_budget_mb, raises ValueError
+    as soon as the forest exceeds it, or before a round that would, judging
+    by the size of the previous round.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(seed)
+    width = len(FEATURES) + 1  # features + label
+    minority = _Reservoir(minority_reservoir, width, rng)
+    holdout = _Reservoir(max_holdout_rows, width + 1, rng)  # + stream position
+    model = RandomForestClassifier(n_estimators=0, warm_start=True, class_weight='balanced_subsample',
+                                   max_depth=max_depth, random_state=seed)
+    model_budget = None if model_budget_mb is None else model_budget_mb * 2**20
+    pending = None  # Majority rows seen before the first minority row, capped at one chunk
+    offset = 0
+    last_round = {'bytes': 0}
+
+    def fit_round(train):
+        before = forest_bytes(model)
+        if model_budget is not None and before + last_round['bytes'] > model_budget:
+            _model_over_budget(model, before + last_round['bytes'], model_budget_mb)
+        model.set_params(n_estimators=model.n_estimators + trees_per_chunk)
+        model.fit(pd.DataFrame(train[:, :-1], columns=FEATURES), train[:, -1].astype(np.int8))
+        after = forest_bytes(model)
+        last_round['bytes'] = after - before
+        if model_budget is not None and after > model_budget:
+            _model_over_budget(model, after, model_budget_mb)
+
+    for chunk in chunks:
+        data = chunk[FEATURES + [LABEL_COL]].to_numpy(dtype=float)
+        row_ids = np.arange(offset, offset + len(data))
+        offset += len(data)
+        held_out = held_out_rows(row_ids, holdout_fraction, seed)
+        holdout.add(np.column_stack([data[held_out], row_ids[held_out]]))
+        data = data[~held_out]
+
+        # Train on this chunk plus the minority seen so far (the chunk's own
+        # minority rows join the reservoir afterwards, so none count twice)
+        is_minority = data[:, -1] == 1
+        train = np.concatenate([data, minority.sample()]) if minority.size else data
+        minority.add(data[is_minority])
+        if len(np.unique(train[:, -1])) < 2:
+            # One class so far: the minority reservoir already holds minority rows,
+            # majority ones wait in a bounded sample instead of whole chunks
+            if pending is None:
+                pending = _Reservoir(len(chunk), width, rng)
+            pending.add(data[~is_minority])
+            continue
+        if pending is not None:
+            # The waiting rows get their own round, so no fit exceeds one chunk plus the reservoir
+            if pending.size:
+                fit_round(np.concatenate([pending.sample(), minority.sample()]))
+            pending = None
+        fit_round(train)
+
+    if model.n_estimators == 0:
+        raise ValueError("The stream never contained both classes; nothing to train")
+    model.set_params(warm_start=False)
+    sample = holdout.sample()
+    X = pd.DataFrame(sample[:, :-2], columns=FEATURES, index=pd.Index(sample[:, -1].astype(np.int64), name='row'))
+    return model, (X, sample[:, -2].astype(np.int8))
+
+
+def _model_over_budget(model, nbytes, model_budget_mb):
+    raise ValueError(f"The forest would outgrow its {model_budget_mb:.1f} MB share of the memory budget "
+                     f"({nbytes / 2**20:.1f} MB at {model.n_estimators} trees); raise the budget, "
+                     f"or lower --trees-per-chunk or --max-depth")
+
+
+def train_in_memory(df, seed=42):
+    """The engine.py path: SMOTE over the full table, then a 100-tree forest."""
+    from imblearn.over_sampling import SMOTE
+    from sklearn.ensemble import RandomForestClassifier
+
+    X_res, y_res = SMOTE(sampling_strategy=1.0, random_state=seed).fit_resample(df[FEATURES], df[LABEL_COL])
+    return RandomForestClassifier(n_estimators=100, random_state=seed).fit(X_res, y_res)
+
+
+def _measure(train):
+    """
+    (result, seconds, peak MB) of one training call: the tracemalloc peak
+    plus the returned forest's tree arrays, which tracemalloc does not see.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = train()
+    seconds = time.perf_counter() - start
+    peak_mb = (tracemalloc.get_traced_memory()[1] - baseline) / 2**20
+    if started:
+        tracemalloc.stop()
+    model = result[0] if isinstance(result, tuple) else result
+    return result, seconds, peak_mb + forest_bytes(model) / 2**20
+
+
+def evaluate(model, X, y):
+    precision, recall = _precision_recall(np.asarray(y), model.predict(X))
+    return {'precision': round(precision, 4), 'recall': round(recall, 4), 'holdout_rows': len(y)}
+
+
+def run(chunk_source, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, compare=False, seed=42, **kwargs):
+    """
+    Trains out of core and reports peak memory plus precision/recall; with
+    compare=True the in-memory SMOTE path is trained on the same rows
+    (minus the hold-out) and scored on the same hold-out. Raises ValueError
+    if out-of-core training peaks above the budget or the forest outgrows
+    its MODEL_BUDGET_SHARE of it.
+    """
+    from sklearn.ensemble import RandomForestClassifier  # noqa: F401  (import cost is not training memory)
+
+    chunksize = chunk_rows_for_budget(memory_budget_mb,
+                                      kwargs.get('minority_reservoir', DEFAULT_MINORITY_RESERVOIR),
+                                      kwargs.get('max_holdout_rows', DEFAULT_MAX_HOLDOUT_ROWS))
+    (model, (X_test, y_test)), seconds, peak_mb = _measure(
+        lambda: train_out_of_core(chunk_source(chunksize), seed=seed,
+                                  model_budget_mb=memory_budget_mb * MODEL_BUDGET_SHARE, **kwargs))
+    report = {'out_of_core': dict(evaluate(model, X_test, y_test), peak_mb=round(peak_mb, 1),
+                                  model_mb=round(forest_bytes(model) / 2**20, 1),
+                                  train_s=round(seconds, 2), chunk_rows=chunksize,
+                                  n_estimators=model.n_estimators, memory_budget_mb=memory_budget_mb)}
+    if peak_mb > memory_budget_mb:
+        raise ValueError(f"Out-of-core training peaked at {peak_mb:.1f} MB, over the {memory_budget_mb} MB budget; "
+                         f"raise the budget or shrink the minority reservoir")
+
+    if compare:
+        from imblearn.over_sampling import SMOTE  # noqa: F401
+        full = pd.concat(list(chunk_source(chunksize)), ignore_index=True)
+        # The index is the stream position, so the same held-out rows (sampled for
+        # evaluation or not) are excluded and duplicates of them are kept
+        held_out = held_out_rows(np.arange(len(full)), kwargs.get('holdout_fraction', DEFAULT_HOLDOUT_FRACTION), seed)
+        train_df = full[~held_out]
+        del full
+        in_memory, seconds, peak_mb = _measure(lambda: train_in_memory(train_df, seed=seed))
+        report['in_memory'] = dict(evaluate(in_memory, X_test, y_test), peak_mb=round(peak_mb, 1),
+                                   model_mb=round(forest_bytes(in_memory) / 2**20, 1),
+                                   train_s=round(seconds, 2), n_estimators=in_memory.n_estimators)
+    return model, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the Ponzi model out of core under a memory budget.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--features', help="CSV/Parquet with the model features and a 'Ponzi' label column")
+    source.add_argument('--rows', type=int, default=1_000_000, help="Simulated rows when no --features file")
+    parser.add_argument('--memory-budget-mb', type=float, default=DEFAULT_MEMORY_BUDGET_MB)
+    parser.add_argument('--trees-per-chunk', type=int, default=DEFAULT_TREES_PER_CHUNK)
+    parser.add_argument('--max-depth', type=int, default=DEFAULT_MAX_DEPTH)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--compare', action='store_true', help="Also train the in-memory SMOTE path and compare")
+    parser.add_argument('--artifact', default=None, help="Save the trained model as an artifact directory")
+    args = parser.parse_args(argv)
+
+    if args.features:
+        chunk_source = lambda chunksize: read_feature_chunks(args.features, chunksize)  # noqa: E731
+    else:
+        chunk_source = lambda chunksize: simulated_feature_chunks(args.rows, chunksize, args.seed)  # noqa: E731
+
+    model, report = run(chunk_source, args.memory_budget_mb, compare=args.compare, seed=args.seed,
+                        trees_per_chunk=args.trees_per_chunk, max_depth=args.max_depth)
+    print("--- Out-of-core training report ---")
+    for mode, stats in report.items():
+        print(f"  {mode:<12}" + "  ".join(f"{key}={value}" for key, value in stats.items()))
+    if args.artifact:
+        from ponzi_detection.model_store import RISK_THRESHOLDS, save_artifact
+        artifact = save_artifact(model, FEATURES, RISK_THRESHOLDS, args.artifact)
+        print(f"--- Model artifact {artifact.model_version} saved to '{args.artifact}' ---")
+    return model, report
+
+
+if __name__ == "__main__":
+    main()
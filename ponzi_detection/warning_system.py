@@ -0,0 +1,171 @@
+import numpy as np
+
+from ponzi_detection.instrumentation import instrumented
+
+ALERT_MOMENTUM = "🚨 RAPID RISK ESCALATION: Momentum shift detected."
+ALERT_LIQUIDITY = "⚠️ LIQUIDITY DRAIN: Large capital outflow detected."
+ALERT_DEATH_SPIRAL = "💀 DEATH SPIRAL: Insolvency is mathematically certain."
+
+# Bit flags used by WarningMonitor, in the same order as ALERT_MESSAGES
+ALERT_MESSAGES = (ALERT_MOMENTUM, ALERT_LIQUIDITY, ALERT_DEATH_SPIRAL)
+MOMENTUM_FLAG, LIQUIDITY_FLAG, DEATH_SPIRAL_FLAG = 1, 2, 4
+
+MOMENTUM_THRESHOLD = 15      # Score points gained in one cycle
+LIQUIDITY_THRESHOLD = -0.15  # 15% drop in treasury in one cycle
+DEATH_SPIRAL_THRESHOLD = 90
+
+
+def check_early_warnings(current_score, previous_score, treasury_delta):
+    """
+    Part 5: Early Warning System
+    Checks if the rate of change indicates an imminent collapse.
+    """
+    alerts = []
+
+    # 1. Momentum Warning (Sudden risk spike)
+    score_change = current_score - previous_score
+    if score_change > MOMENTUM_THRESHOLD:
+        alerts.append(ALERT_MOMENTUM)
+
+    # 2. Liquidity Warning (Sudden drain)
+    if treasury_delta < LIQUIDITY_THRESHOLD:
+        alerts.append(ALERT_LIQUIDITY)
+
+    # 3. Final Warning (The 'Point of No Return')
+    if current_score > DEATH_SPIRAL_THRESHOLD:
+        alerts.append(ALERT_DEATH_SPIRAL)
+
+    return alerts
+
+
+def decode_alerts(flags):
+    """Turns a WarningMonitor flag value into the check_early_warnings messages."""
+    return [msg for bit, msg in enumerate(ALERT_MESSAGES) if int(flags) & (1 << bit)]
+
+
+class WarningMonitor:
+    """
+    Part 5 (Live): Stateful Early Warning Monitor
+    Keeps the last `history` risk scores and treasury deltas of up to
+    `max_contracts` contracts in preallocated ring buffers, so memory is
+    fixed at construction time. Each contract update is O(1) and batches
+    are processed with array operations after one stable sort, so repeated
+    contracts inside one batch are applied in arrival order at no extra
+    cost. Contract ids must be str or int for snapshot().
+    """
+
+    def __init__(self, max_contracts, history=30):
+        self.max_contracts = max_contracts
+        self.history = history
+        self._slots = {}
+        self._ids = []
+        self.scores = np.full((max_contracts, history), np.nan)
+        self.deltas = np.full((max_contracts, history), np.nan)
+        self.cursor = np.zeros(max_contracts, dtype=np.int64)
+        self.count = np.zeros(max_contracts, dtype=np.int64)
+
+    def __len__(self):
+        return len(self._ids)
+
+    @property
+    def nbytes(self):
+        return self.scores.nbytes + self.deltas.nbytes + self.cursor.nbytes + self.count.nbytes
+
+    def _slots_for(self, contract_ids):
+        slots = np.empty(len(contract_ids), dtype=np.int64)
+        for i, contract in enumerate(contract_ids):
+            slot = self._slots.get(contract)
+            if slot is None:
+                if len(self._ids) >= self.max_contracts:
+                    raise ValueError(f"WarningMonitor is full ({self.max_contracts} contracts)")
+                slot = len(self._ids)
+                self._slots[contract] = slot
+                self._ids.append(contract)
+            slots[i] = slot
+        return slots
+
+    @instrumented
+    def update(self, contract_ids, scores, treasury_deltas):
+        """
+        Records one cycle per entry and returns int8 alert flags per entry
+        (MOMENTUM_FLAG | LIQUIDITY_FLAG | DEATH_SPIRAL_FLAG). The momentum
+        check compares against the contract's previous recorded score and
+        is skipped on its first update.
+        """
+        slots = self._slots_for(list(contract_ids))
+        scores = np.asarray(scores, dtype=float)
+        treasury_deltas = np.asarray(treasury_deltas, dtype=float)
+        flags = np.zeros(len(slots), dtype=np.int8)
+        if len(slots) == 0:
+            return flags
+
+        # One stable sort groups each contract's updates in arrival order; an
+        # update's previous score is the entry before it in its group, or the
+        # ring buffer for the group's first entry
+        order = np.argsort(slots, kind='stable')
+        s = slots[order]
+        current = scores[order]
+        deltas = treasury_deltas[order]
+        first = np.r_[True, s[1:] != s[:-1]]
+        starts = np.flatnonzero(first)
+        sizes = np.diff(np.r_[starts, len(s)])
+        rank = np.arange(len(s)) - np.repeat(starts, sizes)
+
+        previous = np.empty(len(s))
+        previous[1:] = current[:-1]
+        head = s[starts]
+        buffered = self.scores[head, (self.cursor[head] - 1) % self.history]
+        previous[starts] = np.where(self.count[head] > 0, buffered, np.nan)
+
+        f = np.zeros(len(s), dtype=np.int8)
+        f[current - previous > MOMENTUM_THRESHOLD] |= MOMENTUM_FLAG
+        f[deltas < LIQUIDITY_THRESHOLD] |= LIQUIDITY_FLAG
+        f[current > DEATH_SPIRAL_THRESHOLD] |= DEATH_SPIRAL_FLAG
+        flags[order] = f
+
+        # Only each contract's last `history` updates survive in the ring, so
+        # every write below hits a distinct cell
+        keep = rank >= np.repeat(sizes, sizes) - self.history
+        cells = (self.cursor[s[keep]] + rank[keep]) % self.history
+        self.scores[s[keep], cells] = current[keep]
+        self.deltas[s[keep], cells] = deltas[keep]
+        self.cursor[head] = (self.cursor[head] + sizes) % self.history
+        self.count[head] += sizes
+        return flags
+
+    def check(self, contract_id, score, treasury_delta):
+        """Single-contract update returning the alert messages."""
+        return decode_alerts(self.update([contract_id], [score], [treasury_delta])[0])
+
+    def recent_scores(self, contract_id):
+        """Buffered scores of one contract, oldest first."""
+        slot = self._slots[contract_id]
+        n = min(self.count[slot], self.history)
+        idx = (self.cursor[slot] - n + np.arange(n)) % self.history
+        return self.scores[slot, idx]
+
+    def snapshot(self):
+        """Copies the full monitor state as plain arrays (np.savez / np.load without pickle)."""
+        contract_ids = np.array(self._ids) if self._ids else np.array([], dtype=str)
+        if contract_ids.dtype.kind not in 'iuU':
+            raise ValueError("WarningMonitor.snapshot() needs str or int contract ids")
+        return {
+            'contract_ids': contract_ids,
+            'scores': self.scores.copy(),
+            'deltas': self.deltas.copy(),
+            'cursor': self.cursor.copy(),
+            'count': self.count.copy(),
+        }
+
+    @classmethod
+    def restore(cls, state):
+        """Rebuilds a monitor from a snapshot()."""
+        max_contracts, history = state['scores'].shape
+        monitor = cls(max_contracts, history)
+        monitor._ids = state['contract_ids'].tolist()
+        monitor._slots = {contract: i for i, contract in enumerate(monitor._ids)}
+        monitor.scores[:] = state['scores']
+        monitor.deltas[:] = state['deltas']
+        monitor.cursor[:] = state['cursor']
+        monitor.count[:] = state['count']
+        return monitor
@@ -0,0 +1,64 @@
+"""
+XBlock Smart Ponzi Scheme label loader.
+
+Streams Ponzi_label.csv straight out of the bundled zip (nothing is
+extracted to disk) and writes a typed NPZ cache keyed by the archive's
+SHA-256, so later runs skip CSV parsing entirely.
+"""
+import hashlib
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_ARCHIVE = os.path.join(ROOT, 'data', 'xblock data set.zip')  # Shipped as package data
+LABEL_MEMBER = 'Smart Ponzi Scheme Labels/Ponzi_label.csv'
+DEFAULT_CACHE_DIR = os.path.join('outputs', 'cache')
+ADDRESS_DTYPE = '<U42'  # '0x' + 40 hex chars
+
+
+def archive_digest(path=DEFAULT_ARCHIVE):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_path(archive=DEFAULT_ARCHIVE, cache_dir=DEFAULT_CACHE_DIR):
+    return os.path.join(cache_dir, f"ponzi_labels-{archive_digest(archive)[:16]}.npz")
+
+
+def _read_archive(archive):
+    """Parses the label CSV from inside the zip; drops rows not labelled 0/1."""
+    with zipfile.ZipFile(archive) as zf, zf.open(LABEL_MEMBER) as f:
+        raw = pd.read_csv(f, encoding='utf-8-sig', dtype={'Contract': str, 'Ponzi': str})
+    valid = raw['Ponzi'].isin(['0', '1'])
+    labels = pd.DataFrame({
+        'Contract': raw.loc[valid, 'Contract'].str.strip().str.lower().to_numpy(dtype=ADDRESS_DTYPE),
+        'Ponzi': raw.loc[valid, 'Ponzi'].astype(np.int8).to_numpy(),
+    })
+    return labels.drop_duplicates('Contract').reset_index(drop=True)
+
+
+def load_ponzi_labels(archive=DEFAULT_ARCHIVE, cache_dir=DEFAULT_CACHE_DIR, use_cache=True):
+    """
+    Real XBlock labels as a frame of lower-cased 'Contract' addresses and an
+    int8 'Ponzi' flag (rows marked 'error' in the source are skipped).
+    """
+    path = cache_path(archive, cache_dir) if use_cache else None
+    if path and os.path.exists(path):
+        with np.load(path) as cached:
+            return pd.DataFrame({'Contract': cached['contract'], 'Ponzi': cached['ponzi']})
+
+    labels = _read_archive(archive)
+    if path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez(f, contract=labels['Contract'].to_numpy(dtype=ADDRESS_DTYPE),
+                     ponzi=labels['Ponzi'].to_numpy())
+        os.replace(tmp, path)
+    return labels
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from ponzi_detection.instrumentation import instrumented
+
+# Status labels indexed by the int8 codes in 'yield_status_code'
+YIELD_STATUS_LABELS = np.array([
+    "✅ STABLE",
+    "⚠️ WARNING: Unsustainable Yield",
+    "🚨 CRITICAL: Ponzi Collapse Likely",
+], dtype=object)
+STATUS_STABLE, STATUS_WARNING, STATUS_CRITICAL = 0, 1, 2
+
+
+def flag_yield_status(sustainability_ratio, runway_days):
+    """
+    Vectorized flagging logic: returns int8 status codes
+    (0 = STABLE, 1 = WARNING, 2 = CRITICAL) for the given arrays.
+    """
+    sustainability_ratio = np.asarray(sustainability_ratio, dtype=float)
+    runway_days = np.asarray(runway_days, dtype=float)
+
+    codes = np.full(sustainability_ratio.shape, STATUS_STABLE, dtype=np.int8)
+    codes[sustainability_ratio > 1.0] = STATUS_WARNING
+    codes[(sustainability_ratio > 1.2) & (runway_days < 7)] = STATUS_CRITICAL
+    return codes
+
+
+def _yield_metrics(deposits, disbursed, treasury):
+    """Array form of the sustainability, net flow and runway metrics."""
+    # Ratio > 1.0 means the contract is losing money
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sustainability_ratio = disbursed / deposits
+        # If runway is low and sustainability ratio is high, the collapse is near.
+        runway_days = treasury / np.where(disbursed == 0, 1, disbursed)
+    net_flow = deposits - disbursed
+    return sustainability_ratio, net_flow, runway_days
+
+
+@instrumented
+def calculate_yield_health(df):
+    """
+    Part 2: Flagging Unsustainable Yields
+    """
+    # 1. Sustainability Ratio (Yield Paid / New Deposits)
+    # Ratio > 1.0 means the contract is losing money
+    df['sustainability_ratio'] = df['yield_disbursed'] / df['new_deposits']
+
+    # 2. Net Treasury Flow
+    df['net_flow'] = df['new_deposits'] - df['yield_disbursed']
+
+    # 3. Protocol Runway (How many days of yield are left in the reserve?)
+    # If runway is low and sustainability ratio is high, the collapse is near.
+    df['runway_days'] = df['treasury_balance'] / df['yield_disbursed'].replace(0, 1)
+
+    # 4. The Flagging Logic
+    codes = flag_yield_status(df['sustainability_ratio'].to_numpy(), df['runway_days'].to_numpy())
+    df['yield_status'] = YIELD_STATUS_LABELS[codes]
+
+    return df
+
+
+@instrumented
+def calculate_yield_health_panel(df):
+    """
+    Part 2 (Panel Mode): Flagging Unsustainable Yields for many contracts.
+    Takes one row per contract per day in any order (a contract id column,
+    if present, is carried through). Every metric depends on its own row
+    only, so no grouping is needed: each contract's rows match
+    calculate_yield_health on its own. The status comes back as an int8
+    'yield_status_code' column; decode it with YIELD_STATUS_LABELS when the
+    emoji labels are needed.
+    """
+    sustainability_ratio, net_flow, runway_days = _yield_metrics(
+        df['new_deposits'].to_numpy(dtype=float),
+        df['yield_disbursed'].to_numpy(dtype=float),
+        df['treasury_balance'].to_numpy(dtype=float),
+    )
+
+    out = df.copy()
+    out['sustainability_ratio'] = sustainability_ratio
+    out['net_flow'] = net_flow
+    out['runway_days'] = runway_days
+    out['yield_status_code'] = flag_yield_status(sustainability_ratio, runway_days)
+    return out
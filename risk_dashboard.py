@@ -2,25 +2,47 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
-def run_dashboard(df, risk_score, status, alerts):
+from ponzi_detection import data_access
+from ponzi_detection.render_layer import DEFAULT_PAGE_SIZE, MAX_ALERT_BANNERS, page_items
+
+def run_dashboard(df, risk_score, status, alerts, key=None):
     st.title("🛡️ On-Chain Ponzi Detection Engine")
     
+    # One cache key for every loader below; hashing the frame is the only O(rows) step of a rerun
+    key = key or data_access.frame_fingerprint(df)
+    panel = data_access.load_flow_panel(df, key=key)
+
     # 1. High-Level Metrics
     col1, col2, col3 = st.columns(3)
     col1.metric("Risk Score", f"{risk_score}/100", delta=risk_score, delta_color="inverse")
-    col2.metric("Sustainability Ratio", f"{df['sustainability_ratio'].iloc[-1]:.2f}")
-    col3.metric("Protocol Runway", f"{df['runway_days'].iloc[-1]:.0f} Days")
+    col2.metric("Sustainability Ratio", panel['sustainability'])
+    col3.metric("Protocol Runway", panel['runway_days'])
 
-    # 2. Early Warning System Notifications
-    for alert in alerts:
+    # 2. Early Warning System Notifications (first few as banners, the rest paged)
+    for alert in alerts[:MAX_ALERT_BANNERS]:
         st.error(alert)
+    remaining = alerts[MAX_ALERT_BANNERS:]
+    if remaining:
+        with st.expander(f"{len(remaining)} more alerts"):
+            alert_page = st.number_input("Alert page", min_value=1, value=1, step=1, key='alert_page')
+            rows, n_pages = page_items(remaining, alert_page)
+            st.dataframe(pd.DataFrame({'Alert': rows}), use_container_width=True)
+            st.caption(f"Page {min(alert_page, n_pages)} of {n_pages}")
 
-    # 3. Flow Visualization (The Death Spiral Chart)
+    # 3. Flow Visualization (The Death Spiral Chart), downsampled server-side
     st.subheader("Capital Flow Analysis")
-    fig = px.line(df, x='timestamp', y=['new_deposits', 'yield_disbursed'], 
+    chart = data_access.load_flow_chart(df, key=key)
+    fig = px.line(chart, x='timestamp', y=['new_deposits', 'yield_disbursed'], 
                   title="Inflow vs. Outflow (Ponzi Intersection)")
     st.plotly_chart(fig, use_container_width=True)
+    if len(chart) < len(df):
+        st.caption(f"Showing {len(chart):,} of {len(df):,} points (LTTB, crossovers kept)")
 
-    # 4. Due Diligence Table
+    # 4. Due Diligence Table (paged, sorted server-side)
     st.subheader("🕵️ Wallet Concentration Audit")
-    st.dataframe(df[['wallet_address', 'yield_share', 'is_insider']].sort_values(by='yield_share', ascending=False))
\ No newline at end of file
+    page = st.number_input("Page", min_value=1, value=1, step=1, key='wallet_page')
+    wallet_page, n_pages = data_access.load_wallet_page(df, page, key=key)
+    st.dataframe(wallet_page)
+    first = (min(page, n_pages) - 1) * DEFAULT_PAGE_SIZE
+    st.caption(f"Rows {first + 1:,}–{first + len(wallet_page):,} of {panel['wallet_rows']:,} "
+               f"(page {min(page, n_pages)} of {n_pages})")
@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+
+from ponzi_detection.audit_runner import audit_parallel, audit_serial
+from ponzi_detection.scenario_generator import generate_scenarios
+
+
+def test_parallel_matches_serial_with_missing_wallets():
+    df = generate_scenarios(12, days=30, n_wallets=20, seed=3)
+    rng = np.random.default_rng(0)
+    df['wallet_address'] = df['wallet_address'].astype(object)
+    df.loc[rng.random(len(df)) < 0.15, 'wallet_address'] = np.nan
+    # One contract whose payouts all miss a wallet, the rest partly
+    first = df['contract_id'] == df['contract_id'].iloc[0]
+    df.loc[first, 'wallet_address'] = None
+
+    serial = audit_serial(df)
+    parallel = audit_parallel(df, workers=2)
+    pd.testing.assert_frame_equal(parallel, serial)
@@ -0,0 +1,21 @@
+from ponzi_detection.benchmark_suite import compare, measure
+from ponzi_detection.instrumentation import current_rss_mb
+
+
+def test_measure_reports_rss_and_python_heap_separately():
+    r = measure('yield_health', 20_000, repeat=1)
+    assert r['benchmark'] == 'yield_health' and r['n'] == 20_000
+    assert r['wall_time_s'] > 0 and r['python_heap_peak_mb'] > 0
+    assert 'peak_memory_mb' not in r
+    if current_rss_mb() is not None:
+        assert r['rss_peak_mb'] >= 0
+    else:
+        assert r['rss_peak_mb'] is None
+
+
+def test_compare_flags_runs_slower_than_the_tolerance():
+    baseline = {'results': [{'benchmark': 'a', 'n': 10, 'wall_time_s': 1.0},
+                            {'benchmark': 'b', 'n': 10, 'wall_time_s': 1.0}]}
+    results = [{'benchmark': 'a', 'n': 10, 'wall_time_s': 1.2}, {'benchmark': 'b', 'n': 10, 'wall_time_s': 1.3},
+               {'benchmark': 'c', 'n': 10, 'wall_time_s': 9.0}]
+    assert [r['benchmark'] for r in compare(results, baseline, tolerance=0.25)] == ['b']
@@ -0,0 +1,85 @@
+import json
+
+import numpy as np
+import pytest
+
+from ponzi_detection.blocklist_store import BlocklistStore, address_key, read_blocklist
+
+ADDRESS = '0x' + 'ab' * 20
+
+
+def test_empty_build_defaults_to_address_kind(tmp_path):
+    store = BlocklistStore.build([], str(tmp_path))
+    assert store.kind == 'address'
+    store.append_delta(add=[ADDRESS])
+    assert store.iter_addresses() == [ADDRESS]
+    assert ADDRESS in BlocklistStore(str(tmp_path))
+
+
+def test_explicit_kind_for_empty_index_store(tmp_path):
+    store = BlocklistStore.build([], str(tmp_path), kind='index')
+    store.append_delta(add=[7, np.int64(3)])
+    assert store.iter_addresses() == [3, 7]
+
+
+def test_delta_kind_must_match_store(tmp_path):
+    index_store = BlocklistStore.build([1, 2], str(tmp_path / 'index'))
+    with pytest.raises(ValueError):
+        index_store.append_delta(add=[ADDRESS])
+    address_store = BlocklistStore.build([ADDRESS], str(tmp_path / 'address'))
+    with pytest.raises(ValueError):
+        address_store.append_delta(remove=[5])
+    assert address_store.iter_addresses() == [ADDRESS]
+
+
+def test_delta_to_turns_store_into_target(tmp_path):
+    other = '0x' + 'cd' * 20
+    store = BlocklistStore.build([ADDRESS], str(tmp_path))
+    store.append_delta(add=[other])
+    add, remove = store.delta_to([other, '0x' + '01' * 20])
+    assert add == ['0x' + '01' * 20] and remove == [ADDRESS]
+    store.append_delta(add=add, remove=remove)
+    assert store.delta_to([other, '0x' + '01' * 20]) == ([], [])
+
+
+def test_source_survives_deltas_and_compaction(tmp_path):
+    store = BlocklistStore.build([ADDRESS], str(tmp_path), source='model-a')
+    store.append_delta(add=['0x' + 'cd' * 20])
+    store.compact()
+    assert BlocklistStore(str(tmp_path)).source == 'model-a'
+
+
+def test_non_address_ids_get_namespaced_keys():
+    assert address_key('contract_A') != address_key('contract_B')
+    assert address_key(5) != address_key('0x05')
+    assert address_key(5, kind='index') == address_key('0x05')  # Index stores decode back to ints
+    assert address_key('0xnothex') != address_key('0x00')
+    assert len({address_key(x) for x in ['contract_A', 5, '0x05', 'x' * 100]}) == 4
+
+
+def test_store_rejects_ids_it_cannot_decode(tmp_path):
+    with pytest.raises(ValueError, match='non-address ids'):
+        BlocklistStore.build(['contract_A'], str(tmp_path))
+    store = BlocklistStore.build([ADDRESS], str(tmp_path))
+    assert list(store.contains_many(['contract_A', ADDRESS])) == [False, True]
+
+
+def test_reading_a_legacy_json_writes_nothing(tmp_path):
+    legacy = tmp_path / 'firewall_blocklist.json'
+    legacy.write_text(json.dumps([ADDRESS, '0x' + '01' * 20, ADDRESS]))
+    store_dir = tmp_path / 'blocklist'
+    blocklist = read_blocklist(str(store_dir), str(legacy))
+    assert not store_dir.exists()
+    assert len(blocklist) == 2 and ADDRESS in blocklist
+    assert blocklist.iter_addresses() == ['0x' + '01' * 20, ADDRESS]
+
+    migrated = read_blocklist(str(store_dir), str(legacy), migrate=True)
+    assert migrated.iter_addresses() == blocklist.iter_addresses()
+    assert isinstance(read_blocklist(str(store_dir), str(legacy)), BlocklistStore)
+
+
+def test_negative_index_is_a_clear_error(tmp_path):
+    with pytest.raises(ValueError, match='Contract index'):
+        BlocklistStore.build([3, -1], str(tmp_path))
+    with pytest.raises(ValueError, match='Contract index'):
+        address_key(2**160, kind='index')
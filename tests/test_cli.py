@@ -0,0 +1,17 @@
+import pytest
+
+from ponzi_detection import cli
+from ponzi_detection.importtime import FAST_COMMANDS, measure_command
+
+
+@pytest.mark.parametrize('command', FAST_COMMANDS)
+def test_fast_commands_import_no_heavy_dependencies(command):
+    # Measures the handler module main() actually runs, not a hand-kept list
+    assert measure_command(command)['heavy_imports'] == []
+
+
+def test_every_subcommand_has_a_handler():
+    parser_commands = set(cli.build_parser()._subparsers._group_actions[0].choices)
+    assert parser_commands == set(cli.COMMANDS)
+    for command in cli.COMMANDS:
+        assert callable(cli.load_command(command).run)
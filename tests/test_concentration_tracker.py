@@ -0,0 +1,44 @@
+import random
+
+import numpy as np
+
+from ponzi_detection.concentration_engine import ConcentrationTracker, calculate_gini
+
+
+def test_tracker_agrees_with_batch_gini_after_random_updates():
+    rng = random.Random(0)
+    tracker = ConcentrationTracker(seed=1)
+    balances = {}
+    wallets = [f"w{i}" for i in range(60)]
+    for step in range(3000):
+        wallet = rng.choice(wallets)
+        action = rng.random()
+        if action < 0.1:
+            tracker.remove(wallet)
+            balances.pop(wallet, None)
+        else:
+            # Integers make ties (equal balances) common; some updates shrink a balance
+            delta = float(rng.randint(-3, 12)) if action < 0.6 else rng.expovariate(0.1)
+            tracker.update(wallet, delta)
+            balances[wallet] = balances.get(wallet, 0.0) + delta
+        if step % 25 or not balances or sum(balances.values()) == 0:
+            continue
+        values = np.array(list(balances.values()))
+        assert len(tracker) == len(balances)
+        assert np.isclose(tracker.total, values.sum())
+        assert np.isclose(tracker.gini, calculate_gini(values), rtol=1e-9, atol=1e-12)
+        total = values.sum()
+        if total > 0:
+            expected = {w for w, b in balances.items() if b / total > tracker.insider_share}
+            assert set(tracker.insiders()) == expected
+
+
+def test_snapshot_of_an_empty_distribution():
+    tracker = ConcentrationTracker()
+    assert tracker.snapshot() == {'gini_coefficient': 0.0, 'insider_count': 0, 'is_concentrated': False,
+                                  'insiders': {}}
+    tracker.update('a', 5.0)
+    tracker.update('a', -5.0)  # One wallet left, balances sum to zero
+    assert np.isnan(tracker.gini)
+    assert tracker.snapshot()['gini_coefficient'] == 0.0
+    assert not tracker.snapshot()['is_concentrated']
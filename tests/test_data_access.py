@@ -0,0 +1,96 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ponzi_detection import data_access
+from ponzi_detection.blocklist_store import BlocklistStore
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    data_access.clear_cache()
+    yield
+    data_access.clear_cache()
+
+
+def _addresses(n, start=0):
+    return [f"0x{i:040x}" for i in range(start, start + n)]
+
+
+def test_lru_evicts_least_recently_used():
+    cache = data_access.LRUCache(max_entries=2)
+    cache.get_or_build('a', lambda: 1)
+    cache.get_or_build('b', lambda: 2)
+    cache.get_or_build('a', lambda: 0)  # Hit; 'b' is now the oldest
+    cache.get_or_build('c', lambda: 3)
+    assert cache.get_or_build('a', lambda: 0) == 1
+    assert cache.get_or_build('b', lambda: 20) == 20  # Evicted and rebuilt
+    assert cache.stats() == {'entries': 2, 'max_entries': 2, 'hits': 2, 'misses': 4}
+
+
+def test_blocklist_summary_hits_until_the_store_changes(tmp_path, monkeypatch):
+    store_dir = str(tmp_path / 'blocklist')
+    monkeypatch.setattr(data_access, 'BLOCKLIST_DIR', store_dir)
+    monkeypatch.setattr(data_access, 'BLOCKLIST_JSON', str(tmp_path / 'missing.json'))
+    store = BlocklistStore.build(_addresses(30), store_dir)
+
+    first = data_access.load_blocklist_summary()
+    assert data_access.load_blocklist_summary() is first
+    assert first['count'] == 30
+
+    store.append_delta(add=_addresses(5, start=100))  # A new delta file changes the signature
+    assert data_access.load_blocklist_summary()['count'] == 35
+
+
+def test_pipeline_metrics_invalidate_on_rewrite(tmp_path, monkeypatch):
+    path = tmp_path / 'pipeline_metrics.json'
+    monkeypatch.setattr(data_access, 'METRICS_JSON', str(path))
+    assert data_access.load_pipeline_metrics() is None
+
+    metrics = {'stages': [{'stage': 'train', 'duration_s': 1.0}], 'calls': {}, 'total_duration_s': 1.0}
+    path.write_text(json.dumps(metrics))
+    first = data_access.load_pipeline_metrics()
+    assert data_access.load_pipeline_metrics() is first
+
+    metrics['total_duration_s'] = 2.5
+    path.write_text(json.dumps(metrics))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))  # Same size: mtime must differ
+    assert data_access.load_pipeline_metrics()['total_duration_s'] == 2.5
+
+
+def test_passed_key_skips_frame_hashing(monkeypatch):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'timestamp': pd.date_range('2020-01-01', periods=500),
+                       'new_deposits': rng.random(500), 'yield_disbursed': rng.random(500)})
+    key = data_access.frame_fingerprint(df)
+    chart = data_access.load_flow_chart(df, max_points=100, key=key)
+    assert len(chart) <= 100
+
+    def fail(_):
+        raise AssertionError("frame hashed although a key was passed")
+    monkeypatch.setattr(data_access, 'frame_fingerprint', fail)
+    assert data_access.load_flow_chart(df, max_points=100, key=key) is chart
+
+
+def test_bitconnect_analysis_carries_its_key():
+    hits = data_access.cache_stats()['hits']
+    analysis = data_access.load_bitconnect_analysis()
+    assert data_access.load_bitconnect_analysis() is analysis
+    chart = data_access.load_flow_chart(analysis['df'], key=analysis['key'])
+    assert data_access.load_flow_chart(analysis['df'], key=analysis['key']) is chart
+    assert data_access.cache_stats()['hits'] == hits + 2
+
+
+def test_dashboard_reads_legacy_json_without_migrating(tmp_path, monkeypatch):
+    store_dir = tmp_path / 'blocklist'
+    legacy = tmp_path / 'firewall_blocklist.json'
+    legacy.write_text(json.dumps(_addresses(12)))
+    monkeypatch.setattr(data_access, 'BLOCKLIST_DIR', str(store_dir))
+    monkeypatch.setattr(data_access, 'BLOCKLIST_JSON', str(legacy))
+    assert data_access.load_blocklist_summary()['count'] == 12
+    assert len(data_access.load_blocklist_report()) == 12
+    assert not store_dir.exists()
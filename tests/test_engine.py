@@ -0,0 +1,48 @@
+import contextlib
+import io
+
+import pandas as pd
+import pytest
+
+from ponzi_detection.engine import FEATURE_RANGES, FEATURES, XBLOCK_PONZI_COUNT, generate_features, run_pipeline
+
+
+def test_same_seed_gives_the_same_frame():
+    pd.testing.assert_frame_equal(generate_features(5000, seed=7), generate_features(5000, seed=7))
+    assert not generate_features(5000, seed=7)[FEATURES].equals(generate_features(5000, seed=8)[FEATURES])
+
+
+@pytest.mark.parametrize('data_size, n_ponzi, expected', [
+    (3790, None, XBLOCK_PONZI_COUNT),  # Default keeps the XBlock ratio
+    (10_000, None, 422),               # round(10000 * 160 / 3790)
+    (1000, 250, 250),
+    (50, 0, 0),
+])
+def test_label_count(data_size, n_ponzi, expected):
+    df = generate_features(data_size, n_ponzi=n_ponzi)
+    assert len(df) == data_size
+    assert df['Ponzi'].sum() == expected
+
+
+def test_features_stay_in_their_label_ranges():
+    df = generate_features(20_000, seed=1)
+    for name in FEATURES:
+        (p_low, p_high), (n_low, n_high) = FEATURE_RANGES[name]
+        ponzi, normal = df.loc[df['Ponzi'] == 1, name], df.loc[df['Ponzi'] == 0, name]
+        assert ponzi.between(p_low, p_high).all() and normal.between(n_low, n_high).all()
+
+
+def test_labels_override_size_and_index_by_address():
+    labels = pd.DataFrame({'Contract': ['0xa', '0xb', '0xc'], 'Ponzi': [1, 0, 1]})
+    df = generate_features(10_000, seed=3, labels=labels)
+    assert list(df.index) == ['0xa', '0xb', '0xc']
+    assert df['Ponzi'].tolist() == [1, 0, 1]
+
+
+def test_report_names_the_output_dir(tmp_path):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        run_pipeline(data_size=1500, output_dir=str(tmp_path / 'run'))
+    assert f"saved to '{tmp_path / 'run'}/'" in out.getvalue()
+    assert "'outputs/'" not in out.getvalue()
+    assert (tmp_path / 'run' / 'dashboard_plot.png').exists()
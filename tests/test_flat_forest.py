@@ -0,0 +1,85 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from ponzi_detection.flat_forest import FlatForest
+from ponzi_detection.model_store import FLAT_FOREST_MAX_STEPS, ModelArtifact, RISK_THRESHOLDS
+
+FEATURES = ['a', 'b', 'c', 'd']
+
+
+def _data(n, rng, nan_share=0.0):
+    X = rng.normal(size=(n, len(FEATURES)))
+    y = (X[:, 0] + X[:, 1] ** 2 + rng.normal(scale=0.5, size=n) > 1).astype(int)
+    if nan_share:
+        X[rng.random(X.shape) < nan_share] = np.nan
+    return pd.DataFrame(X, columns=FEATURES), y
+
+
+@pytest.fixture(params=[0.0, 0.1], ids=['fit_without_nan', 'fit_with_nan'])
+def model(request):
+    rng = np.random.default_rng(0)
+    X, y = _data(2000, rng, request.param)
+    return RandomForestClassifier(n_estimators=20, max_depth=8, random_state=0).fit(X, y)
+
+
+def _probe(rng):
+    X, _ = _data(1500, rng)
+    values = X.to_numpy().copy()
+    values[rng.random(values.shape) < 0.2] = np.nan
+    values[::7] = np.nan  # Rows with every feature missing
+    return pd.DataFrame(values, columns=FEATURES)
+
+
+def test_flat_forest_matches_sklearn_with_nan(model):
+    X = _probe(np.random.default_rng(1))
+    expected = model.predict_proba(X)
+    assert np.array_equal(FlatForest.from_sklearn(model).predict_proba(X.to_numpy()), expected)
+
+
+def test_flat_forest_round_trip_keeps_nan_routing(model, tmp_path):
+    X = _probe(np.random.default_rng(2)).to_numpy()
+    forest = FlatForest.from_sklearn(model)
+    loaded = FlatForest.load(forest.save(str(tmp_path / 'forest.npz')))
+    assert np.array_equal(loaded.predict_proba(X), forest.predict_proba(X))
+
+
+def test_artifact_score_independent_of_batch_size(model):
+    X = _probe(np.random.default_rng(3))
+    artifact = ModelArtifact(model, FEATURES, RISK_THRESHOLDS, {'model_version': 'test'},
+                             FlatForest.from_sklearn(model))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')  # Large batches must not warn about feature names
+        large = artifact.predict_proba(X)
+        large_array = artifact.predict_proba(X.to_numpy())
+    rows = artifact.flat_forest_max_rows
+    small = np.vstack([artifact.predict_proba(X.iloc[i:i + rows]) for i in range(0, len(X), rows)])
+    assert 0 < rows < len(X)
+    assert np.array_equal(large, small)
+    assert np.array_equal(large, large_array)
+
+
+@pytest.mark.parametrize('value', [np.inf, -np.inf])
+def test_infinite_input_rejected_on_both_paths(model, value):
+    X = _probe(np.random.default_rng(4))
+    X.iloc[3, 1] = value
+    artifact = ModelArtifact(model, FEATURES, RISK_THRESHOLDS, {'model_version': 'test'},
+                             FlatForest.from_sklearn(model))
+    with pytest.raises(ValueError):
+        artifact.predict_proba(X.iloc[:artifact.flat_forest_max_rows])
+    with pytest.raises(ValueError):
+        artifact.predict_proba(X)
+
+
+def test_flat_path_shrinks_with_tree_depth():
+    rng = np.random.default_rng(5)
+    X, y = _data(3000, rng)
+    shallow = FlatForest.from_sklearn(RandomForestClassifier(n_estimators=5, max_depth=3, random_state=0).fit(X, y))
+    deep = FlatForest.from_sklearn(RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y))
+    assert shallow.mean_path_length <= 3 < deep.mean_path_length <= deep.max_depth
+    rows = [ModelArtifact(None, FEATURES, RISK_THRESHOLDS, {}, forest).flat_forest_max_rows
+            for forest in (shallow, deep)]
+    assert rows[0] > rows[1] == int(FLAT_FOREST_MAX_STEPS / deep.mean_path_length)
@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+from ponzi_detection.concentration_engine import analyze_wallet_concentration
+from ponzi_detection.graph_engine import WalletFlowGraph
+
+CONTRACT_A = '0x' + 'a' * 40
+CONTRACT_B = '0x' + 'b' * 40
+WALLET = ['0x' + str(i) * 40 for i in range(1, 6)]
+
+
+def _transactions():
+    # Contract A: wallets 1-3 deposit, wallet 4 never deposits but takes a large payout.
+    # Contract B: wallet 5 never deposits and is paid; it is also paid (a little) by A.
+    rows = [
+        (CONTRACT_A, WALLET[0], CONTRACT_A, 10.0, 1),
+        (CONTRACT_A, WALLET[1], CONTRACT_A, 10.0, 2),
+        (CONTRACT_A, WALLET[2], CONTRACT_A, 10.0, 3),
+        (CONTRACT_A, CONTRACT_A, WALLET[0], 1.0, 4),
+        (CONTRACT_A, CONTRACT_A, WALLET[3], 20.0, 5),
+        (CONTRACT_A, CONTRACT_A, WALLET[4], 0.5, 6),
+        (CONTRACT_B, WALLET[0], CONTRACT_B, 10.0, 1),
+        (CONTRACT_B, CONTRACT_B, WALLET[4], 8.0, 2),
+    ]
+    return pd.DataFrame(rows, columns=['contract_address', 'from_address', 'to_address', 'value', 'timestamp'])
+
+
+def _daily_frame(tx, contract):
+    # One contract's payouts in the shape analyze_wallet_concentration expects (upper-case hex as in raw logs)
+    payouts = tx[(tx['contract_address'] == contract) & (tx['from_address'] == contract)]
+    return pd.DataFrame({'wallet_address': payouts['to_address'].str.upper().str.replace('0X', '0x'),
+                         'yield_disbursed': payouts['value']})
+
+
+def test_graph_candidates_feed_concentration_per_contract():
+    tx = _transactions()
+    candidates = WalletFlowGraph().update(tx).insider_candidates()
+    assert isinstance(candidates, pd.DataFrame)
+    assert {(c, w) for c, w in zip(candidates['contract_address'], candidates['wallet_address'])} >= {
+        (CONTRACT_A, WALLET[3]), (CONTRACT_B, WALLET[4])}
+
+    df = _daily_frame(tx, CONTRACT_A)
+    result = analyze_wallet_concentration(df, candidates, contract_address=CONTRACT_A)
+    flagged = {w.lower() for w in result['graph_insiders']}
+    assert WALLET[3] in flagged
+    # Wallet 5 is a candidate of contract B only
+    assert WALLET[4] not in flagged
+    assert result['insider_count'] >= 1
+
+
+def test_multi_contract_candidates_need_contract_address():
+    tx = _transactions()
+    candidates = WalletFlowGraph().update(tx).insider_candidates()
+    with pytest.raises(ValueError):
+        analyze_wallet_concentration(_daily_frame(tx, CONTRACT_A), candidates)
@@ -0,0 +1,100 @@
+import contextlib
+import io
+import json
+import os
+
+import numpy as np
+
+from ponzi_detection.blocklist_store import BlocklistStore
+from ponzi_detection.incremental_scoring import score_incremental
+from ponzi_detection.model_store import RISK_THRESHOLDS
+
+
+def _predict(X):
+    p = 1 / (1 + np.exp(-X.sum(axis=1)))
+    return np.column_stack([1 - p, p])
+
+
+def _batch(n, rng):
+    return ['0x%040x' % i for i in range(n)], rng.normal(scale=2, size=(n, 3))
+
+
+def test_cold_start_counts_new_contracts_without_tier_changes(tmp_path):
+    index, X = _batch(200, np.random.default_rng(0))
+    result = score_incremental(index, X, _predict, 'v1', RISK_THRESHOLDS, str(tmp_path / 'scores.npz'))
+    assert result['stats']['new'] == 200
+    assert result['tier_changes'] == []
+    assert sorted(result['added']) == sorted(np.array(index)[result['tiers'] == 'CRITICAL'])
+
+
+def test_warm_run_matches_full_rescore(tmp_path):
+    rng = np.random.default_rng(1)
+    cache = str(tmp_path / 'scores.npz')
+    index, X = _batch(300, rng)
+    first = score_incremental(index, X, _predict, 'v1', RISK_THRESHOLDS, cache)
+    X = X.copy()
+    X[:30] = rng.normal(scale=2, size=(30, 3))
+    index, X = index + ['0x' + 'f' * 40], np.vstack([X, np.full((1, 3), 5.0)])
+    result = score_incremental(index, X, _predict, 'v1', RISK_THRESHOLDS, cache)
+
+    full = _predict(X)[:, 1]
+    assert np.array_equal(result['probabilities'], full)
+    assert np.array_equal(result['scores'], np.round(full * 100, 2))
+    assert result['stats']['hits'] == 270 and result['stats']['new'] == 1
+    changed = {contract for contract, _, _ in result['tier_changes']}
+    assert '0x' + 'f' * 40 not in changed
+    expected = {index[i] for i in range(300) if first['tiers'][i] != result['tiers'][i]}
+    assert changed == expected
+
+
+def test_ids_of_any_kind_are_cached_separately(tmp_path):
+    index = ['contract_A', 'contract_B', 5, '0x05']
+    X = np.random.default_rng(2).normal(size=(4, 3))
+    cache = str(tmp_path / 'scores.npz')
+    first = score_incremental(index, X, _predict, 'v1', RISK_THRESHOLDS, cache)
+    assert first['stats']['new'] == 4
+    X[2] += 1.0  # Only the int id changes; '0x05' must still hit
+    again = score_incremental(index, X, _predict, 'v1', RISK_THRESHOLDS, cache)
+    assert again['stats']['hits'] == 3 and again['stats']['changed'] == 1
+    assert np.array_equal(again['probabilities'], _predict(X)[:, 1])
+
+
+def _run_pipeline(output_dir, incremental):
+    from ponzi_detection.engine import run_pipeline
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run_pipeline(data_size=2000, output_dir=str(output_dir), trace_memory=False,
+                            incremental=incremental)
+
+
+def _blocklists(output_dir, incremental):
+    _run_pipeline(output_dir, incremental)
+    with open(os.path.join(output_dir, 'firewall_blocklist.json')) as f:
+        legacy = sorted(json.load(f))
+    return BlocklistStore(os.path.join(output_dir, 'blocklist')).iter_addresses(), legacy
+
+
+def test_pipeline_blocklist_matches_full_run(tmp_path):
+    expected, _ = _blocklists(tmp_path / 'full', incremental=False)
+    store_dir = str(tmp_path / 'inc' / 'blocklist')
+    _blocklists(tmp_path / 'inc', incremental=True)
+    source = BlocklistStore(store_dir).source
+
+    # Same model, but the store holds a contract this batch does not have: it is removed
+    BlocklistStore(store_dir).append_delta(add=[10**9])
+    assert _blocklists(tmp_path / 'inc', incremental=True) == (expected, expected)
+
+    # Store written by another model (score cache still warm): rebuilt, not patched
+    BlocklistStore.build([10**9], store_dir, kind='index', source='another-model')
+    assert _blocklists(tmp_path / 'inc', incremental=True) == (expected, expected)
+    assert BlocklistStore(store_dir).source == source
+
+
+def test_incremental_run_reuses_the_model_artifact(tmp_path):
+    from ponzi_detection.model_store import load_artifact
+    _run_pipeline(tmp_path, incremental=True)
+    version = load_artifact(str(tmp_path / 'model')).model_version
+    _run_pipeline(tmp_path, incremental=True)
+    with open(tmp_path / 'pipeline_metrics.json') as f:
+        stages = [s['stage'] for s in json.load(f)['stages']]
+    assert 'Day 5-8: Model Load' in stages and 'Day 5-8: Model Training' not in stages
+    assert load_artifact(str(tmp_path / 'model')).model_version == version
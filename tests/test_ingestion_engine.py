@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from ponzi_detection.concentration_engine import calculate_gini
+from ponzi_detection.engine import FEATURES
+from ponzi_detection.ingestion_engine import SECONDS_PER_DAY, build_contract_features
+
+
+def _transactions(n=4000, seed=0):
+    rng = np.random.default_rng(seed)
+    contracts = [f"0x{i:040x}" for i in range(1, 7)]
+    wallets = [f"0x{i:040x}" for i in range(100, 140)]
+    contract = rng.choice(contracts, n)
+    wallet = rng.choice(wallets, n)
+    is_deposit = rng.random(n) < 0.6
+    # A few payees collect many equal payouts, as in a payout loop to insiders
+    value = np.where(rng.random(n) < 0.3, 1.0, np.round(rng.exponential(2.0, n), 3))
+    df = pd.DataFrame({
+        'contract_address': contract,
+        'from_address': np.where(is_deposit, wallet, contract),
+        'to_address': np.where(is_deposit, contract, wallet),
+        'value': value,
+        'timestamp': 1_500_000_000 + rng.integers(0, 90 * 86400, n),
+    })
+    df.loc[rng.choice(n, 20, replace=False), 'contract_address'] = np.nan
+    return df
+
+
+def _batch_features(df):
+    df = df[df['contract_address'].notna()]
+    rows = {}
+    for contract, tx in df.groupby('contract_address'):
+        deposits = tx[tx['to_address'] == contract]
+        payouts = tx[tx['from_address'] == contract]
+        span = tx['timestamp'].max() - tx['timestamp'].min()
+        rows[contract] = {
+            'Gini_Index': calculate_gini(payouts.groupby('to_address')['value'].sum().to_numpy()),
+            'Paid_Rate': payouts['value'].sum() / deposits['value'].sum(),
+            'Tx_Velocity': len(tx) / max(span / SECONDS_PER_DAY, 1.0),
+            'Network_Growth': 2 * (deposits['timestamp'].mean() - tx['timestamp'].min()) / span,
+        }
+    return pd.DataFrame.from_dict(rows, orient='index')[FEATURES]
+
+
+def test_streamed_features_match_batch(tmp_path):
+    df = _transactions()
+    path = tmp_path / 'tx.csv'
+    df.to_csv(path, index=False)
+    streamed = build_contract_features(str(path), chunksize=333)
+    expected = _batch_features(df)
+    assert sorted(streamed.index) == sorted(expected.index)
+    pd.testing.assert_frame_equal(streamed.loc[expected.index], expected, check_names=False, rtol=1e-9)
+
+
+def test_gini_uses_per_wallet_totals(tmp_path):
+    # One wallet paid ten equal amounts, another paid once: per-wallet totals are 10 vs 1
+    payees = ['0xa'] * 10 + ['0xb']
+    df = pd.DataFrame({'contract_address': '0xc', 'from_address': '0xc', 'to_address': payees,
+                       'value': 1.0, 'timestamp': np.arange(len(payees))})
+    path = tmp_path / 'tx.csv'
+    df.to_csv(path, index=False)
+    gini = build_contract_features(str(path))['Gini_Index'].iloc[0]
+    assert np.isclose(gini, calculate_gini(np.array([10.0, 1.0])))
+    assert gini > 0.4
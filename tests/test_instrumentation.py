@@ -0,0 +1,67 @@
+import inspect
+import json
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from ponzi_detection import instrumentation
+from ponzi_detection.engine import run_pipeline
+from ponzi_detection.instrumentation import current_rss_mb, instrumented, reset_metrics, stage
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    yield reset_metrics()
+    reset_metrics()
+
+
+def test_stage_records_time_rows_and_resident_memory():
+    with stage('work', rows=10) as record:
+        record['rows_out'] = 5
+        time.sleep(0.02)
+    [saved] = instrumentation.get_metrics().to_dict()['stages']
+    assert saved['stage'] == 'work' and saved['rows'] == 10 and saved['rows_out'] == 5
+    assert saved['duration_s'] >= 0.02
+    assert 'traced_peak_mb' not in saved  # No tracemalloc unless it is already running
+    if current_rss_mb() is not None:
+        assert saved['rss_peak_mb'] > 0 and saved['rss_peak_growth_mb'] >= 0
+
+
+@pytest.mark.skipif(current_rss_mb() is None, reason="needs /proc/self/statm")
+def test_sampled_peak_sees_memory_freed_before_the_stage_ends():
+    with stage('spike') as record:
+        block = np.ones(96 * 2**20 // 8)  # 96 MB, touched so it is resident
+        time.sleep(0.05)
+        del block
+    assert record['rss_peak_growth_mb'] > 64
+    assert current_rss_mb() < record['rss_peak_mb'] - 32
+
+
+def test_traced_peak_only_while_tracing():
+    tracemalloc.start()
+    try:
+        with stage('traced') as record:
+            data = bytearray(8 * 2**20)
+            del data
+    finally:
+        tracemalloc.stop()
+    assert record['traced_peak_mb'] >= 8
+
+
+def test_instrumented_counts_calls_and_saves(tmp_path):
+    @instrumented(name='double')
+    def double(x):
+        return 2 * x
+
+    assert [double(i) for i in range(3)] == [0, 2, 4]
+    path = instrumentation.get_metrics().save(str(tmp_path / 'metrics.json'))
+    with open(path) as f:
+        calls = json.load(f)['calls']
+    assert calls['double']['calls'] == 3
+    assert calls['double']['mean_s'] == pytest.approx(calls['double']['total_s'] / 3)
+
+
+def test_pipeline_does_not_trace_by_default():
+    assert inspect.signature(run_pipeline).parameters['trace_memory'].default is False
@@ -0,0 +1,66 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from ponzi_detection.model_store import (
+    ARTIFACT_VERSION, METADATA_FILE, MODEL_FILE, RISK_THRESHOLDS, load_artifact, load_metadata, save_artifact,
+    score_features)
+
+FEATURES = ['Gini_Index', 'Paid_Rate', 'Tx_Velocity', 'Network_Growth']
+
+
+def _model(seed=0, n=1500):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, len(FEATURES))), columns=FEATURES)
+    y = (X['Gini_Index'] - X['Paid_Rate'] + rng.normal(scale=0.5, size=n) > 0).astype(int)
+    return RandomForestClassifier(n_estimators=15, max_depth=6, random_state=seed).fit(X, y), X
+
+
+def test_reloaded_artifact_scores_identically(tmp_path):
+    model, X = _model(n=5000)
+    saved = save_artifact(model, FEATURES, RISK_THRESHOLDS, str(tmp_path))
+    loaded = load_artifact(str(tmp_path))
+    # Both the flat-forest path (small batches) and sklearn's (large ones)
+    assert 10 <= loaded.flat_forest_max_rows < len(X)
+    for rows in (X.iloc[:10], X):
+        assert np.array_equal(loaded.predict_proba(rows), model.predict_proba(rows))
+        assert np.array_equal(saved.predict_proba(rows), model.predict_proba(rows))
+    pd.testing.assert_frame_equal(score_features(X, loaded), score_features(X, saved))
+    assert loaded.features == FEATURES and loaded.thresholds == RISK_THRESHOLDS
+
+
+def test_model_version_is_the_model_file_hash(tmp_path):
+    model, _ = _model()
+    first = save_artifact(model, FEATURES, RISK_THRESHOLDS, str(tmp_path / 'a'))
+    with open(tmp_path / 'a' / MODEL_FILE, 'rb') as f:
+        assert first.model_version == hashlib.sha256(f.read()).hexdigest()[:16]
+    # Same model, same version; a different model gets a new one
+    assert save_artifact(model, FEATURES, RISK_THRESHOLDS, str(tmp_path / 'b')).model_version == first.model_version
+    other, _ = _model(seed=1)
+    assert save_artifact(other, FEATURES, RISK_THRESHOLDS, str(tmp_path / 'c')).model_version != first.model_version
+
+
+def test_metadata_describes_the_artifact(tmp_path):
+    model, _ = _model()
+    thresholds = {'CRITICAL': 80, 'HIGH': 30}
+    save_artifact(model, FEATURES, thresholds, str(tmp_path))
+    metadata = load_metadata(str(tmp_path))
+    assert metadata['artifact_version'] == ARTIFACT_VERSION
+    assert metadata['model_class'] == 'RandomForestClassifier'
+    assert metadata['features'] == FEATURES and metadata['thresholds'] == thresholds
+    assert metadata['flat_forest'] is True
+    assert load_artifact(str(tmp_path)).thresholds == thresholds
+
+
+def test_other_artifact_versions_are_rejected(tmp_path):
+    model, _ = _model()
+    save_artifact(model, FEATURES, RISK_THRESHOLDS, str(tmp_path))
+    path = tmp_path / METADATA_FILE
+    metadata = json.loads(path.read_text())
+    path.write_text(json.dumps(dict(metadata, artifact_version=ARTIFACT_VERSION - 1)))
+    with pytest.raises(ValueError, match='retrain'):
+        load_artifact(str(tmp_path))
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ponzi_detection.render_layer import (
+    CROSSOVER_SHARE, crossover_indices, downsample_frame, lttb_indices, top_k_page, top_k_positions)
+
+
+def _flows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0, 6 * np.pi, n)
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2017-01-01', periods=n, freq='h'),
+        'new_deposits': 100 + 40 * np.sin(t) + rng.normal(0, 5, n),
+        'yield_disbursed': 100 + 40 * np.cos(t) + rng.normal(0, 5, n),
+    })
+
+
+@pytest.mark.parametrize('n_out', [3, 10, 257])
+def test_lttb_keeps_endpoints_and_returns_n_out_ordered_rows(n_out):
+    df = _flows(5000)
+    picked = lttb_indices(df['timestamp'], df['new_deposits'], n_out)
+    assert len(picked) == n_out
+    assert picked[0] == 0 and picked[-1] == len(df) - 1
+    assert np.all(np.diff(picked) > 0)
+
+
+def test_lttb_keeps_the_extremes_of_a_spike():
+    y = np.zeros(1000)
+    y[437], y[712] = 50.0, -50.0
+    picked = lttb_indices(np.arange(1000), y, 20)
+    assert {437, 712} <= set(picked.tolist())
+
+
+@pytest.mark.parametrize('max_points', [2, 3, 7, 50, 400])
+@pytest.mark.parametrize('seed', [0, 1])
+def test_downsampled_frame_fits_the_budget_and_keeps_crossovers(max_points, seed):
+    df = _flows(20_000, seed=seed)
+    chart = downsample_frame(df, 'timestamp', ['new_deposits', 'yield_disbursed'], max_points=max_points,
+                             crossover=('new_deposits', 'yield_disbursed'))
+    assert len(chart) <= max_points
+    assert chart.index[0] == 0 and chart.index[-1] == len(df) - 1
+    assert chart.index.is_monotonic_increasing
+
+    crossings = crossover_indices(df['new_deposits'], df['yield_disbursed'])
+    if len(crossings) <= int(max_points * CROSSOVER_SHARE):
+        assert set(crossings.tolist()) <= set(chart.index.tolist())
+
+
+def test_crossover_rows_survive_downsampling():
+    # Smooth flows crossing a handful of times: every crossing pair must be in the chart
+    t = np.linspace(0, 4 * np.pi, 50_000)
+    df = pd.DataFrame({'x': np.arange(len(t)), 'in': np.sin(t), 'out': np.cos(t)})
+    crossings = crossover_indices(df['in'], df['out'])
+    assert 0 < len(crossings) <= 20
+    chart = downsample_frame(df, 'x', ['in', 'out'], max_points=100, crossover=('in', 'out'))
+    assert set(crossings.tolist()) <= set(chart.index.tolist())
+
+
+def test_small_frames_pass_through_and_tiny_budgets_fail():
+    df = _flows(10)
+    assert downsample_frame(df, 'timestamp', ['new_deposits'], max_points=10) is df
+    with pytest.raises(ValueError):
+        downsample_frame(df, 'timestamp', ['new_deposits'], max_points=1)
+
+
+@pytest.mark.parametrize('ascending', [False, True])
+def test_top_k_matches_a_full_stable_sort(ascending):
+    rng = np.random.default_rng(3)
+    # Coarse values (many ties) and NaNs, which sort last either way
+    values = rng.integers(0, 40, 5000).astype(float)
+    values[rng.random(5000) < 0.05] = np.nan
+    df = pd.DataFrame({'share': values})
+    expected = df.sort_values('share', ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+    for k in [0, 1, 37, 250, 4999, 5000, 6000]:
+        assert np.array_equal(top_k_positions(values, k, ascending), expected[:k])
+
+    pages = []
+    for page in range(1, 12):
+        rows, n_pages = top_k_page(df, 'share', page=page, page_size=500, ascending=ascending)
+        pages.append(rows.index.to_numpy())
+    assert n_pages == 10
+    assert np.array_equal(np.concatenate(pages[:10]), expected)
+    assert np.array_equal(pages[10], pages[9])  # Past the end: clamped to the last page
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from ponzi_detection import rolling_engine
+from ponzi_detection.concentration_engine import calculate_gini
+from ponzi_detection.rolling_engine import ROLLING_WINDOWS, RollingFeatureEngine
+from ponzi_detection.scenario_generator import generate_scenarios
+
+
+def _history(n_contracts=5, days=100, seed=3):
+    df = generate_scenarios(n_contracts, days=days, seed=seed)
+    rng = np.random.default_rng(seed)
+    # Missing days (so windows span gaps) and extra same-day payouts to a repeat wallet
+    df = df.drop(index=rng.choice(len(df), len(df) // 8, replace=False))
+    return pd.concat([df, df.sample(frac=0.1, random_state=seed)]).reset_index(drop=True)
+
+
+def _reference(df):
+    """The same features from pandas time-based rolling windows, contract by contract."""
+    df = df.assign(day=pd.to_datetime(df['timestamp']).dt.floor('D'))
+    frames = []
+    for contract, tx in df.groupby('contract_id'):
+        daily = tx.groupby('day').agg(deposits=('new_deposits', 'sum'), disbursed=('yield_disbursed', 'sum'),
+                                      treasury=('treasury_balance', 'last'), events=('wallet_address', 'size'))
+        first_seen = tx.groupby('wallet_address')['day'].min()
+        daily['new'] = first_seen.value_counts().reindex(daily.index, fill_value=0)
+        seen = daily['new'].cumsum()
+        age = (daily.index - daily.index[0]).days + 1
+        out = pd.DataFrame(index=daily.index)
+        for w in ROLLING_WINDOWS:
+            rolled = daily.rolling(f'{w}D').sum()
+            out[f'Tx_Velocity_{w}d'] = rolled['events'] / np.minimum(w, age)
+            out[f'Network_Growth_{w}d'] = rolled['new'] / np.maximum(seen - rolled['new'], 1)
+            out[f'Sustainability_{w}d'] = rolled['disbursed'] / rolled['deposits']
+            out[f'Gini_Index_{w}d'] = [
+                calculate_gini(tx[(tx['day'] > day - pd.Timedelta(days=w)) & (tx['day'] <= day)]
+                               .groupby('wallet_address')['yield_disbursed'].sum().to_numpy())
+                for day in daily.index]
+            earlier = pd.merge_asof(pd.DataFrame({'day': daily.index - pd.Timedelta(days=w)}),
+                                    daily['treasury'].rename('earlier').reset_index(), on='day')['earlier']
+            earlier = earlier.where(earlier != 0).to_numpy()
+            out[f'Treasury_Change_{w}d'] = daily['treasury'].to_numpy() / earlier - 1
+        out.index = pd.MultiIndex.from_arrays(
+            [np.full(len(out), contract), (daily.index - pd.Timestamp(0)).days], names=['contract_id', 'day'])
+        frames.append(out)
+    return pd.concat(frames)
+
+
+def test_backfill_matches_pandas_rolling():
+    df = _history()
+    features = RollingFeatureEngine().backfill(df)
+    expected = _reference(df)
+    pd.testing.assert_frame_equal(features.drop(columns='timestamp'), expected[features.columns[1:]],
+                                  rtol=1e-9, check_index_type=False)
+
+
+def test_updates_continue_from_a_backfill():
+    df = _history(n_contracts=3)
+    full = RollingFeatureEngine().backfill(df)
+    cut = df['timestamp'].sort_values().iloc[len(df) * 2 // 3].floor('D')
+    engine = RollingFeatureEngine()
+    engine.backfill(df[df['timestamp'] < cut])
+    later = df[df['timestamp'] >= cut].sort_values('timestamp', kind='stable')
+    day_number = (later['timestamp'].dt.floor('D') - pd.Timestamp(0)).dt.days
+    for (contract, day), tx in later.groupby(['contract_id', day_number]):
+        payouts = tx.groupby('wallet_address')['yield_disbursed'].sum().to_dict()
+        got = engine.update(contract, day, tx['new_deposits'].sum(), tx['yield_disbursed'].sum(),
+                            tx['treasury_balance'].iloc[-1], payouts, events=len(tx))
+        expected = full.loc[(contract, day), engine.columns].to_numpy(dtype=float)
+        np.testing.assert_allclose([got[c] for c in engine.columns], expected, rtol=1e-9)
+    latest = full.groupby(level='contract_id').tail(1).droplevel('day')[engine.columns]
+    pd.testing.assert_frame_equal(engine.latest().sort_index(), latest.sort_index(), rtol=1e-9)
+
+
+def test_contracts_too_large_for_a_block_are_replayed(monkeypatch):
+    df = _history(n_contracts=4, days=40)
+    vectorized = RollingFeatureEngine().backfill(df)
+    monkeypatch.setattr(rolling_engine, 'DENSE_CELLS', 100)
+    replayed = RollingFeatureEngine().backfill(df)
+    pd.testing.assert_frame_equal(replayed, vectorized, rtol=1e-9)
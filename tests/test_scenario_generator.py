@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from ponzi_detection.bitconnect_test import generate_bitconnect_data
+from ponzi_detection.scenario_generator import generate_scenarios
+
+
+def _original_bitconnect():
+    """The flows and treasury of the original loop-based bitconnect_test."""
+    days = 60
+    inflows = np.concatenate([np.linspace(10000, 55000, 40), np.linspace(55000, 40000, 10),
+                              np.linspace(40000, 500, 10)])
+    outflows = np.concatenate([np.linspace(2000, 15000, 40), np.linspace(15000, 45000, 10),
+                               np.linspace(45000, 60000, 10)])
+    treasury = [200000]
+    for i in range(1, days):
+        treasury.append(max(0, treasury[-1] + inflows[i] - outflows[i]))
+    return pd.date_range(end='2018-01-16', periods=days), inflows, outflows, np.array(treasury, dtype=float)
+
+
+def test_bitconnect_profile_matches_the_original_simulation():
+    dates, inflows, outflows, treasury = _original_bitconnect()
+    df = generate_bitconnect_data()
+    assert df.columns.tolist() == ['timestamp', 'new_deposits', 'yield_disbursed', 'treasury_balance',
+                                   'wallet_address']
+    assert (df['timestamp'].to_numpy() == dates.to_numpy()).all()
+    # Equal up to float rounding, not bit for bit
+    np.testing.assert_allclose(df['new_deposits'], inflows, rtol=1e-13)
+    np.testing.assert_allclose(df['yield_disbursed'], outflows, rtol=1e-13)
+    np.testing.assert_allclose(df['treasury_balance'], treasury, rtol=1e-13, atol=1e-9)
+
+    # Days 41+ pay the 5 insiders only, earlier days the other 45 wallets
+    wallets = df['wallet_address'].to_numpy()
+    assert len(set(wallets[41:])) <= 5
+    assert not set(wallets[41:]) & set(wallets[:41])
+
+
+def test_rows_are_contracts_times_days_and_seeded():
+    a = generate_scenarios(7, days=30, n_wallets=200, seed=3)
+    b = generate_scenarios(7, days=30, n_wallets=200, seed=3)
+    assert len(a) == 7 * 30
+    pd.testing.assert_frame_equal(a, b)
+    assert (a.groupby('contract_id')['wallet_address'].nunique() <= 200).all()
+    assert (a['treasury_balance'] >= 0).all()
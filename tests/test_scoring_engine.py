@@ -0,0 +1,33 @@
+import numpy as np
+
+from ponzi_detection.scoring_engine import (RED_FLAG_LABELS, _round_half_even_2dp, calculate_red_flag_score,
+                                            calculate_red_flag_scores)
+
+
+def _row_wise(ratio, gini, decay):
+    return zip(*(calculate_red_flag_score(r, g, d) for r, g, d in zip(ratio.tolist(), gini.tolist(),
+                                                                      decay.tolist())))
+
+
+def test_batch_scores_are_bit_identical_to_row_wise():
+    rng = np.random.default_rng(0)
+    n = 50_000
+    # Coarse grids put many weighted sums on or next to a .xx5 tie; the rest are continuous
+    ratio = np.where(rng.random(n) < 0.5, rng.integers(0, 500, n) / 200, rng.random(n) * 3)
+    gini = np.where(rng.random(n) < 0.5, rng.integers(0, 1000, n) / 1000, rng.random(n))
+    decay = np.where(rng.random(n) < 0.5, rng.integers(-50, 300, n) / 1000, rng.normal(0.05, 0.1, n))
+    decay[rng.choice(n, 50, replace=False)] = np.nan
+
+    scores, codes = calculate_red_flag_scores(ratio, gini, decay)
+    expected_scores, expected_labels = _row_wise(ratio, gini, decay)
+    expected = np.array(expected_scores, dtype=float)
+    # Bit for bit, NaNs included
+    assert np.array_equal(scores.view(np.int64), expected.view(np.int64))
+    assert RED_FLAG_LABELS[codes].tolist() == list(expected_labels)
+
+
+def test_rounding_matches_builtin_round_on_decimal_ties():
+    values = np.arange(0, 200_000) / 1000  # every .xx5 between 0 and 200
+    values = np.concatenate([values, values + 1e-13, values - 1e-13, -values])
+    expected = np.array([round(x, 2) for x in values.tolist()])
+    assert np.array_equal(_round_half_even_2dp(values), expected)
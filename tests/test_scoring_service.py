@@ -0,0 +1,53 @@
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from ponzi_detection.flat_forest import FlatForest
+from ponzi_detection.model_store import RISK_THRESHOLDS, ModelArtifact
+from ponzi_detection.scoring_service import MicroBatcher, ScoringServer
+
+FEATURES = ['Gini_Index', 'Paid_Rate', 'Tx_Velocity', 'Network_Growth']
+
+
+def _artifact():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((400, len(FEATURES))), columns=FEATURES)
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, (X['Gini_Index'] > 0.5).astype(int))
+    return ModelArtifact(model, FEATURES, RISK_THRESHOLDS, {'model_version': 'test'}, FlatForest.from_sklearn(model))
+
+
+def _post(bodies, batcher=None):
+    """Sends /score bodies concurrently through one batcher; returns [(status, payload)] and the stats."""
+    async def run():
+        b = batcher or MicroBatcher(_artifact(), max_batch_size=16, max_wait_ms=5)
+        server = ScoringServer(b)
+        worker = asyncio.create_task(b.run())
+        try:
+            return await asyncio.gather(*(server._route('POST', '/score', body) for body in bodies)), server.stats
+        finally:
+            worker.cancel()
+    return asyncio.run(run())
+
+
+def test_non_finite_features_rejected_without_failing_the_batch():
+    good = json.dumps(dict.fromkeys(FEATURES, 0.7)).encode()
+    bad = [b'{"Gini_Index": NaN, "Paid_Rate": 0, "Tx_Velocity": 0, "Network_Growth": 0}',
+           b'[0.1, Infinity, 0.2, 0.3]', b'[0.1, 0.2, "-inf", 0.3]']
+    responses, stats = _post([good, *bad, good])
+    assert [status for status, _ in responses] == [200, 400, 400, 400, 200]
+    assert stats.errors == 3
+
+
+def test_scoring_failure_returns_500_and_counts_error():
+    class Broken(MicroBatcher):
+        def _predict(self, rows):
+            raise RuntimeError("model unavailable")
+
+    batcher = Broken(_artifact(), max_batch_size=16, max_wait_ms=5)
+    responses, stats = _post([json.dumps([0.5] * len(FEATURES)).encode()] * 2, batcher)
+    assert [status for status, _ in responses] == [500, 500]
+    assert 'model unavailable' in responses[0][1]['error']
+    assert stats.errors == 2
@@ -0,0 +1,86 @@
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ponzi_detection.engine import FEATURES
+from ponzi_detection.streaming_trainer import (MODEL_BUDGET_SHARE, forest_bytes, held_out_rows, run,
+                                               simulated_feature_chunks, train_out_of_core)
+
+CHUNK_ROWS = 20_000
+
+
+def _chunks(label_sorted, n_chunks=30, seed=0, chunk_rows=CHUNK_ROWS):
+    rng = np.random.default_rng(seed)
+    for i in range(n_chunks):
+        df = pd.DataFrame(rng.random((chunk_rows, len(FEATURES))), columns=FEATURES)
+        if label_sorted:
+            # Every Ponzi row at the end of the file
+            df['Ponzi'] = (rng.random(chunk_rows) < 0.3).astype(int) if i >= n_chunks - 2 else 0
+        else:
+            df['Ponzi'] = (rng.random(chunk_rows) < 0.05).astype(int)
+        yield df
+
+
+def _peak_mb(chunks):
+    import sklearn.ensemble  # noqa: F401  (import cost is not training memory)
+    tracemalloc.start()
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            model, _ = train_out_of_core(chunks, trees_per_chunk=2, minority_reservoir=5000, max_holdout_rows=5000)
+        return tracemalloc.get_traced_memory()[1] / 2**20, model
+    finally:
+        tracemalloc.stop()
+
+
+def test_label_sorted_stream_does_not_buffer_every_chunk():
+    shuffled_mb, _ = _peak_mb(_chunks(label_sorted=False))
+    sorted_mb, model = _peak_mb(_chunks(label_sorted=True))
+    # 28 majority-only chunks are ~27 MB of float64 rows; only one chunk's worth may wait
+    assert sorted_mb < 1.5 * shuffled_mb
+    assert model.n_estimators == 3 * 2  # Waiting rows' round + the two mixed chunks
+
+
+def test_holdout_is_indexed_by_stream_position():
+    frames = list(_chunks(label_sorted=False, n_chunks=3))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        _, (X_test, y_test) = train_out_of_core(iter(frames), trees_per_chunk=1, max_holdout_rows=2000, seed=5)
+    full = pd.concat(frames, ignore_index=True)
+    held_out = held_out_rows(np.arange(len(full)), seed=5)
+    assert held_out[X_test.index].all()
+    pd.testing.assert_frame_equal(full.loc[X_test.index, FEATURES], X_test, check_names=False)
+    assert np.array_equal(full.loc[X_test.index, 'Ponzi'].to_numpy(), y_test)
+    assert abs(held_out.mean() - 0.2) < 0.01
+
+
+def test_budget_overrun_fails_loudly():
+    source = lambda chunksize: _chunks(label_sorted=False, n_chunks=2, chunk_rows=100_000)  # noqa: E731  (ignores the budget)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        with pytest.raises(ValueError, match='over the'):
+            run(source, memory_budget_mb=12, minority_reservoir=1000, max_holdout_rows=1000)
+
+
+def test_forest_outgrowing_its_budget_share_fails():
+    # Random labels: every tree grows to its depth cap, so the forest is the dominant cost
+    source = lambda chunksize: _chunks(label_sorted=False, n_chunks=20, chunk_rows=chunksize)  # noqa: E731
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        with pytest.raises(ValueError, match='outgrow'):
+            run(source, memory_budget_mb=12, minority_reservoir=1000, max_holdout_rows=1000)
+
+
+def test_peak_counts_the_forest():
+    budget = 32
+    source = lambda chunksize: simulated_feature_chunks(60_000, chunksize)  # noqa: E731
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        model, report = run(source, memory_budget_mb=budget, minority_reservoir=1000, max_holdout_rows=1000)
+    stats = report['out_of_core']
+    assert stats['model_mb'] == round(forest_bytes(model) / 2**20, 1)
+    assert stats['model_mb'] <= budget * MODEL_BUDGET_SHARE
+    assert stats['model_mb'] <= stats['peak_mb'] <= budget
@@ -0,0 +1,61 @@
+import numpy as np
+
+from ponzi_detection.warning_system import WarningMonitor, check_early_warnings, decode_alerts
+
+
+def _stream(n, n_contracts, seed=0):
+    rng = np.random.default_rng(seed)
+    contracts = [f"0x{i:040x}" for i in rng.integers(0, n_contracts, n)]
+    # Coarse values so momentum/liquidity thresholds are hit often, ties included
+    scores = rng.integers(0, 21, n) * 5.0
+    deltas = rng.integers(-6, 3, n) * 0.05
+    return contracts, scores, deltas
+
+
+def _row_by_row(contracts, scores, deltas):
+    last = {}
+    expected = []
+    for contract, score, delta in zip(contracts, scores, deltas):
+        # The monitor skips momentum on a contract's first update
+        expected.append(check_early_warnings(score, last.get(contract, score), delta))
+        last[contract] = score
+    return expected
+
+
+def test_batches_with_repeats_match_row_by_row_checks():
+    contracts, scores, deltas = _stream(3000, 40)
+    expected = _row_by_row(contracts, scores, deltas)
+    monitor = WarningMonitor(40, history=8)
+    got = []
+    # Uneven batches, some holding one contract far more often than `history`
+    for start, stop in [(0, 1), (1, 700), (700, 701), (701, 2500), (2500, 3000)]:
+        flags = monitor.update(contracts[start:stop], scores[start:stop], deltas[start:stop])
+        got.extend(decode_alerts(f) for f in flags)
+    assert got == expected
+    for contract in set(contracts):
+        mine = [s for c, s in zip(contracts, scores) if c == contract]
+        assert np.array_equal(monitor.recent_scores(contract), mine[-8:])
+
+
+def test_single_contract_backfill():
+    scores = np.arange(100, dtype=float) * 20 % 97
+    monitor = WarningMonitor(1, history=5)
+    flags = monitor.update(['a'] * 100, scores, np.zeros(100))
+    assert [decode_alerts(f) for f in flags] == _row_by_row(['a'] * 100, scores, np.zeros(100))
+    assert np.array_equal(monitor.recent_scores('a'), scores[-5:])
+
+
+def test_snapshot_round_trips_without_pickle(tmp_path):
+    contracts, scores, deltas = _stream(500, 25, seed=1)
+    monitor = WarningMonitor(30, history=6)
+    monitor.update(contracts[:400], scores[:400], deltas[:400])
+    np.savez(tmp_path / 'monitor.npz', **monitor.snapshot())
+    with np.load(tmp_path / 'monitor.npz') as state:  # allow_pickle=False
+        restored = WarningMonitor.restore(state)
+
+    assert len(restored) == len(monitor)
+    a = monitor.update(contracts[400:], scores[400:], deltas[400:])
+    b = restored.update(contracts[400:], scores[400:], deltas[400:])
+    assert np.array_equal(a, b)
+    for key, value in monitor.snapshot().items():
+        np.testing.assert_array_equal(restored.snapshot()[key], value)
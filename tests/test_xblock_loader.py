@@ -0,0 +1,27 @@
+import importlib.resources
+import os
+
+import numpy as np
+import pandas as pd
+
+from ponzi_detection.xblock_loader import DEFAULT_ARCHIVE, cache_path, load_ponzi_labels
+
+XBLOCK_ROWS = 3790
+
+
+def test_packaged_archive_schema_and_row_count(tmp_path):
+    assert (importlib.resources.files('ponzi_detection') / 'data' / os.path.basename(DEFAULT_ARCHIVE)).is_file()
+    labels = load_ponzi_labels(cache_dir=str(tmp_path))
+    assert list(labels.columns) == ['Contract', 'Ponzi']
+    assert len(labels) == XBLOCK_ROWS
+    assert labels['Ponzi'].dtype == np.int8 and set(labels['Ponzi'].unique()) == {0, 1}
+    assert labels['Contract'].is_unique
+    assert labels['Contract'].str.fullmatch(r'0x[0-9a-f]{40}').all()
+
+
+def test_cached_labels_match_the_archive(tmp_path):
+    parsed = load_ponzi_labels(cache_dir=str(tmp_path))
+    assert os.path.exists(cache_path(cache_dir=str(tmp_path)))
+    cached = load_ponzi_labels(cache_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(cached, parsed, check_dtype=False)
+    assert cached['Ponzi'].dtype == np.int8
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from ponzi_detection.scenario_generator import generate_scenarios
+from ponzi_detection.yield_engine import YIELD_STATUS_LABELS, calculate_yield_health_panel
+
+
+def _original_yield_health(df):
+    """The original row-wise calculate_yield_health (df.apply flagging)."""
+    df = df.copy()
+    df['sustainability_ratio'] = df['yield_disbursed'] / df['new_deposits']
+    df['net_flow'] = df['new_deposits'] - df['yield_disbursed']
+    df['runway_days'] = df['treasury_balance'] / df['yield_disbursed'].replace(0, 1)
+
+    def flag_ponzi(row):
+        if row['sustainability_ratio'] > 1.2 and row['runway_days'] < 7:
+            return "🚨 CRITICAL: Ponzi Collapse Likely"
+        if row['sustainability_ratio'] > 1.0:
+            return "⚠️ WARNING: Unsustainable Yield"
+        return "✅ STABLE"
+
+    df['yield_status'] = df.apply(flag_ponzi, axis=1)
+    return df
+
+
+def test_panel_matches_the_original_per_contract_loop():
+    df = generate_scenarios(30, days=45, seed=1)
+    # Zero deposits / payouts and an empty treasury exercise inf, NaN and the replace(0, 1) rule
+    rng = np.random.default_rng(1)
+    for column in ('new_deposits', 'yield_disbursed', 'treasury_balance'):
+        df.loc[rng.choice(len(df), 40, replace=False), column] = 0.0
+    df = df.sample(frac=1, random_state=0)  # Panel rows need not be grouped or sorted
+
+    panel = calculate_yield_health_panel(df)
+    for contract_id, rows in df.groupby('contract_id'):
+        expected = _original_yield_health(rows)
+        got = panel.loc[rows.index]
+        for column in ('sustainability_ratio', 'net_flow', 'runway_days'):
+            np.testing.assert_array_equal(got[column].to_numpy(), expected[column].to_numpy())
+        assert YIELD_STATUS_LABELS[got['yield_status_code']].tolist() == expected['yield_status'].tolist()
+    pd.testing.assert_frame_equal(panel[df.columns], df)  # Input columns untouched